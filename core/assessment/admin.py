@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Assessment, DescriptiveSolution, NATSolution, Question, MCQSolution, MSQSolution, QuestionOption
+from .models import Assessment, AssessmentAttempt, DescriptiveSolution, NATSolution, Question, MCQSolution, MSQSolution, QuestionOption
 
 class NATSolutionInline(admin.StackedInline):
     model = NATSolution
@@ -60,6 +60,14 @@ class AssessmentAdmin(admin.ModelAdmin):
     list_filter = ('created_at',)
     ordering = ('created_at',)
 
+class AssessmentAttemptAdmin(admin.ModelAdmin):
+    list_display = ('assessment', 'user', 'status', 'started_at', 'deadline', 'submitted_at', 'score')
+    list_filter = ('status',)
+    search_fields = ('user__email', 'assessment__title')
+    raw_id_fields = ('assessment', 'user')
+    readonly_fields = ('seed', 'questions', 'created_at', 'updated_at')
+
 admin.site.register(Question, QuestionAdmin)
 admin.site.register(Assessment, AssessmentAdmin)
-admin.site.register(QuestionOption)
\ No newline at end of file
+admin.site.register(QuestionOption)
+admin.site.register(AssessmentAttempt, AssessmentAttemptAdmin)
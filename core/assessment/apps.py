@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AssessmentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core.assessment'
+
+    def ready(self):
+        import core.assessment.signals
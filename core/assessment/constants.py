@@ -14,3 +14,5 @@ QUESTION_MARKS_MAX_VAL = 1000
 SOLUTION_EXPLANATION_MAX_LEN = 1000
 
 MODEL_DESCRIPTIVE_SOLUTION_MAX_LEN = 1000
+
+ATTEMPT_DESCRIPTIVE_ANSWER_MAX_LEN = 20000
@@ -0,0 +1,118 @@
+# In core/assessment/management/commands/benchmark_grading.py
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.assessment.models import (
+    Assessment, AssessmentAttempt, AttemptResponse, AttemptStatus, QuestionType,
+)
+from core.assessment.services import AnswerKeyService, GradingService, QuestionImportService
+from core.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure GradingService.grade() end to end on synthetic submissions written to the database. "
+        "Everything is created in a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--submissions", type=int, default=10000, help="Number of submissions to grade.")
+        parser.add_argument("--questions", type=int, default=10, help="Questions per submission.")
+        parser.add_argument("--options", type=int, default=4, help="Options per MCQ and MSQ question.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Attempts graded at a time.")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the generated answers.")
+
+    def handle(self, *args, **kwargs):
+        rng = random.Random(kwargs["seed"])
+        with transaction.atomic():
+            assessment = self.make_assessment(kwargs["questions"], kwargs["options"])
+            answer_key = AnswerKeyService.build(assessment.pk)
+            rows = self.make_submissions(rng, assessment, answer_key, kwargs["submissions"])
+
+            start = time.perf_counter()
+            GradingService.score_rows(answer_key, rows)
+            scoring = time.perf_counter() - start
+
+            start = time.perf_counter()
+            graded = GradingService.grade(assessment, batch_size=kwargs["batch_size"], answer_key=answer_key)
+            elapsed = time.perf_counter() - start
+
+            mean = sum(AssessmentAttempt.objects.filter(assessment=assessment).values_list("score", flat=True))
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"Graded {graded} submissions ({len(rows)} answers) in {elapsed:.3f}s: "
+            f"{graded / elapsed:,.0f} submissions/s, {len(rows) / elapsed:,.0f} answers/s"
+        )
+        self.stdout.write(f"Of which scoring in memory: {scoring:.3f}s")
+        self.stdout.write(f"Mean score: {mean / max(graded, 1):.2f}")
+
+    def make_assessment(self, question_count, option_count):
+        assessment = Assessment.objects.create(
+            title="Grading benchmark", question_visibility_limit=question_count, time_limit=3600
+        )
+        types = [QuestionType.MCQ, QuestionType.MSQ, QuestionType.NAT]
+        items = []
+        for number in range(question_count):
+            question_type = types[number % len(types)]
+            item = {"text": f"Question {number}", "type": question_type, "marks": 4}
+            if question_type == QuestionType.NAT:
+                item["nat_solution"] = {
+                    "value": 10, "tolerance_min": 0.5, "tolerance_max": 0.5, "decimal_precision": 2,
+                    "solution_explanation": "-",
+                }
+            else:
+                item["options"] = [{"option_text": f"Option {i}"} for i in range(option_count)]
+            if question_type == QuestionType.MCQ:
+                item["solution_option_index"] = number % option_count
+            elif question_type == QuestionType.MSQ:
+                item.update(partial_marking=True, solution_options_indices=list(range(0, option_count, 2)))
+            items.append(item)
+        QuestionImportService.create(assessment, items)
+        return assessment
+
+    def make_submissions(self, rng, assessment, answer_key, count):
+        """
+        Write `count` submitted attempts with an answer to every question.
+        :return: The (attempt ID, question ID, answer) rows written.
+        """
+        user, _ = User.objects.get_or_create(
+            email="grading-benchmark@example.com", defaults={"firebase_uid": f"benchmark-{uuid.uuid4().hex}"}
+        )
+        now = timezone.now()
+        attempts = AssessmentAttempt.objects.bulk_create(
+            [
+                AssessmentAttempt(
+                    assessment=assessment, user=user, status=AttemptStatus.SUBMITTED, seed=0,
+                    deadline=now, submitted_at=now,
+                )
+                for _ in range(count)
+            ],
+            batch_size=1000,
+        )
+        rows = [
+            (attempt.pk, question_id, self.make_answer(rng, key))
+            for attempt in attempts
+            for question_id, key in answer_key.questions.items()
+        ]
+        AttemptResponse.objects.bulk_create(
+            [AttemptResponse(attempt_id=attempt_id, question_id=question_id, answer=answer)
+             for attempt_id, question_id, answer in rows],
+            batch_size=5000,
+        )
+        return rows
+
+    def make_answer(self, rng, key):
+        if rng.random() < 0.1:
+            return None
+        if key.type == QuestionType.NAT:
+            return round(rng.uniform(8, 12), 2)
+        options = list(key.option_bits)
+        if key.type == QuestionType.MCQ:
+            return rng.choice(options)
+        return sorted(rng.sample(options, rng.randint(1, len(options))))
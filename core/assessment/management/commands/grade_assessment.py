@@ -0,0 +1,22 @@
+# In core/assessment/management/commands/grade_assessment.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.assessment.models import Assessment
+from core.assessment.services import GradingService
+
+
+class Command(BaseCommand):
+    help = "Auto-grade the submitted and expired attempts of an assessment"
+
+    def add_arguments(self, parser):
+        parser.add_argument("assessment_id", help="ID of the assessment to grade.")
+        parser.add_argument("--regrade", action="store_true", help="Also grade attempts graded before.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Attempts loaded and scored at a time.")
+
+    def handle(self, *args, **kwargs):
+        try:
+            assessment = Assessment.objects.get(pk=kwargs["assessment_id"])
+        except (Assessment.DoesNotExist, ValueError):
+            raise CommandError(f"Assessment {kwargs['assessment_id']} does not exist.")
+        graded = GradingService.grade(assessment, regrade=kwargs["regrade"], batch_size=kwargs["batch_size"])
+        self.stdout.write(f"Graded {graded} attempts.")
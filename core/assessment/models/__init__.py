@@ -3,3 +3,4 @@ from .question import Question, QuestionType
 from .question_option import QuestionOption
 from .solution import Solution
 from .solution_implementations import NATSolution, DescriptiveSolution, MCQSolution, MSQSolution
+from .attempt import AssessmentAttempt, AttemptResponse, AttemptStatus
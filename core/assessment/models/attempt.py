@@ -0,0 +1,98 @@
+# core/assessment/models/attempt.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+import uuid
+
+from ...utils.models import TimestampMixin
+
+
+class AttemptStatus(models.TextChoices):
+    IN_PROGRESS = "in_progress", "In progress"
+    SUBMITTED = "submitted", "Submitted"
+    EXPIRED = "expired", "Expired"  # closed at the time limit without being submitted
+
+
+class AssessmentAttempt(TimestampMixin, models.Model):
+    """
+    One sitting of an assessment by a student.
+
+    `questions` is the paper drawn for this attempt when it starts: at most
+    `question_visibility_limit` entries of {"id", "type", "options"}, in the order served.
+    Answers are validated against it, so saving answers does not read the questions again.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    assessment = models.ForeignKey(
+        "assessment.Assessment", on_delete=models.CASCADE, related_name="attempts"
+    )
+    user = models.ForeignKey(
+        "users.User", on_delete=models.CASCADE, related_name="assessment_attempts"
+    )
+    status = models.CharField(
+        choices=AttemptStatus.choices, default=AttemptStatus.IN_PROGRESS, max_length=20
+    )
+    seed = models.PositiveIntegerField(help_text="Seed of the question selection of this attempt.")
+    questions = models.JSONField(default=list)
+    started_at = models.DateTimeField(default=timezone.now)
+    deadline = models.DateTimeField(help_text="Start time plus the assessment's time limit.")
+    submitted_at = models.DateTimeField(null=True, blank=True)
+    score = models.FloatField(null=True, blank=True, help_text="Total auto-graded score.")
+    graded_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # A student has at most one running attempt per assessment
+            models.UniqueConstraint(
+                fields=["assessment", "user"],
+                condition=Q(status=AttemptStatus.IN_PROGRESS),
+                name="unique_open_attempt",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["assessment", "status"], name="attempt_assessment_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.assessment} ({self.status})"
+
+    @property
+    def question_ids(self):
+        return [question["id"] for question in self.questions]
+
+    def accepts_answers(self, now=None):
+        """
+        Whether answers may still be saved: the attempt is running and its deadline, plus
+        ASSESSMENT_SUBMIT_GRACE seconds for requests in flight, has not passed.
+        """
+        now = now or timezone.now()
+        grace = timedelta(seconds=settings.ASSESSMENT_SUBMIT_GRACE)
+        return self.status == AttemptStatus.IN_PROGRESS and now <= self.deadline + grace
+
+
+class AttemptResponse(models.Model):
+    """
+    The current answer of an attempt to one question, upserted in place on every autosave.
+
+    The shape of `answer` depends on the question type: an option ID for MCQ, a sorted list
+    of option IDs for MSQ, a number for NAT and text for descriptive questions; null when
+    cleared. Rows use the default integer key, which keeps inserts during exams sequential.
+    """
+
+    attempt = models.ForeignKey(AssessmentAttempt, on_delete=models.CASCADE, related_name="responses")
+    question = models.ForeignKey("assessment.Question", on_delete=models.CASCADE, related_name="responses")
+    answer = models.JSONField(null=True, blank=True)
+    score = models.FloatField(null=True, blank=True, help_text="Auto-graded score; null if not auto-graded.")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["attempt", "question"], name="unique_attempt_response")
+        ]
+
+    def __str__(self):
+        return f"{self.attempt_id} - {self.question_id}"
@@ -31,6 +31,12 @@ class Question(TimestampMixin, models.Model):
         help_text="The maximum marks for the question."
     )
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the questions of an assessment
+            models.Index(fields=["assessment", "created_at", "id"], name="question_assessment_page_idx"),
+        ]
+
     def __getattr__(self, name):
         """
         Delegate permission checks to the related assessment object.
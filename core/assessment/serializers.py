@@ -1,6 +1,5 @@
 # core/assessment/serializers.py
 from django.core.exceptions import ValidationError
-from django.db import transaction
 from drf_spectacular.utils import extend_schema_field, extend_schema_serializer
 from rest_framework import serializers
 
@@ -11,6 +10,7 @@ from .models import (
     MCQSolution,
     MSQSolution,
     Assessment,
+    AssessmentAttempt,
     QuestionOption, QuestionType,
 )
 from ..course.models import SectionItemInfo, SectionItemType
@@ -152,41 +152,103 @@ class QuestionSerializer(serializers.ModelSerializer):
                 raise ValidationError(
                     "Descriptive questions require 'descriptive_solution'."
                 )
+
+        option_count = len(data.get("options") or [])
+        indices = list(data.get("solution_options_indices") or [])
+        if "solution_option_index" in data:
+            indices.append(data["solution_option_index"])
+        if any(not 0 <= index < option_count for index in indices):
+            raise ValidationError("Solution option indices must refer to the given options.")
         return data
 
     def create(self, validated_data):
-        options = validated_data.pop("options", None)
-        nat_solution = validated_data.pop("nat_solution", None)
-        descriptive_solution = validated_data.pop("descriptive_solution", None)
-        solution_option_index = validated_data.pop("solution_option_index", None)
-        solution_options_indices = validated_data.pop("solution_options_indices", None)
+        from .services import QuestionImportService
 
-        with transaction.atomic():
-            question = super().create(validated_data)
+        assessment = validated_data.pop("assessment")
+        return QuestionImportService.create(assessment, [validated_data])[0]
 
-            if options:
-                created_option_id = []
 
-                for option in options:
-                    current_option = QuestionOption.objects.create(question=question, **option)
-                    created_option_id.append(current_option.id)
+class QuestionImportSerializer(QuestionSerializer):
+    """
+    One question of a bulk import; the assessment is given by the import itself.
+    """
 
-            if nat_solution is not None:
-                NATSolution.objects.create(question=question, **nat_solution)
+    class Meta(QuestionSerializer.Meta):
+        fields = [field for field in QuestionSerializer.Meta.fields if field != "assessment"]
 
-            if descriptive_solution:
-                DescriptiveSolution.objects.create(
-                    question=question, **descriptive_solution
-                )
 
-            if solution_option_index is not None:
-                choice = QuestionOption.objects.get(id=created_option_id[solution_option_index])
-                MCQSolution.objects.create(question=question, choice=choice)
+class QuestionImportRequestSerializer(serializers.Serializer):
+    questions = serializers.ListField(
+        child=serializers.JSONField(), required=False,
+        help_text="Questions in the format of the question endpoint, without `assessment`.",
+    )
+    file = serializers.FileField(
+        required=False, help_text="JSON Lines file with one question per line, instead of `questions`."
+    )
+    skip_invalid = serializers.BooleanField(
+        default=False, help_text="Import the valid questions even when others are invalid."
+    )
+
+    def validate(self, data):
+        if ("questions" in data) == ("file" in data):
+            raise serializers.ValidationError("Send either 'questions' or 'file'.")
+        return data
+
+
+
+class AssessmentAttemptSerializer(serializers.ModelSerializer):
+    question_ids = serializers.ListField(child=serializers.CharField(), read_only=True)
+    answers = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AssessmentAttempt
+        fields = [
+            "id",
+            "assessment",
+            "status",
+            "started_at",
+            "deadline",
+            "submitted_at",
+            "score",
+            "question_ids",
+            "answers",
+        ]
+        read_only_fields = fields
+
+    @extend_schema_field({"type": "object", "additionalProperties": {}})
+    def get_answers(self, obj):
+        return {str(response.question_id): response.answer for response in obj.responses.all()}
 
-            if solution_options_indices:
-                for solution_option_index in solution_options_indices:
-                    choice = QuestionOption.objects.get(id=created_option_id[solution_option_index])
-                    MSQSolution.objects.create(question=question, choice=choice)
 
-        return question
+class PaperOptionSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    option_text = serializers.CharField()
 
+
+class PaperQuestionSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    text = serializers.CharField()
+    hint = serializers.CharField(allow_null=True)
+    type = serializers.ChoiceField(choices=QuestionType.choices)
+    marks = serializers.IntegerField()
+    partial_marking = serializers.BooleanField()
+    options = PaperOptionSerializer(many=True)
+
+
+class AssessmentPaperSerializer(serializers.Serializer):
+    """
+    The question paper of an attempt, without solutions.
+    """
+    attempt = serializers.UUIDField()
+    deadline = serializers.DateTimeField()
+    questions = PaperQuestionSerializer(many=True)
+
+
+class AttemptAnswersSerializer(serializers.Serializer):
+    answers = serializers.DictField(
+        child=serializers.JSONField(allow_null=True),
+        required=False,
+        default=dict,
+        help_text="Answers by question ID: an option ID (MCQ), a list of option IDs (MSQ), "
+                  "a number (NAT) or text (descriptive); null clears an answer.",
+    )
@@ -0,0 +1,5 @@
+from .answer_key_service import AnswerKey, AnswerKeyService, QuestionKey
+from .attempt_service import AttemptClosedError, AttemptService
+from .grading_service import GradingService
+from .paper_service import PaperService
+from .question_import_service import QuestionImportService
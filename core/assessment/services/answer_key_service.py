@@ -0,0 +1,182 @@
+# core/assessment/services/answer_key_service.py
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..models import (
+    DescriptiveSolution, MCQSolution, MSQSolution, NATSolution, Question, QuestionOption, QuestionType,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QuestionKey:
+    """
+    What grading needs to know about one question. Options are numbered in ID order, and
+    sets of options are ints with one bit per option.
+    """
+    type: str
+    marks: int
+    partial_marking: bool = False
+    option_bits: dict = field(default_factory=dict)  # option ID (str) -> bit
+    correct: int = 0  # bitset of the correct options (MCQ, MSQ)
+    nat_range: tuple = None  # (lowest, highest accepted value, decimal precision)
+    word_limits: tuple = None  # (min, max) words of a descriptive answer, either may be None
+    solution: object = None  # the solution as the solution endpoint returns it
+
+    @property
+    def gradable(self):
+        """
+        Whether answers can be scored automatically: objective questions with a solution.
+        """
+        if self.type in (QuestionType.MCQ, QuestionType.MSQ):
+            return bool(self.correct)
+        return self.type == QuestionType.NAT and self.nat_range is not None
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    """
+    The solutions of an assessment's questions, keyed by question ID (str). Shared through
+    the cache, so it must be treated as read-only.
+    """
+    assessment_id: str
+    questions: dict = field(default_factory=dict)
+
+
+class AnswerKeyService:
+    """
+    Compiles the answer key of an assessment from its solutions and caches it.
+
+    Keys are cached under a per-assessment version, like course structure in
+    CourseCacheService: any change to a question, option or solution of the assessment bumps
+    the version once the transaction commits, and the next reader builds a fresh key.
+    """
+
+    VERSION_KEY = "answer_key:{assessment_id}:version"
+    ENTRY_KEY = "answer_key:{assessment_id}:v{version}"
+
+    @staticmethod
+    def _normalize(assessment_id):
+        try:
+            return str(uuid.UUID(str(assessment_id)))
+        except ValueError:
+            return str(assessment_id)
+
+    @staticmethod
+    def get_version(assessment_id):
+        key = AnswerKeyService.VERSION_KEY.format(assessment_id=AnswerKeyService._normalize(assessment_id))
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
+        return version
+
+    @staticmethod
+    def bump(assessment_id):
+        key = AnswerKeyService.VERSION_KEY.format(assessment_id=AnswerKeyService._normalize(assessment_id))
+        cache.set(key, max(time.time_ns(), (cache.get(key) or 0) + 1), timeout=None)
+        logger.debug("Bumped answer key version of assessment %s.", assessment_id)
+
+    @staticmethod
+    def invalidate(assessment_id):
+        """
+        Drop the cached answer key of an assessment once the current transaction commits.
+        """
+        if assessment_id is not None:
+            transaction.on_commit(lambda: AnswerKeyService.bump(assessment_id))
+
+    @staticmethod
+    def get(assessment_id):
+        """
+        Return the answer key of an assessment, building and caching it on a miss.
+        """
+        key = AnswerKeyService.ENTRY_KEY.format(
+            assessment_id=AnswerKeyService._normalize(assessment_id),
+            version=AnswerKeyService.get_version(assessment_id),
+        )
+        answer_key = cache.get(key)
+        if answer_key is None:
+            answer_key = AnswerKeyService.build(assessment_id)
+            cache.set(key, answer_key, timeout=settings.ANSWER_KEY_CACHE_TIMEOUT)
+        return answer_key
+
+    @staticmethod
+    def build(assessment_id):
+        """
+        Build the answer key of an assessment with one query per table involved.
+        NAT solutions accept values from `value - tolerance_min` to `value + tolerance_max`
+        once rounded to `decimal_precision` decimals.
+        """
+        questions = Question.objects.filter(assessment_id=assessment_id)
+        fields = {
+            str(question_id): {"type": question_type, "marks": marks, "partial_marking": bool(partial_marking)}
+            for question_id, question_type, marks, partial_marking
+            in questions.values_list("id", "type", "marks", "partial_marking")
+        }
+
+        options = QuestionOption.objects.filter(question__assessment_id=assessment_id).order_by("question_id", "id")
+        for question_id, option_id in options.values_list("question_id", "id"):
+            option_bits = fields[str(question_id)].setdefault("option_bits", {})
+            option_bits[str(option_id)] = 1 << len(option_bits)
+
+        def bit_of(question_id, choice_id):
+            return fields[str(question_id)].get("option_bits", {}).get(str(choice_id), 0)
+
+        for model in (MCQSolution, MSQSolution):
+            solutions = model.objects.filter(question__assessment_id=assessment_id).order_by("choice_id").values_list(
+                "question_id", "choice_id", "solution_explanation"
+            )
+            for question_id, choice_id, explanation in solutions:
+                question = fields[str(question_id)]
+                question["correct"] = question.get("correct", 0) | bit_of(question_id, choice_id)
+                solution = {"choice": str(choice_id), "solution_explanation": explanation}
+                if model is MCQSolution:
+                    question["solution"] = solution
+                else:
+                    question.setdefault("solution", []).append(solution)
+
+        solutions = NATSolution.objects.filter(question__assessment_id=assessment_id).values_list(
+            "question_id", "value", "tolerance_min", "tolerance_max", "decimal_precision", "solution_explanation"
+        )
+        for question_id, value, tolerance_min, tolerance_max, precision, explanation in solutions:
+            fields[str(question_id)].update(
+                nat_range=(
+                    round(value - (tolerance_min or 0), precision),
+                    round(value + (tolerance_max or 0), precision),
+                    precision,
+                ),
+                solution={
+                    "value": value,
+                    "tolerance_max": tolerance_max,
+                    "tolerance_min": tolerance_min,
+                    "decimal_precision": precision,
+                    "solution_explanation": explanation,
+                },
+            )
+
+        solutions = DescriptiveSolution.objects.filter(question__assessment_id=assessment_id).values_list(
+            "question_id", "model_solution", "min_word_limit", "max_word_limit", "solution_explanation"
+        )
+        for question_id, model_solution, min_words, max_words, explanation in solutions:
+            fields[str(question_id)].update(
+                word_limits=(min_words, max_words),
+                solution={
+                    "model_solution": model_solution,
+                    "max_word_limit": max_words,
+                    "min_word_limit": min_words,
+                    "solution_explanation": explanation,
+                },
+            )
+
+        return AnswerKey(
+            assessment_id=str(assessment_id),
+            questions={question_id: QuestionKey(**values) for question_id, values in fields.items()},
+        )
@@ -0,0 +1,241 @@
+# core/assessment/services/attempt_service.py
+
+import logging
+import random
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from .. import constants as ct
+from ..models import AssessmentAttempt, AttemptResponse, AttemptStatus, Question, QuestionOption, QuestionType
+
+logger = logging.getLogger(__name__)
+
+
+class AttemptClosedError(ValueError):
+    """
+    Raised when answers are sent to an attempt that was submitted or ran out of time.
+    """
+
+
+class AttemptService:
+    """
+    Starting, autosaving and submitting assessment attempts.
+
+    Autosaves are built for many students writing at once: the client sends the answers
+    changed since its last save, the server compares them with the stored ones and upserts
+    only those that differ, with one INSERT ... ON CONFLICT DO UPDATE. A save costs at most
+    three queries however many answers it carries: locking the attempt, reading the stored
+    answers and the upsert. The lock makes a save wait for a concurrent submit, so no answer
+    is written once the attempt is closed.
+    """
+
+    @staticmethod
+    def draw_questions(assessment, seed):
+        """
+        Draw the paper of an attempt: `question_visibility_limit` questions of the assessment,
+        picked and ordered by a random generator seeded with `seed`, each with its options
+        shuffled by the same generator.
+        :return: A list of {"id", "type", "options"}, with IDs as strings in paper order.
+        """
+        questions = list(
+            Question.objects.filter(assessment=assessment)
+            .order_by("created_at", "id")
+            .only("id", "type")
+            .prefetch_related(
+                Prefetch("options", queryset=QuestionOption.objects.order_by("id").only("id", "question_id"))
+            )
+        )
+        rng = random.Random(seed)
+        selected = rng.sample(questions, min(assessment.question_visibility_limit, len(questions)))
+        paper = []
+        for question in selected:
+            options = [str(option.pk) for option in question.options.all()]
+            rng.shuffle(options)
+            paper.append({"id": str(question.pk), "type": question.type, "options": options})
+        return paper
+
+    @staticmethod
+    def start(assessment, user, now=None):
+        """
+        Start an attempt, or resume the student's running one.
+        A running attempt that is past its deadline is closed as expired first.
+        :return: (attempt, created)
+        """
+        now = now or timezone.now()
+        running = AssessmentAttempt.objects.filter(
+            assessment=assessment, user=user, status=AttemptStatus.IN_PROGRESS
+        ).first()
+        if running is not None:
+            if running.accepts_answers(now):
+                return running, False
+            AttemptService.close(running, AttemptStatus.EXPIRED, now)
+
+        seed = secrets.randbelow(2 ** 31)
+        attempt = AssessmentAttempt(
+            assessment=assessment,
+            user=user,
+            seed=seed,
+            questions=AttemptService.draw_questions(assessment, seed),
+            started_at=now,
+            deadline=now + timedelta(seconds=assessment.time_limit),
+        )
+        try:
+            with transaction.atomic():
+                attempt.save(force_insert=True)
+        except IntegrityError:
+            # Another request of the same student started the attempt first
+            return AssessmentAttempt.objects.get(
+                assessment=assessment, user=user, status=AttemptStatus.IN_PROGRESS
+            ), False
+        logger.info(f"User {user.pk} started attempt {attempt.pk} of assessment {assessment.pk}.")
+        return attempt, True
+
+    @staticmethod
+    def clean_answer(question, answer):
+        """
+        Validate an answer against a question of the paper and normalise it, so that equal
+        answers compare equal. Null clears the answer.
+        :raise ValueError: If the answer does not fit the question type.
+        """
+        if answer is None:
+            return None
+        question_type = question["type"]
+        if question_type == QuestionType.MCQ:
+            if answer not in question["options"]:
+                raise ValueError("Expected the ID of one of the question's options.")
+            return answer
+        if question_type == QuestionType.MSQ:
+            if (
+                not isinstance(answer, list)
+                or not all(isinstance(option_id, str) for option_id in answer)
+                or not set(answer) <= set(question["options"])
+            ):
+                raise ValueError("Expected a list of IDs of the question's options.")
+            return sorted(set(answer))
+        if question_type == QuestionType.NAT:
+            if isinstance(answer, bool) or not isinstance(answer, (int, float)):
+                raise ValueError("Expected a number.")
+            return answer
+        if question_type == QuestionType.DESC:
+            if not isinstance(answer, str) or len(answer) > ct.ATTEMPT_DESCRIPTIVE_ANSWER_MAX_LEN:
+                raise ValueError(
+                    f"Expected text of at most {ct.ATTEMPT_DESCRIPTIVE_ANSWER_MAX_LEN} characters."
+                )
+            return answer
+        raise ValueError(f"Unsupported question type: {question_type}")
+
+    @staticmethod
+    def clean_answers(attempt, answers):
+        """
+        Validate {question ID: answer} against the attempt's paper.
+        :return: (cleaned answers, {question ID: error})
+        """
+        paper = {question["id"]: question for question in attempt.questions}
+        cleaned, errors = {}, {}
+        for question_id, answer in answers.items():
+            question_id = str(question_id)
+            if question_id not in paper:
+                errors[question_id] = "This question is not part of the attempt."
+                continue
+            try:
+                cleaned[question_id] = AttemptService.clean_answer(paper[question_id], answer)
+            except ValueError as e:
+                errors[question_id] = str(e)
+        return cleaned, errors
+
+    @staticmethod
+    def save_answers(attempt, answers, now=None):
+        """
+        Upsert the answers that differ from the stored ones.
+        :param answers: Cleaned {question ID: answer}, see `clean_answers`.
+        :return: Number of answers written.
+        :raise AttemptClosedError: If the attempt no longer accepts answers.
+        """
+        if not attempt.accepts_answers(now):
+            raise AttemptClosedError("The attempt is closed or its time limit has passed.")
+        if not answers:
+            return 0
+
+        with transaction.atomic():
+            # The attempt may have been submitted since it was loaded: re-check under a row lock
+            running = AssessmentAttempt.objects.select_for_update().filter(
+                pk=attempt.pk, status=AttemptStatus.IN_PROGRESS
+            )
+            if not running.exists():
+                attempt.refresh_from_db(fields=["status", "submitted_at"])
+                raise AttemptClosedError("The attempt is closed or its time limit has passed.")
+
+            stored = {
+                str(question_id): answer
+                for question_id, answer in AttemptResponse.objects.filter(attempt=attempt).values_list(
+                    "question_id", "answer"
+                )
+            }
+            changed = {
+                question_id: answer for question_id, answer in answers.items()
+                if question_id not in stored or stored[question_id] != answer
+            }
+            if changed:
+                AttemptResponse.objects.bulk_create(
+                    [
+                        AttemptResponse(attempt=attempt, question_id=question_id, answer=answer)
+                        for question_id, answer in changed.items()
+                    ],
+                    update_conflicts=True,
+                    unique_fields=["attempt", "question"],
+                    update_fields=["answer", "updated_at"],
+                )
+        return len(changed)
+
+    @staticmethod
+    def close(attempt, status, now=None):
+        """
+        Close a running attempt as submitted or expired. Only the first close takes effect.
+        :return: Whether this call closed the attempt.
+        """
+        now = now or timezone.now()
+        closed = AssessmentAttempt.objects.filter(pk=attempt.pk, status=AttemptStatus.IN_PROGRESS).update(
+            status=status, submitted_at=now, updated_at=now
+        )
+        if closed:
+            attempt.status, attempt.submitted_at = status, now
+        else:
+            attempt.refresh_from_db(fields=["status", "submitted_at"])
+        return bool(closed)
+
+    @staticmethod
+    def submit(attempt, answers=None, now=None):
+        """
+        Submit an attempt, saving the final answers first if it is still within time.
+        Past the deadline the attempt is closed as expired and only the autosaved answers count.
+        :raise AttemptClosedError: If the attempt was already closed.
+        """
+        now = now or timezone.now()
+        if attempt.status != AttemptStatus.IN_PROGRESS:
+            raise AttemptClosedError("The attempt is already closed.")
+        if not attempt.accepts_answers(now):
+            AttemptService.close(attempt, AttemptStatus.EXPIRED, now)
+            return attempt
+        with transaction.atomic():
+            AttemptService.save_answers(attempt, answers or {}, now)
+            if not AttemptService.close(attempt, AttemptStatus.SUBMITTED, now):
+                raise AttemptClosedError("The attempt is already closed.")
+        logger.info(f"Attempt {attempt.pk} was submitted.")
+        return attempt
+
+    @staticmethod
+    def close_overdue(now=None):
+        """
+        Close every running attempt whose time is up as expired, with one UPDATE.
+        :return: Number of attempts closed.
+        """
+        now = now or timezone.now()
+        cutoff = now - timedelta(seconds=settings.ASSESSMENT_SUBMIT_GRACE)
+        return AssessmentAttempt.objects.filter(
+            status=AttemptStatus.IN_PROGRESS, deadline__lt=cutoff
+        ).update(status=AttemptStatus.EXPIRED, submitted_at=now, updated_at=now)
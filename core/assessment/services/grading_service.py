@@ -0,0 +1,153 @@
+# core/assessment/services/grading_service.py
+
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .answer_key_service import AnswerKeyService
+from .attempt_service import AttemptService
+from ..models import AssessmentAttempt, AttemptResponse, AttemptStatus, QuestionType
+
+logger = logging.getLogger(__name__)
+
+
+class GradingService:
+    """
+    Auto-grading of MCQ, MSQ and NAT answers against an assessment's answer key.
+
+    Responses are scored column-wise: all answers to one question at once, with that
+    question's key looked up once. Option sets are compared as int bitsets, so an MSQ answer
+    costs a few integer operations whatever the number of options.
+
+    Scoring: an MCQ or MSQ answer earns full marks when it selects exactly the correct
+    options. With partial marking, an MSQ answer that selects only correct options earns
+    marks in proportion to the correct options it selects; any wrong option scores zero.
+    A NAT answer earns full marks when, rounded to the solution's precision, it lies within
+    the solution's tolerance range. Descriptive questions and questions without a solution
+    are left ungraded (score None).
+    """
+
+    @staticmethod
+    def score_column(key, answers):
+        """
+        Score all answers to one question.
+        :param key: The question's QuestionKey, or None if it has none.
+        :param answers: Answers as stored on AttemptResponse.
+        :return: A list of scores, None for answers that are not auto-graded.
+        """
+        if key is None or not key.gradable:
+            return [None] * len(answers)
+        full = float(key.marks)
+
+        if key.type == QuestionType.NAT:
+            low, high, precision = key.nat_range
+            return [
+                full if isinstance(answer, (int, float)) and not isinstance(answer, bool)
+                and low <= round(answer, precision) <= high else 0.0
+                for answer in answers
+            ]
+
+        option_bits, correct = key.option_bits, key.correct
+        # Only MSQ answers earn partial marks; a wrong option anywhere means zero
+        partial = key.partial_marking and key.type == QuestionType.MSQ
+        correct_count = correct.bit_count()
+        wrong = ~correct
+        scores = []
+        for answer in answers:
+            if answer is None:
+                scores.append(0.0)
+                continue
+            selected = 0
+            if isinstance(answer, str):
+                selected = option_bits.get(answer, 0)
+            elif isinstance(answer, list):
+                for option_id in answer:
+                    selected |= option_bits.get(option_id, 0)
+            if selected == correct:
+                scores.append(full)
+            elif partial and selected and not selected & wrong:
+                scores.append(full * selected.bit_count() / correct_count)
+            else:
+                scores.append(0.0)
+        return scores
+
+    @staticmethod
+    def score_rows(answer_key, rows):
+        """
+        Score (attempt ID, question ID, answer) rows.
+        :return: (list of scores in row order, {attempt ID: total score})
+        """
+        columns = defaultdict(list)
+        for index, (_, question_id, answer) in enumerate(rows):
+            columns[str(question_id)].append((index, answer))
+
+        scores = [None] * len(rows)
+        for question_id, column in columns.items():
+            column_scores = GradingService.score_column(
+                answer_key.questions.get(question_id), [answer for _, answer in column]
+            )
+            for (index, _), score in zip(column, column_scores):
+                scores[index] = score
+
+        totals = defaultdict(float)
+        for (attempt_id, _, _), score in zip(rows, scores):
+            totals[attempt_id] += score or 0.0
+        return scores, totals
+
+    @staticmethod
+    def grade(assessment, regrade=False, batch_size=None, answer_key=None):
+        """
+        Grade the closed attempts of an assessment, `batch_size` attempts at a time, loading
+        the cached answer key once. Running attempts past their time are closed first.
+        Each batch costs one read of its responses and two set-based writes: an upsert of the
+        response scores, then one UPDATE summing them into the attempt totals.
+        :param regrade: Also grade attempts that were graded before.
+        :return: Number of attempts graded.
+        """
+        batch_size = batch_size or settings.GRADING_BATCH_SIZE
+        AttemptService.close_overdue()
+        answer_key = answer_key or AnswerKeyService.get(assessment.pk)
+
+        attempts = AssessmentAttempt.objects.filter(assessment=assessment).exclude(status=AttemptStatus.IN_PROGRESS)
+        if not regrade:
+            attempts = attempts.filter(graded_at__isnull=True)
+        attempt_ids = list(attempts.order_by("pk").values_list("pk", flat=True))
+
+        graded = 0
+        for start in range(0, len(attempt_ids), batch_size):
+            batch = attempt_ids[start:start + batch_size]
+            rows = list(
+                AttemptResponse.objects.filter(attempt_id__in=batch).values_list("attempt_id", "question_id", "answer")
+            )
+            scores, _ = GradingService.score_rows(answer_key, rows)
+
+            now = timezone.now()
+            with transaction.atomic():
+                # The rows exist, so this is one INSERT ... ON CONFLICT DO UPDATE SET score
+                AttemptResponse.objects.bulk_create(
+                    [
+                        AttemptResponse(attempt_id=attempt_id, question_id=question_id, answer=answer, score=score)
+                        for (attempt_id, question_id, answer), score in zip(rows, scores)
+                    ],
+                    update_conflicts=True,
+                    unique_fields=["attempt", "question"],
+                    update_fields=["score"],
+                )
+                totals = (
+                    AttemptResponse.objects.filter(attempt=OuterRef("pk"))
+                    .values("attempt")
+                    .annotate(total=Sum("score"))
+                    .values("total")
+                )
+                AssessmentAttempt.objects.filter(pk__in=batch).update(
+                    score=Coalesce(Subquery(totals), Value(0.0), output_field=FloatField()),
+                    graded_at=now,
+                )
+            graded += len(batch)
+            logger.info(f"Graded {graded}/{len(attempt_ids)} attempts of assessment {assessment.pk}.")
+        return graded
@@ -0,0 +1,90 @@
+# core/assessment/services/paper_service.py
+
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from .answer_key_service import AnswerKeyService
+from ..models import Question, QuestionOption
+
+logger = logging.getLogger(__name__)
+
+
+class PaperService:
+    """
+    Renders the question paper of an attempt: the questions drawn for it, in its order, with
+    their options in its shuffled order. Papers never carry solutions.
+
+    Rendered papers are cached per seed under the answer key version of the assessment, which
+    is bumped on every question, option or solution change. The same seed draws a different
+    paper once questions are added or removed, so the key also carries a digest of the
+    attempt's draw.
+    """
+
+    PAPER_KEY = "assessment_paper:{assessment_id}:v{version}:s{seed}:{draw}"
+
+    @staticmethod
+    def get_cache_key(attempt):
+        draw = hashlib.blake2b(
+            json.dumps(attempt.questions, separators=(",", ":")).encode(), digest_size=8
+        ).hexdigest()
+        return PaperService.PAPER_KEY.format(
+            assessment_id=AnswerKeyService._normalize(attempt.assessment_id),
+            version=AnswerKeyService.get_version(attempt.assessment_id),
+            seed=attempt.seed,
+            draw=draw,
+        )
+
+    @staticmethod
+    def render(attempt):
+        """
+        Render the paper of an attempt with two queries: its questions, then their options.
+        Questions or options deleted since the attempt started are left out.
+        :return: A list of {"id", "text", "hint", "type", "marks", "partial_marking", "options"}.
+        """
+        question_ids = [question["id"] for question in attempt.questions]
+        questions = {
+            str(question.pk): question
+            for question in Question.objects.filter(pk__in=question_ids)
+            .only("id", "text", "hint", "type", "marks", "partial_marking")
+            .prefetch_related(
+                Prefetch("options", queryset=QuestionOption.objects.only("id", "option_text", "question_id"))
+            )
+        }
+
+        paper = []
+        for drawn in attempt.questions:
+            question = questions.get(drawn["id"])
+            if question is None:
+                continue
+            options = {str(option.pk): option.option_text for option in question.options.all()}
+            paper.append({
+                "id": drawn["id"],
+                "text": question.text,
+                "hint": question.hint,
+                "type": question.type,
+                "marks": question.marks,
+                "partial_marking": bool(question.partial_marking),
+                "options": [
+                    {"id": option_id, "option_text": options[option_id]}
+                    for option_id in drawn["options"] if option_id in options
+                ],
+            })
+        return paper
+
+    @staticmethod
+    def get(attempt):
+        """
+        Return the rendered paper of an attempt, rendering and caching it on a miss.
+        """
+        key = PaperService.get_cache_key(attempt)
+        paper = cache.get(key)
+        if paper is None:
+            paper = PaperService.render(attempt)
+            cache.set(key, paper, timeout=settings.PAPER_CACHE_TIMEOUT)
+            logger.debug("Rendered paper of attempt %s.", attempt.pk)
+        return paper
@@ -0,0 +1,137 @@
+# core/assessment/services/question_import_service.py
+
+import io
+import json
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from .answer_key_service import AnswerKeyService
+from ..models import (
+    DescriptiveSolution, MCQSolution, MSQSolution, NATSolution, Question, QuestionOption,
+)
+from ...course.services import CourseCounterService
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionImportService:
+    """
+    Creates questions with their options and solutions in bulk.
+
+    Questions are validated first, then created with one INSERT per table for each batch:
+    questions, options and each solution type. Primary keys are UUIDs generated in Python, so
+    options and solutions are linked to their questions, and solution option indices to
+    options, in memory before anything is written.
+    """
+
+    @staticmethod
+    def read_jsonl(file):
+        """
+        Yield (line number, item, error) from a JSON Lines file, one question per line.
+        `error` is set instead of `item` for lines that are not valid JSON.
+        """
+        if isinstance(file.read(0), bytes):
+            file = io.TextIOWrapper(file, encoding="utf-8-sig")
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line), None
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+
+    @staticmethod
+    def validate(items):
+        """
+        Validate (item number, item, error) triples with QuestionImportSerializer.
+        :return: (list of (item number, validated data), list of {"item", "errors"})
+        """
+        from ..serializers import QuestionImportSerializer
+
+        valid, errors = [], []
+        for number, item, error in items:
+            if error is not None:
+                errors.append({"item": number, "errors": {"non_field_errors": [error]}})
+                continue
+            if not isinstance(item, dict):
+                errors.append({"item": number, "errors": {"non_field_errors": ["Expected a JSON object."]}})
+                continue
+            serializer = QuestionImportSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((number, serializer.validated_data))
+            else:
+                errors.append({"item": number, "errors": serializer.errors})
+        return valid, errors
+
+    @staticmethod
+    def build(assessment, data, rows):
+        """
+        Instantiate one question with its options and solutions, appending them to `rows`.
+        :param data: Validated QuestionSerializer data, without its `assessment`.
+        :param rows: {model: list of unsaved instances}
+        """
+        data = dict(data)
+        options = data.pop("options", None) or []
+        nat_solution = data.pop("nat_solution", None)
+        descriptive_solution = data.pop("descriptive_solution", None)
+        solution_option_index = data.pop("solution_option_index", None)
+        solution_options_indices = data.pop("solution_options_indices", None)
+        data.pop("assessment", None)
+
+        question = Question(assessment=assessment, **data)
+        rows[Question].append(question)
+        options = [QuestionOption(question=question, **option) for option in options]
+        rows[QuestionOption].extend(options)
+
+        if nat_solution is not None:
+            rows[NATSolution].append(NATSolution(question=question, **nat_solution))
+        if descriptive_solution:
+            rows[DescriptiveSolution].append(DescriptiveSolution(question=question, **descriptive_solution))
+        if solution_option_index is not None:
+            rows[MCQSolution].append(MCQSolution(question=question, choice=options[solution_option_index]))
+        for index in sorted(set(solution_options_indices or ())):
+            rows[MSQSolution].append(MSQSolution(question=question, choice=options[index]))
+        return question
+
+    @staticmethod
+    def create(assessment, items, batch_size=None):
+        """
+        Create validated questions of an assessment in bulk, in one transaction.
+        :param items: Validated QuestionSerializer data of each question.
+        :return: The created questions.
+        """
+        batch_size = batch_size or settings.QUESTION_IMPORT_BATCH_SIZE
+        models = (Question, QuestionOption, MCQSolution, MSQSolution, NATSolution, DescriptiveSolution)
+        questions = []
+        with transaction.atomic():
+            for start in range(0, len(items), batch_size):
+                rows = {model: [] for model in models}
+                for data in items[start:start + batch_size]:
+                    questions.append(QuestionImportService.build(assessment, data, rows))
+                for model in models:
+                    if rows[model]:
+                        model.objects.bulk_create(rows[model])
+
+            # bulk_create sends no signals: count the questions and refresh the answer key here
+            CourseCounterService.adjust(
+                CourseCounterService.course_id_for_assessment(assessment.pk), question_count=len(questions)
+            )
+            AnswerKeyService.invalidate(assessment.pk)
+
+        logger.info(f"Created {len(questions)} questions in assessment {assessment.pk}.")
+        return questions
+
+    @staticmethod
+    def run(assessment, items, skip_invalid=False):
+        """
+        Validate (item number, item, error) triples and create the questions.
+        Unless `skip_invalid` is set, nothing is created when any item is invalid.
+        :return: {"created": number of questions created, "errors": per-item errors}
+        """
+        valid, errors = QuestionImportService.validate(items)
+        created = []
+        if valid and (skip_invalid or not errors):
+            created = QuestionImportService.create(assessment, [data for _, data in valid])
+        return {"created": len(created), "errors": errors}
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.assessment.models import (
+    DescriptiveSolution, MCQSolution, MSQSolution, NATSolution, Question, QuestionOption,
+)
+from core.assessment.services.answer_key_service import AnswerKeyService
+
+# Models the answer key is compiled from. Bulk writes send no signals and invalidate explicitly.
+ANSWER_KEY_MODELS = (Question, QuestionOption, MCQSolution, MSQSolution, NATSolution, DescriptiveSolution)
+
+
+def assessment_id_of(instance):
+    if isinstance(instance, Question):
+        return instance.assessment_id
+    return Question.objects.filter(pk=instance.question_id).values_list("assessment_id", flat=True).first()
+
+
+def invalidate_answer_key(sender, instance, **kwargs):
+    """
+    Invalidate the cached answer key of the assessment the saved or deleted row belongs to.
+    """
+    AnswerKeyService.invalidate(assessment_id_of(instance))
+
+
+for model in ANSWER_KEY_MODELS:
+    post_save.connect(invalidate_answer_key, sender=model, dispatch_uid=f"answer_key_save_{model.__name__}")
+    post_delete.connect(invalidate_answer_key, sender=model, dispatch_uid=f"answer_key_delete_{model.__name__}")
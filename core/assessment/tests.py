@@ -0,0 +1,372 @@
+import json
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.assessment.models import (
+    Assessment, AssessmentAttempt, AttemptResponse, AttemptStatus, MCQSolution, MSQSolution, NATSolution,
+    Question, QuestionOption, QuestionType,
+)
+from core.assessment.services import (
+    AnswerKeyService, AttemptClosedError, AttemptService, GradingService, PaperService,
+)
+from core.assessment.views import AssessmentAttemptViewSet, AssessmentViewSet, QuestionViewSet, get_solution_by_question
+from core.users.models import User
+
+
+class AssessmentTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create(email="student@example.com", firebase_uid="student-uid")
+        self.assessment = Assessment.objects.create(title="Quiz", question_visibility_limit=3, time_limit=600)
+        self.mcq = self.question(QuestionType.MCQ, options=3)
+        self.msq = self.question(QuestionType.MSQ, options=4)
+        self.nat = self.question(QuestionType.NAT)
+        self.desc = self.question(QuestionType.DESC)
+
+    def question(self, question_type, options=0, marks=2):
+        question = Question.objects.create(
+            assessment=self.assessment, text=question_type, type=question_type, marks=marks
+        )
+        QuestionOption.objects.bulk_create(
+            [QuestionOption(question=question, option_text=f"Option {i}") for i in range(options)]
+        )
+        return question
+
+
+class TestAttemptService(AssessmentTestCase):
+    def test_start_draws_the_visible_questions_and_resumes(self):
+        attempt, created = AttemptService.start(self.assessment, self.student)
+        self.assertTrue(created)
+        self.assertEqual(len(attempt.questions), 3)
+        self.assertEqual(attempt.deadline - attempt.started_at, timedelta(seconds=600))
+        self.assertEqual(AttemptService.draw_questions(self.assessment, attempt.seed), attempt.questions)
+
+        resumed, created = AttemptService.start(self.assessment, self.student)
+        self.assertFalse(created)
+        self.assertEqual(resumed.pk, attempt.pk)
+
+        # Past the deadline, the running attempt is closed and a new one started
+        later = attempt.deadline + timedelta(hours=1)
+        fresh, created = AttemptService.start(self.assessment, self.student, now=later)
+        self.assertTrue(created)
+        attempt.refresh_from_db()
+        self.assertEqual(attempt.status, AttemptStatus.EXPIRED)
+
+    def test_autosave_writes_only_changed_answers(self):
+        self.assessment.question_visibility_limit = 4
+        self.assessment.save()
+        attempt, _ = AttemptService.start(self.assessment, self.student)
+        options = {question["id"]: question["options"] for question in attempt.questions}
+        answers, errors = AttemptService.clean_answers(attempt, {
+            str(self.mcq.pk): options[str(self.mcq.pk)][0],
+            str(self.msq.pk): list(reversed(options[str(self.msq.pk)][:2])),
+            str(self.nat.pk): 4.5,
+        })
+        self.assertEqual(errors, {})
+
+        with self.assertNumQueries(5):  # savepoint, lock, read the stored answers, one upsert, release
+            self.assertEqual(AttemptService.save_answers(attempt, answers), 3)
+        with self.assertNumQueries(4):
+            self.assertEqual(AttemptService.save_answers(attempt, answers), 0)
+
+        answers[str(self.nat.pk)] = 5
+        answers[str(self.desc.pk)] = "Because."
+        self.assertEqual(AttemptService.save_answers(attempt, answers), 2)
+        stored = dict(AttemptResponse.objects.filter(attempt=attempt).values_list("question_id", "answer"))
+        self.assertEqual(stored[self.nat.pk], 5)
+        self.assertEqual(stored[self.msq.pk], sorted(options[str(self.msq.pk)][:2]))
+        self.assertEqual(len(stored), 4)
+
+    def test_invalid_answers(self):
+        self.assessment.question_visibility_limit = 4
+        self.assessment.save()
+        attempt, _ = AttemptService.start(self.assessment, self.student)
+        _, errors = AttemptService.clean_answers(attempt, {
+            str(self.mcq.pk): "not-an-option",
+            str(self.msq.pk): "not-a-list",
+            str(self.nat.pk): True,
+            "00000000-0000-0000-0000-000000000000": 1,
+        })
+        self.assertEqual(len(errors), 4)
+
+    def test_time_limit(self):
+        attempt, _ = AttemptService.start(self.assessment, self.student)
+        late = attempt.deadline + timedelta(minutes=5)
+        with self.assertRaises(AttemptClosedError):
+            AttemptService.save_answers(attempt, {}, now=late)
+
+        AttemptService.submit(attempt, {}, now=late)
+        self.assertEqual(attempt.status, AttemptStatus.EXPIRED)
+        with self.assertRaises(AttemptClosedError):
+            AttemptService.submit(attempt)
+
+    def test_autosave_after_a_concurrent_submit_is_rejected(self):
+        attempt, _ = AttemptService.start(self.assessment, self.student)
+        question_id = attempt.question_ids[0]
+        stale = AssessmentAttempt.objects.get(pk=attempt.pk)
+        AttemptService.submit(attempt, {question_id: None})
+
+        with self.assertRaises(AttemptClosedError):
+            AttemptService.save_answers(stale, {question_id: "late"})
+        self.assertEqual(stale.status, AttemptStatus.SUBMITTED)
+        self.assertEqual(list(AttemptResponse.objects.filter(attempt=attempt).values_list("answer", flat=True)), [None])
+
+    def test_close_overdue(self):
+        attempt, _ = AttemptService.start(self.assessment, self.student)
+        self.assertEqual(AttemptService.close_overdue(), 0)
+        self.assertEqual(AttemptService.close_overdue(now=attempt.deadline + timedelta(hours=1)), 1)
+        attempt.refresh_from_db()
+        self.assertEqual(attempt.status, AttemptStatus.EXPIRED)
+
+
+class TestGrading(AssessmentTestCase):
+    def setUp(self):
+        super().setUp()
+        self.msq.partial_marking = True
+        self.msq.save()
+        self.mcq_options = list(self.mcq.options.order_by("id"))
+        self.msq_options = list(self.msq.options.order_by("id"))
+        MCQSolution.objects.create(question=self.mcq, choice=self.mcq_options[1], solution_explanation="-")
+        for option in self.msq_options[:2]:
+            MSQSolution.objects.create(question=self.msq, choice=option, solution_explanation="-")
+        NATSolution.objects.create(
+            question=self.nat, value=2.5, tolerance_min=0.1, tolerance_max=0.2, decimal_precision=2,
+            solution_explanation="-",
+        )
+
+    def answers(self, mcq=None, msq=None, nat=None, desc=None):
+        return [
+            (1, str(self.mcq.pk), None if mcq is None else str(self.mcq_options[mcq].pk)),
+            (1, str(self.msq.pk), None if msq is None else [str(self.msq_options[i].pk) for i in msq]),
+            (1, str(self.nat.pk), nat),
+            (1, str(self.desc.pk), desc),
+        ]
+
+    def test_answer_key_is_built_with_one_query_per_table(self):
+        with self.assertNumQueries(6):
+            key = AnswerKeyService.build(self.assessment.pk)
+        self.assertEqual(key.questions[str(self.msq.pk)].correct, 0b11)
+        self.assertEqual(key.questions[str(self.nat.pk)].nat_range, (2.4, 2.7, 2))
+        self.assertFalse(key.questions[str(self.desc.pk)].gradable)
+
+    def test_answer_key_is_cached_until_a_solution_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            key = AnswerKeyService.get(self.assessment.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(AnswerKeyService.get(self.assessment.pk).questions), 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MSQSolution.objects.create(question=self.msq, choice=self.msq_options[2], solution_explanation="-")
+        self.assertEqual(key.questions[str(self.msq.pk)].correct, 0b011)
+        self.assertEqual(AnswerKeyService.get(self.assessment.pk).questions[str(self.msq.pk)].correct, 0b111)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mcq_options[1].delete()
+        self.assertFalse(AnswerKeyService.get(self.assessment.pk).questions[str(self.mcq.pk)].gradable)
+
+    def test_solution_endpoint_reads_the_answer_key(self):
+        def get(question):
+            request = APIRequestFactory().get("/")
+            force_authenticate(request, user=self.student)
+            return get_solution_by_question(request, question_id=question.pk)
+
+        response = get(self.msq)
+        self.assertEqual(response.data["question_type"], QuestionType.MSQ)
+        self.assertEqual(
+            [solution["choice"] for solution in response.data["solution"]],
+            [str(option.pk) for option in self.msq_options[:2]],
+        )
+        self.assertEqual(get(self.nat).data["solution"]["value"], 2.5)
+        with self.assertNumQueries(1):  # the question's assessment; the key is cached
+            self.assertEqual(get(self.mcq).data["solution"]["choice"], str(self.mcq_options[1].pk))
+        self.assertEqual(get(self.desc).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_scoring(self):
+        key = AnswerKeyService.build(self.assessment.pk)
+        scores, totals = GradingService.score_rows(key, self.answers(mcq=1, msq=[0, 1], nat=2.7, desc="x"))
+        self.assertEqual(scores, [2.0, 2.0, 2.0, None])
+        self.assertEqual(totals[1], 6.0)
+
+        # Partial MSQ credit, a wrong MCQ option, a NAT value outside the range once rounded
+        scores, _ = GradingService.score_rows(key, self.answers(mcq=0, msq=[1], nat=2.706))
+        self.assertEqual(scores, [0.0, 1.0, 0.0, None])
+        # Any wrong MSQ option scores zero
+        scores, _ = GradingService.score_rows(key, self.answers(msq=[0, 2], nat=2.394))
+        self.assertEqual(scores[1:3], [0.0, 0.0])
+
+    def test_grade_assessment(self):
+        self.assessment.question_visibility_limit = 4
+        self.assessment.save()
+        attempt, _ = AttemptService.start(self.assessment, self.student)
+        AttemptService.submit(attempt, {str(self.mcq.pk): str(self.mcq_options[1].pk), str(self.nat.pk): 1})
+        AttemptService.start(self.assessment, User.objects.create(email="x@example.com", firebase_uid="x"))
+
+        self.assertEqual(GradingService.grade(self.assessment), 1)
+        attempt.refresh_from_db()
+        self.assertEqual(attempt.score, 2.0)
+        self.assertEqual(
+            dict(attempt.responses.values_list("question_id", "score")), {self.mcq.pk: 2.0, self.nat.pk: 0.0}
+        )
+        self.assertEqual(GradingService.grade(self.assessment), 0)
+        self.assertEqual(GradingService.grade(self.assessment, regrade=True), 1)
+
+
+class TestAttemptViews(AssessmentTestCase):
+    def call(self, viewset, actions, method, data=None, **kwargs):
+        request = getattr(APIRequestFactory(), method)("/", data, format="json")
+        force_authenticate(request, user=self.student)
+        return viewset.as_view(actions)(request, **kwargs)
+
+    def test_start_autosave_submit(self):
+        response = self.call(AssessmentViewSet, {"post": "start_attempt"}, "post", pk=self.assessment.pk)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        attempt_id = response.data["id"]
+        question_id = response.data["question_ids"][0]
+        attempt = AssessmentAttempt.objects.get(pk=attempt_id)
+        question = next(question for question in attempt.questions if question["id"] == question_id)
+        answer = {
+            QuestionType.MCQ: lambda: question["options"][0],
+            QuestionType.MSQ: lambda: question["options"][:1],
+            QuestionType.NAT: lambda: 1,
+            QuestionType.DESC: lambda: "Text",
+        }[question["type"]]()
+
+        response = self.call(
+            AssessmentAttemptViewSet, {"patch": "autosave"}, "patch", {"answers": {question_id: answer}}, pk=attempt_id
+        )
+        self.assertEqual(response.data, {"saved": 1})
+
+        response = self.call(
+            AssessmentAttemptViewSet, {"patch": "autosave"}, "patch", {"answers": {"bogus": 1}}, pk=attempt_id
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.call(AssessmentAttemptViewSet, {"post": "submit"}, "post", {}, pk=attempt_id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], AttemptStatus.SUBMITTED)
+        self.assertEqual(response.data["answers"], {question_id: answer})
+
+        response = self.call(
+            AssessmentAttemptViewSet, {"patch": "autosave"}, "patch", {"answers": {question_id: answer}}, pk=attempt_id
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_attempts_of_other_users_are_hidden(self):
+        other = User.objects.create(email="other@example.com", firebase_uid="other-uid")
+        attempt, _ = AttemptService.start(self.assessment, other)
+        response = self.call(AssessmentAttemptViewSet, {"get": "retrieve"}, "get", pk=attempt.pk)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_paper(self):
+        MCQSolution.objects.create(question=self.mcq, choice=self.mcq.options.first(), solution_explanation="secret")
+        attempt, _ = AttemptService.start(self.assessment, self.student)
+        with self.assertNumQueries(3):  # attempt, questions, options
+            response = self.call(AssessmentAttemptViewSet, {"get": "paper"}, "get", pk=attempt.pk)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        questions = response.data["questions"]
+        self.assertEqual([question["id"] for question in questions], attempt.question_ids)
+        self.assertEqual(
+            [[option["id"] for option in question["options"]] for question in questions],
+            [question["options"] for question in attempt.questions],
+        )
+        self.assertNotIn("secret", json.dumps(response.data, default=str))
+
+        with self.assertNumQueries(1):
+            self.call(AssessmentAttemptViewSet, {"get": "paper"}, "get", pk=attempt.pk)
+
+        # Editing a question renders the paper again
+        Question.objects.filter(pk__in=attempt.question_ids).update(text="Edited")
+        with self.captureOnCommitCallbacks(execute=True):
+            AnswerKeyService.invalidate(self.assessment.pk)
+        self.assertEqual({question["text"] for question in PaperService.get(attempt)}, {"Edited"})
+
+
+class TestPaperDraw(AssessmentTestCase):
+    def test_draw_is_deterministic_per_seed(self):
+        for _ in range(3):
+            self.question(QuestionType.MSQ, options=6)
+        papers = {seed: AttemptService.draw_questions(self.assessment, seed) for seed in range(20)}
+        self.assertEqual(papers[7], AttemptService.draw_questions(self.assessment, 7))
+        self.assertTrue(all(len(paper) == 3 for paper in papers.values()))
+        self.assertGreater(len({tuple(question["id"] for question in paper) for paper in papers.values()}), 1)
+
+        options = {str(option.pk) for option in QuestionOption.objects.all()}
+        orders = {
+            tuple(question["options"]) for paper in papers.values() for question in paper if len(question["options"]) == 6
+        }
+        self.assertGreater(len(orders), 1)
+        self.assertTrue(all(set(order) <= options for order in orders))
+
+
+class TestQuestionImport(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="author@example.com", firebase_uid="author-uid")
+        self.assessment = Assessment.objects.create(title="Bank", question_visibility_limit=10, time_limit=600)
+
+    def item(self, number):
+        kind = number % 4
+        options = [{"option_text": f"Option {i}"} for i in range(4)]
+        base = {"text": f"Question {number}", "marks": 2}
+        if kind == 0:
+            return {**base, "type": "MCQ", "options": options, "solution_option_index": 2}
+        if kind == 1:
+            return {**base, "type": "MSQ", "options": options, "solution_options_indices": [0, 3], "partial_marking": True}
+        if kind == 2:
+            return {**base, "type": "NAT", "nat_solution": {
+                "value": 1.5, "tolerance_min": 0.1, "tolerance_max": 0.1, "decimal_precision": 1,
+                "solution_explanation": "-",
+            }}
+        return {**base, "type": "DESC", "descriptive_solution": {"model_solution": "-", "solution_explanation": "-"}}
+
+    def post(self, data, format="json"):
+        request = APIRequestFactory().post("/", data, format=format)
+        force_authenticate(request, user=self.user)
+        return AssessmentViewSet.as_view({"post": "import_questions"})(request, pk=self.assessment.pk)
+
+    def test_import_uses_a_few_statements_per_batch(self):
+        items = [self.item(number) for number in range(40)]
+        with self.assertNumQueries(10):  # assessment, savepoint, 6 inserts, course lookup, release
+            response = self.post(items)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {"created": 40, "errors": []})
+
+        self.assertEqual(Question.objects.filter(assessment=self.assessment).count(), 40)
+        self.assertEqual(QuestionOption.objects.count(), 80)
+        self.assertEqual(MSQSolution.objects.count(), 20)
+        mcq = MCQSolution.objects.select_related("choice").first()
+        self.assertEqual(mcq.choice.option_text, "Option 2")
+        self.assertEqual(mcq.choice.question_id, mcq.question_id)
+
+    def test_invalid_items_are_reported_and_nothing_is_created(self):
+        bad_index = {**self.item(0), "solution_option_index": 7}
+        missing_solution = {key: value for key, value in self.item(2).items() if key != "nat_solution"}
+        response = self.post({"questions": [self.item(1), bad_index, "text", missing_solution]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error["item"] for error in response.data["errors"]], [2, 3, 4])
+        self.assertFalse(Question.objects.exists())
+
+        response = self.post({"questions": [self.item(1), bad_index], "skip_invalid": True})
+        self.assertEqual(response.data["created"], 1)
+
+    def test_jsonl_upload(self):
+        lines = [json.dumps(self.item(number)) for number in range(3)] + ["{not json", ""]
+        upload = SimpleUploadedFile("questions.jsonl", "\n".join(lines).encode())
+        response = self.post({"file": upload, "skip_invalid": "true"}, format="multipart")
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(response.data["errors"][0]["item"], 4)
+
+    def test_single_create_goes_through_the_bulk_path(self):
+        request = APIRequestFactory().post("/", {**self.item(1), "assessment": str(self.assessment.pk)}, format="json")
+        force_authenticate(request, user=self.user)
+        response = QuestionViewSet.as_view({"post": "create"})(request)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(len(response.data["options"]), 4)
+        self.assertEqual(MSQSolution.objects.count(), 2)
+
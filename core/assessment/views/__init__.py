@@ -1,3 +1,4 @@
 from .assessment import AssessmentViewSet
+from .attempt import AssessmentAttemptViewSet
 from .question import QuestionViewSet
 from .solution import get_solution_by_question
\ No newline at end of file
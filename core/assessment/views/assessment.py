@@ -1,10 +1,16 @@
 from django.core import serializers
-from rest_framework import viewsets
-from rest_framework.exceptions import MethodNotAllowed
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.exceptions import MethodNotAllowed, NotFound
+from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from ..models import Assessment
-from ..serializers import AssessmentSerializer
-from ...course.models import Section
+from ..serializers import AssessmentSerializer, AssessmentAttemptSerializer, QuestionImportRequestSerializer
+from ..services import AttemptService, QuestionImportService
+from ...course.models import Course, Section
+from ...course.services import CourseCacheService
+from ...utils.conditional import ConditionalGetMixin
 from django.forms import ValidationError
 
 
@@ -48,10 +54,92 @@ from django.forms import ValidationError
         description="Delete an existing Assessment by ID.",
         responses={"204": "Assessment deleted successfully."},
     ),
+    start_attempt=extend_schema(
+        tags=["Assessment"],
+        summary="Start an Attempt",
+        description=(
+            "Start an attempt of the assessment for the current user, drawing at most "
+            "`question_visibility_limit` of its questions, or resume the running attempt. "
+            "The attempt must be submitted within `time_limit` seconds."
+        ),
+        request=None,
+        responses={200: AssessmentAttemptSerializer, 201: AssessmentAttemptSerializer},
+    ),
+    import_questions=extend_schema(
+        tags=["Question"],
+        summary="Import Questions",
+        description=(
+            "Create many questions of the assessment at once, with their options and solutions, "
+            "from a JSON list (`questions`, or the request body itself) or an uploaded JSON Lines "
+            "`file`. Every question is validated first; unless `skip_invalid` is set, nothing is "
+            "created when any question is invalid. Errors are reported by item number (list "
+            "position or line number, from 1)."
+        ),
+        request={
+            "application/json": QuestionImportRequestSerializer,
+            "multipart/form-data": QuestionImportRequestSerializer,
+        },
+        responses={
+            201: {
+                "type": "object",
+                "properties": {
+                    "created": {"type": "integer"},
+                    "errors": {"type": "array", "items": {"type": "object"}},
+                },
+            },
+            400: {"description": "Invalid questions; nothing was created."},
+        },
+    ),
 )
-class AssessmentViewSet(viewsets.ModelViewSet):
+class AssessmentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     A ViewSet for managing Assessments.
     """
     queryset = Assessment.objects.all()
     serializer_class = AssessmentSerializer
+
+    def get_validators(self):
+        if self.action == "retrieve":
+            course_id = CourseCacheService.course_id_of(Assessment, self.kwargs["pk"])
+            return CourseCacheService.get_validators(course_id) if course_id else None
+        return None
+
+    @action(detail=True, methods=["post"], url_path="attempts")
+    def start_attempt(self, request, pk=None):
+        """
+        Start or resume the current user's attempt of the assessment.
+        """
+        assessment = self.get_object()
+        course_id = CourseCacheService.course_id_of(Assessment, assessment.pk)
+        if course_id is not None and not Course.objects.is_accessible_by(request.user, course_id):
+            raise NotFound()
+        attempt, created = AttemptService.start(assessment, request.user)
+        return Response(
+            AssessmentAttemptSerializer(attempt).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="questions/import",
+        parser_classes=[JSONParser, MultiPartParser, FormParser],
+    )
+    def import_questions(self, request, pk=None):
+        """
+        Bulk-create questions of the assessment.
+        """
+        assessment = self.get_object()
+        data = {"questions": request.data} if isinstance(request.data, list) else request.data
+        serializer = QuestionImportRequestSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if "file" in data:
+            items = QuestionImportService.read_jsonl(data["file"])
+        else:
+            items = ((number, item, None) for number, item in enumerate(data["questions"], start=1))
+        report = QuestionImportService.run(assessment, items, skip_invalid=data["skip_invalid"])
+
+        failed = report["errors"] and not report["created"]
+        return Response(report, status=status.HTTP_400_BAD_REQUEST if failed else status.HTTP_201_CREATED)
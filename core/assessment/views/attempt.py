@@ -0,0 +1,126 @@
+# core/assessment/views/attempt.py
+
+from django.db.models import Prefetch
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import AssessmentAttempt, AttemptResponse
+from ..serializers import AssessmentAttemptSerializer, AssessmentPaperSerializer, AttemptAnswersSerializer
+from ..services import AttemptClosedError, AttemptService, PaperService
+
+
+@extend_schema_view(
+    retrieve=extend_schema(
+        tags=["Assessment"],
+        summary="Retrieve an Attempt",
+        description="Retrieve one of the current user's assessment attempts with its saved answers.",
+        responses=AssessmentAttemptSerializer,
+    ),
+    paper=extend_schema(
+        tags=["Assessment"],
+        summary="Retrieve the Paper of an Attempt",
+        description=(
+            "The questions drawn for the attempt, in its order and with its option order. "
+            "Solutions are never included."
+        ),
+        responses=AssessmentPaperSerializer,
+    ),
+    autosave=extend_schema(
+        tags=["Assessment"],
+        summary="Autosave Answers",
+        description=(
+            "Save the answers changed since the last save. Only answers that differ from the "
+            "stored ones are written. Rejected with 409 once the attempt is closed or its time "
+            "limit has passed."
+        ),
+        request=AttemptAnswersSerializer,
+        responses={
+            200: {"type": "object", "properties": {"saved": {"type": "integer"}}},
+            400: {"description": "Errors by question ID."},
+            409: {"description": "The attempt is closed."},
+        },
+    ),
+    submit=extend_schema(
+        tags=["Assessment"],
+        summary="Submit an Attempt",
+        description=(
+            "Save the final answers, if any, and close the attempt. Past the time limit the "
+            "attempt is closed as expired and only the autosaved answers count."
+        ),
+        request=AttemptAnswersSerializer,
+        responses={200: AssessmentAttemptSerializer, 409: {"description": "The attempt is closed."}},
+    ),
+)
+class AssessmentAttemptViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Attempts of the current user. Attempts are started from the assessment.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = AssessmentAttemptSerializer
+
+    def get_queryset(self):
+        attempts = AssessmentAttempt.objects.filter(user=self.request.user)
+        if self.action == "autosave":
+            # Only what validating and storing the answers needs
+            return attempts.only("id", "status", "deadline", "questions")
+        if self.action == "paper":
+            return attempts.only("id", "assessment_id", "seed", "deadline", "questions")
+        return attempts.prefetch_related(
+            Prefetch("responses", queryset=AttemptResponse.objects.only("attempt_id", "question_id", "answer"))
+        )
+
+    def get_answers(self, request, attempt):
+        """
+        Validate the answers of the request against the attempt, or return the error response.
+        """
+        serializer = AttemptAnswersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        answers, errors = AttemptService.clean_answers(attempt, serializer.validated_data["answers"])
+        if errors:
+            return None, Response({"answers": errors}, status=status.HTTP_400_BAD_REQUEST)
+        return answers, None
+
+    @action(detail=True, methods=["get"])
+    def paper(self, request, pk=None):
+        """
+        Return the cached question paper of the attempt.
+        """
+        attempt = self.get_object()
+        return Response(
+            {"attempt": str(attempt.pk), "deadline": attempt.deadline, "questions": PaperService.get(attempt)},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=["patch"], url_path="answers")
+    def autosave(self, request, pk=None):
+        """
+        Upsert the changed answers of a running attempt.
+        """
+        attempt = self.get_object()
+        answers, error = self.get_answers(request, attempt)
+        if error is not None:
+            return error
+        try:
+            saved = AttemptService.save_answers(attempt, answers)
+        except AttemptClosedError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
+        return Response({"saved": saved}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"])
+    def submit(self, request, pk=None):
+        """
+        Submit the attempt with its final answers.
+        """
+        attempt = self.get_object()
+        answers, error = self.get_answers(request, attempt)
+        if error is not None:
+            return error
+        try:
+            AttemptService.submit(attempt, answers)
+        except AttemptClosedError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
+        attempt = self.get_queryset().get(pk=attempt.pk)
+        return Response(self.get_serializer(attempt).data, status=status.HTTP_200_OK)
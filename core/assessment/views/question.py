@@ -4,6 +4,7 @@ from rest_framework import viewsets
 from rest_framework.exceptions import NotFound
 from drf_spectacular.utils import extend_schema, OpenApiParameter, extend_schema_view
 from ..models import Question
+from ...utils.pagination import KeysetPagination
 from ..serializers import QuestionSerializer
 
 
@@ -66,6 +67,7 @@ class QuestionViewSet(viewsets.ModelViewSet):
     """
     queryset = Question.objects.all()
     serializer_class = QuestionSerializer
+    pagination_class = KeysetPagination
 
     def list(self, request, *args, **kwargs):
         """
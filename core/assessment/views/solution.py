@@ -8,6 +8,7 @@ from rest_framework.viewsets import ReadOnlyModelViewSet, ModelViewSet
 
 from ..models import Question, NATSolution, DescriptiveSolution, MCQSolution, MSQSolution, QuestionOption
 from ..serializers import (SolutionResponseSerializer, QuestionOptionSerializer)
+from ..services import AnswerKeyService
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -34,22 +35,18 @@ from ..serializers import (
 )
 @api_view(["GET"])
 def get_solution_by_question(request, question_id):
-    try:
-        question = Question.objects.get(id=question_id)
-    except Question.DoesNotExist:
+    # Read from the assessment's cached answer key rather than probing each solution table
+    assessment_id = Question.objects.filter(id=question_id).values_list("assessment_id", flat=True).first()
+    if assessment_id is None:
         return Response({"error": "Question not found"}, status=status.HTTP_404_NOT_FOUND)
 
-    serializer = SolutionResponseSerializer({
-        "question": question,
-        "question_type": question.type,
-    })
-
-    solution_data = serializer.data.get('solution')
-
-    if not solution_data:
+    question_key = AnswerKeyService.get(assessment_id).questions.get(str(question_id))
+    if question_key is None or not question_key.solution:
         return Response({"error": "Solution not found for the given question"}, status=status.HTTP_404_NOT_FOUND)
 
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    return Response(
+        {"question_type": question_key.type, "solution": question_key.solution}, status=status.HTTP_200_OK
+    )
 
 
 @extend_schema(
@@ -1,9 +1,9 @@
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from firebase_admin import auth, credentials, initialize_app
+from firebase_admin import auth
 from core.users.models import User
-from decouple import config
-import os
+from .token_cache import TokenCache
+from .verifiers import get_firebase_app, get_verifier
 
 
 class FirebaseAuthentication(BaseAuthentication):
@@ -15,29 +15,29 @@ class FirebaseAuthentication(BaseAuthentication):
 
         try:
             id_token = auth_header.split(" ")[1]  # Extract token from Bearer
-            decoded_token = auth.verify_id_token(id_token)
+            decoded_token = TokenCache.get_claims(id_token)
+            if decoded_token is None:
+                decoded_token = get_verifier().verify(id_token)
+                TokenCache.set_claims(id_token, decoded_token)
             firebase_uid = decoded_token["uid"]
 
-            # Get or create user in the database
-            user, created = User.objects.get_or_create(
-                firebase_uid=firebase_uid,
-                defaults={"email": decoded_token["email"]},
-            )
+            user = TokenCache.get_user(firebase_uid)
+            if user is None:
+                # Get or create user in the database
+                user, created = User.objects.get_or_create(
+                    firebase_uid=firebase_uid,
+                    defaults={"email": decoded_token["email"]},
+                )
+                TokenCache.set_user(user)
             return (user, None)
         except Exception as e:
             raise AuthenticationFailed(f"Invalid Firebase ID token: {str(e)}")
 
-cred_path = config("FIREBASE_ADMIN_SDK_CREDENTIALS_PATH")
-if not cred_path:
-    raise Exception("Firebase Admin SDK credentials not configured.")
-
-cred = credentials.Certificate(cred_path)
-firebase_app = initialize_app(cred)
 
 def test_firebase():
     try:
-        user = auth.get_user_by_email("testuser@example.com")
+        user = auth.get_user_by_email("testuser@example.com", app=get_firebase_app())
 
         print(f"User: {user.uid}")
     except Exception as e:
-        print(f"Error: {str(e)}")
\ No newline at end of file
+        print(f"Error: {str(e)}")
@@ -0,0 +1,70 @@
+# In core/authentication/management/commands/benchmark_token_verification.py
+import time
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+
+from core.authentication.firebase import FirebaseAuthentication
+from core.authentication.token_cache import TokenCache
+from core.authentication.verifiers import LocalTokenVerifier, set_verifier
+
+
+class Command(BaseCommand):
+    help = "Measure ID token verification and the full authentication path offline, with a throwaway RS256 key"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tokens", type=int, default=1000, help="Number of distinct tokens to sign.")
+        parser.add_argument("--users", type=int, default=100, help="Number of distinct users the tokens belong to.")
+        parser.add_argument("--repeat", type=int, default=10, help="Authenticated requests per token on the warm path.")
+
+    def handle(self, *args, **kwargs):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        verifier = LocalTokenVerifier(
+            keys={"benchmark": private_key.public_key()}, issuer="benchmark", audience="benchmark"
+        )
+        now = int(time.time())
+        tokens = [
+            jwt.encode(
+                {
+                    "iss": "benchmark", "aud": "benchmark", "iat": now, "exp": now + 3600,
+                    "sub": f"benchmark-{i % kwargs['users']}", "email": f"benchmark-{i % kwargs['users']}@example.com",
+                    "jti": str(i),
+                },
+                private_key,
+                algorithm="RS256",
+                headers={"kid": "benchmark"},
+            )
+            for i in range(kwargs["tokens"])
+        ]
+
+        set_verifier(verifier)
+        try:
+            self.report("Signature verification", len(tokens), lambda: [verifier.verify(t) for t in tokens])
+
+            factory = APIRequestFactory()
+            requests = [factory.get("/", HTTP_AUTHORIZATION=f"Bearer {t}") for t in tokens]
+            authentication = FirebaseAuthentication()
+
+            # Users created on the cold path are rolled back
+            with transaction.atomic():
+                TokenCache.clear()
+                self.report("Authentication, cold", len(requests),
+                            lambda: [authentication.authenticate(r) for r in requests])
+                self.report("Authentication, cached", len(requests) * kwargs["repeat"],
+                            lambda: [authentication.authenticate(r) for _ in range(kwargs["repeat"]) for r in requests])
+                self.stdout.write(f"Cache: {TokenCache.stats()}")
+                transaction.set_rollback(True)
+        finally:
+            TokenCache.clear()
+            set_verifier(None)
+
+    def report(self, label, count, run):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{label}: {count} in {elapsed:.3f}s ({count / elapsed:,.0f}/s, {elapsed / count * 1e6:.1f} µs each)"
+        )
@@ -1,3 +1,160 @@
+import json
+import tempfile
+import time
+from unittest import mock
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
 from django.test import TestCase
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+
+from core.authentication.firebase import FirebaseAuthentication
+from core.authentication.token_cache import ExpiringLRUCache, TokenCache
+from core.authentication.verifiers import LocalTokenVerifier, set_verifier
+from core.users.models import User
+from core.users.services.firebase_service import FirebaseAuthService
+
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+PUBLIC_PEM = PRIVATE_KEY.public_key().public_bytes(
+    serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+).decode()
+
+
+def make_token(uid="student-uid", email="student@example.com", kid="test", key=PRIVATE_KEY, **claims):
+    now = int(time.time())
+    payload = {"iss": "test-issuer", "aud": "test-audience", "iat": now, "exp": now + 3600, "sub": uid, "email": email}
+    payload.update(claims)
+    return jwt.encode(payload, key, algorithm="RS256", headers={"kid": kid})
+
+
+def make_verifier():
+    return LocalTokenVerifier(
+        keys={"test": PRIVATE_KEY.public_key()}, issuer="test-issuer", audience="test-audience"
+    )
+
+
+class TestExpiringLRUCache(TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = ExpiringLRUCache(maxsize=2)
+        expires_at = time.time() + 60
+        cache.set("a", 1, expires_at)
+        cache.set("b", 2, expires_at)
+        cache.get("a")
+        cache.set("c", 3, expires_at)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats(), {"size": 2, "hits": 2, "misses": 1})
+
+    def test_expired_entries_are_misses(self):
+        cache = ExpiringLRUCache(maxsize=2)
+        cache.set("a", 1, time.time() - 1)
+        cache.set("b", 2, time.time() + 60)
+        with mock.patch("core.authentication.token_cache.time.time", return_value=time.time() + 120):
+            self.assertIsNone(cache.get("b"))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["size"], 0)
+
+
+class TestLocalTokenVerifier(TestCase):
+    def setUp(self):
+        self.verifier = make_verifier()
+
+    def test_valid_token(self):
+        claims = self.verifier.verify(make_token())
+        self.assertEqual((claims["uid"], claims["email"]), ("student-uid", "student@example.com"))
+
+    def test_rejected_tokens(self):
+        other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        for token in (
+            make_token(exp=int(time.time()) - 10),
+            make_token(aud="someone-else"),
+            make_token(iss="someone-else"),
+            make_token(kid="unknown"),
+            make_token(key=other_key),
+            make_token(uid=""),
+        ):
+            with self.assertRaises(jwt.InvalidTokenError):
+                self.verifier.verify(token)
+
+    def test_loads_pem_and_jwks_key_sets(self):
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(PRIVATE_KEY.public_key()))
+        jwk["kid"] = "test"
+        for key_set in ({"test": PUBLIC_PEM}, {"keys": [jwk]}):
+            with tempfile.NamedTemporaryFile("w", suffix=".json") as f:
+                json.dump(key_set, f)
+                f.flush()
+                keys = LocalTokenVerifier.load_keys(f.name)
+            verifier = LocalTokenVerifier(keys=keys, issuer="test-issuer", audience="test-audience")
+            self.assertEqual(verifier.verify(make_token())["uid"], "student-uid")
+
+
+class TestFirebaseAuthentication(TestCase):
+    def setUp(self):
+        TokenCache.clear()
+        self.verifier = make_verifier()
+        set_verifier(self.verifier)
+        self.user = User.objects.create(email="student@example.com", firebase_uid="student-uid")
+
+    def tearDown(self):
+        TokenCache.clear()
+        set_verifier(None)
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return FirebaseAuthentication().authenticate(request)
+
+    def test_repeated_token_skips_verification_and_db(self):
+        token = make_token()
+        with mock.patch.object(self.verifier, "verify", wraps=self.verifier.verify) as verify:
+            user, _ = self.authenticate(token)
+            self.assertEqual(user.pk, self.user.pk)
+
+            with self.assertNumQueries(0):
+                user, _ = self.authenticate(token)
+            self.assertEqual(user.pk, self.user.pk)
+            verify.assert_called_once_with(token)
+        self.assertEqual(TokenCache.stats()["tokens"]["hits"], 1)
+
+    def test_expired_token_is_verified_again(self):
+        token = make_token(exp=int(time.time()) + 2)
+        with mock.patch.object(self.verifier, "verify", wraps=self.verifier.verify) as verify:
+            self.authenticate(token)
+            self.authenticate(token)
+        self.assertEqual(verify.call_count, 2)
+
+    def test_unknown_user_is_created_once(self):
+        self.authenticate(make_token(uid="new-uid", email="new@example.com"))
+        self.authenticate(make_token(uid="new-uid", email="new@example.com", jti="second"))
+        self.assertEqual(User.objects.filter(firebase_uid="new-uid").count(), 1)
+
+    def test_invalid_token(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(make_token(aud="someone-else"))
+        self.assertEqual(TokenCache.stats()["tokens"]["size"], 0)
+
+    def test_disable_user_purges_cached_tokens(self):
+        token = make_token()
+        self.authenticate(token)
+
+        with mock.patch("core.users.services.firebase_service.get_firebase_app"), \
+                mock.patch("core.users.services.firebase_service.firebase_auth.update_user"):
+            FirebaseAuthService.disable_user("student-uid")
+
+        self.assertEqual(TokenCache.stats()["tokens"]["size"], 0)
+        self.assertIsNone(TokenCache.get_user("student-uid"))
+        with mock.patch.object(self.verifier, "verify", wraps=self.verifier.verify) as verify:
+            self.authenticate(token)
+        verify.assert_called_once_with(token)
+
+    def test_purge_users_scans_the_tokens_once(self):
+        for i in range(5):
+            TokenCache.set_claims(f"token-{i}", {"uid": f"uid-{i % 3}", "exp": time.time() + 600})
+        with mock.patch.object(TokenCache.tokens, "remove_where", wraps=TokenCache.tokens.remove_where) as scan:
+            TokenCache.purge_users(["uid-0", "uid-1"])
+        scan.assert_called_once()
+        self.assertEqual(TokenCache.stats()["tokens"]["size"], 1)
+        self.assertEqual(TokenCache.get_claims("token-2")["uid"], "uid-2")
 
-# Create your tests here.
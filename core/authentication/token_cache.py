@@ -0,0 +1,151 @@
+import copy
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ExpiringLRUCache:
+    """
+    Thread-safe in-process LRU cache whose entries also carry their own expiry time.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value, expires_at):
+        if self.maxsize <= 0 or expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def pop_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def remove_where(self, predicate):
+        """
+        Remove every entry whose value matches `predicate`.
+        :return: Number of removed entries.
+        """
+        with self._lock:
+            keys = [key for key, (_, value) in self._entries.items() if predicate(value)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class TokenCache:
+    """
+    Verified ID tokens and their users, cached per process.
+
+    Tokens are keyed by their SHA-256 hash, so raw tokens are never kept in memory, and
+    expire at the token's `exp` claim (minus a small clock-skew margin). Users are cached by
+    Firebase UID for FIREBASE_USER_CACHE_TTL seconds. Disabling a user purges both.
+    """
+
+    EXPIRY_MARGIN = 5  # seconds
+
+    tokens = ExpiringLRUCache(settings.FIREBASE_TOKEN_CACHE_SIZE)
+    users = ExpiringLRUCache(settings.FIREBASE_TOKEN_CACHE_SIZE)
+
+    @staticmethod
+    def token_key(id_token):
+        return hashlib.sha256(id_token.encode()).hexdigest()
+
+    @staticmethod
+    def get_claims(id_token):
+        return TokenCache.tokens.get(TokenCache.token_key(id_token))
+
+    @staticmethod
+    def set_claims(id_token, claims):
+        expires_at = claims.get("exp", 0) - TokenCache.EXPIRY_MARGIN
+        TokenCache.tokens.set(TokenCache.token_key(id_token), claims, expires_at)
+
+    @staticmethod
+    def get_user(firebase_uid):
+        """
+        Return a copy of the cached user, so that changes made while handling one request
+        do not leak into others.
+        """
+        user = TokenCache.users.get(firebase_uid)
+        return copy.copy(user) if user is not None else None
+
+    @staticmethod
+    def set_user(user):
+        """
+        Cache a copy of the user, so that request-scoped state set on the instance the caller
+        keeps (e.g. memoised permissions) is not shared with later requests.
+        """
+        TokenCache.users.set(
+            user.firebase_uid, copy.copy(user), time.time() + settings.FIREBASE_USER_CACHE_TTL
+        )
+
+    @staticmethod
+    def purge_user(firebase_uid):
+        """
+        Forget the cached user and every cached token issued to them, in this process.
+        """
+        TokenCache.purge_users([firebase_uid])
+
+    @staticmethod
+    def purge_users(firebase_uids):
+        """
+        Forget the cached users and every cached token issued to them, with one pass over the
+        cached tokens however many users are purged.
+        """
+        firebase_uids = set(firebase_uids)
+        if not firebase_uids:
+            return
+        TokenCache.users.pop_many(firebase_uids)
+        purged = TokenCache.tokens.remove_where(lambda claims: claims.get("uid") in firebase_uids)
+        logger.info("Purged %s cached tokens of %s Firebase users.", purged, len(firebase_uids))
+
+    @staticmethod
+    def clear():
+        TokenCache.tokens.clear()
+        TokenCache.users.clear()
+
+    @staticmethod
+    def stats():
+        """
+        :return: Dict with the size, hits and misses of the `tokens` and `users` caches.
+        """
+        return {"tokens": TokenCache.tokens.stats(), "users": TokenCache.users.stats()}
@@ -0,0 +1,147 @@
+import json
+import logging
+import threading
+
+import firebase_admin
+import jwt
+from cryptography import x509
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from firebase_admin import auth, credentials
+
+logger = logging.getLogger(__name__)
+
+_firebase_lock = threading.Lock()
+
+
+def get_firebase_app():
+    """
+    Return the default Firebase app, initialising it from FIREBASE_ADMIN_SDK_CREDENTIALS_PATH
+    on first use instead of at import time.
+    """
+    try:
+        return firebase_admin.get_app()
+    except ValueError:
+        pass
+
+    with _firebase_lock:
+        try:
+            return firebase_admin.get_app()
+        except ValueError:
+            cred_path = settings.FIREBASE_ADMIN_SDK_CREDENTIALS_PATH
+            if not cred_path:
+                raise ImproperlyConfigured("Firebase Admin SDK credentials not configured.")
+            logger.info("Initialising the Firebase Admin SDK.")
+            return firebase_admin.initialize_app(credentials.Certificate(cred_path))
+
+
+class BaseTokenVerifier:
+    """
+    Verifies an ID token and returns its claims. The claims always include `uid`.
+    Implementations raise an exception for any token that does not verify.
+    """
+
+    def verify(self, id_token):
+        raise NotImplementedError
+
+
+class FirebaseTokenVerifier(BaseTokenVerifier):
+    """
+    Verifies Firebase ID tokens with the Firebase Admin SDK.
+    """
+
+    def verify(self, id_token):
+        return auth.verify_id_token(id_token, app=get_firebase_app())
+
+
+class LocalTokenVerifier(BaseTokenVerifier):
+    """
+    Verifies RS256 tokens offline against a configured public-key set.
+
+    The key set is a JSON file at LOCAL_TOKEN_KEYS_PATH holding either a JWKS document
+    ({"keys": [...]}) or a mapping of key ID to PEM public key or certificate. Tokens must
+    name their key in the `kid` header, carry a `sub`, and match LOCAL_TOKEN_ISSUER and
+    LOCAL_TOKEN_AUDIENCE when those are set, just like Firebase ID tokens.
+    """
+
+    ALGORITHMS = ["RS256"]
+
+    def __init__(self, keys=None, issuer=None, audience=None):
+        """
+        :param keys: Mapping of key ID to public key. Loaded from LOCAL_TOKEN_KEYS_PATH when None.
+        """
+        self.keys = keys if keys is not None else self.load_keys(settings.LOCAL_TOKEN_KEYS_PATH)
+        self.issuer = issuer if issuer is not None else settings.LOCAL_TOKEN_ISSUER
+        self.audience = audience if audience is not None else settings.LOCAL_TOKEN_AUDIENCE
+
+    @staticmethod
+    def load_keys(path):
+        if not path:
+            raise ImproperlyConfigured("LOCAL_TOKEN_KEYS_PATH is required for the local token verifier.")
+        with open(path) as f:
+            data = json.load(f)
+
+        if "keys" in data:
+            return {key.key_id: key.key for key in jwt.PyJWKSet.from_dict(data).keys}
+        return {kid: LocalTokenVerifier.load_pem(pem) for kid, pem in data.items()}
+
+    @staticmethod
+    def load_pem(pem):
+        """
+        Load an RSA public key from a PEM public key or X.509 certificate.
+        """
+        data = pem.encode()
+        if b"BEGIN CERTIFICATE" in data:
+            return x509.load_pem_x509_certificate(data).public_key()
+        return load_pem_public_key(data)
+
+    def verify(self, id_token):
+        kid = jwt.get_unverified_header(id_token).get("kid")
+        key = self.keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown key ID: {kid}")
+
+        options = {"require": ["exp", "iat", "sub"], "verify_aud": bool(self.audience)}
+        claims = jwt.decode(
+            id_token,
+            key,
+            algorithms=self.ALGORITHMS,
+            audience=self.audience or None,
+            issuer=self.issuer or None,
+            options=options,
+        )
+        if not claims["sub"]:
+            raise jwt.InvalidTokenError("Token has an empty subject.")
+        claims["uid"] = claims["sub"]
+        return claims
+
+
+VERIFIERS = {
+    "firebase": FirebaseTokenVerifier,
+    "local": LocalTokenVerifier,
+}
+
+_verifier = None
+
+
+def get_verifier():
+    """
+    Return the verifier selected by AUTH_TOKEN_VERIFIER ("firebase" or "local"), created once.
+    """
+    global _verifier
+    if _verifier is None:
+        try:
+            verifier_class = VERIFIERS[settings.AUTH_TOKEN_VERIFIER]
+        except KeyError:
+            raise ImproperlyConfigured(f"Unknown AUTH_TOKEN_VERIFIER: {settings.AUTH_TOKEN_VERIFIER}")
+        _verifier = verifier_class()
+    return _verifier
+
+
+def set_verifier(verifier=None):
+    """
+    Install a verifier instance, e.g. in tests or benchmarks. None restores the configured one.
+    """
+    global _verifier
+    _verifier = verifier
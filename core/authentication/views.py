@@ -7,6 +7,7 @@ from django.db import transaction
 
 from core.users.models import User
 from core.users.serializers import UserSerializer
+from .verifiers import get_firebase_app, get_verifier
 
 
 class SignupView(APIView):
@@ -25,6 +26,7 @@ class SignupView(APIView):
                     email=email,
                     password=password,
                     display_name=f"{first_name} {last_name}",
+                    app=get_firebase_app(),
                 )
 
                 # Create Django user
@@ -40,7 +42,7 @@ class SignupView(APIView):
         except Exception as e:
             # Rollback Firebase user creation if any failure occurs
             if 'firebase_user' in locals():
-                auth.delete_user(firebase_user.uid)
+                auth.delete_user(firebase_user.uid, app=get_firebase_app())
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 class LoginView(APIView):
@@ -56,7 +58,7 @@ class LoginView(APIView):
 
         try:
             # Verify the Firebase ID token
-            decoded_token = auth.verify_id_token(id_token)
+            decoded_token = get_verifier().verify(id_token)
             firebase_uid = decoded_token.get("uid")
 
             if not firebase_uid:
@@ -10,3 +10,7 @@ SECTION_TITLE_MAX_LEN = 255
 SECTION_DESCRIPTION_MAX_LEN = 1000
 
 VIDEO_TRANSCRIPT_MAX_LEN = 50000
+
+ORDERING_MODE_DENSE = "dense"
+ORDERING_MODE_SPARSE = "sparse"
+ORDERING_RANK_GAP = 1 << 16
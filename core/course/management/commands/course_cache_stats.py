@@ -0,0 +1,20 @@
+# In core/course/management/commands/course_cache_stats.py
+from django.core.management.base import BaseCommand
+
+from core.course.services import CourseCacheService
+
+
+class Command(BaseCommand):
+    help = "Show the hit and miss counters of the course structure cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after printing them.")
+
+    def handle(self, *args, **options):
+        stats = CourseCacheService.stats()
+        self.stdout.write(
+            f"Hits: {stats['hits']}  Misses: {stats['misses']}  Hit ratio: {stats['hit_ratio']:.1%}"
+        )
+        if options["reset"]:
+            CourseCacheService.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
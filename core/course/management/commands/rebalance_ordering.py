@@ -0,0 +1,25 @@
+# In core/course/management/commands/rebalance_ordering.py
+from django.core.management.base import BaseCommand
+
+from core.course.models import Course, Module, Section, SectionItemInfo
+from core.course.services import OrderingService
+
+
+class Command(BaseCommand):
+    help = "Respread sparse ordering ranks and renumber sequences of modules, sections and section items"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--course", help="Only rebalance the course with this ID.")
+
+    def handle(self, *args, **kwargs):
+        courses = Course.objects.all()
+        if kwargs["course"]:
+            courses = courses.filter(pk=kwargs["course"])
+
+        for course_id in courses.values_list("pk", flat=True):
+            OrderingService.rebalance(Module, course_id)
+            for module_id in Module.objects.filter(course_id=course_id).values_list("pk", flat=True):
+                OrderingService.rebalance(Section, module_id)
+            for section_id in Section.objects.filter(module__course_id=course_id).values_list("pk", flat=True):
+                OrderingService.rebalance(SectionItemInfo, section_id)
+            self.stdout.write(self.style.SUCCESS(f"Course '{course_id}' rebalanced."))
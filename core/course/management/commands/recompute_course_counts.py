@@ -0,0 +1,16 @@
+# In core/course/management/commands/recompute_course_counts.py
+from django.core.management.base import BaseCommand
+
+from core.course.services import CourseCounterService
+
+
+class Command(BaseCommand):
+    help = "Recompute the module, section, item and question counters of courses from scratch"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--course", action="append", help="Only recompute the course with this ID. Repeatable.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Counter rows written per query.")
+
+    def handle(self, *args, **kwargs):
+        count = CourseCounterService.recompute(kwargs["course"], batch_size=kwargs["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Recomputed counters of {count} courses."))
@@ -1,6 +1,6 @@
 from django.db import models
 
-from . import Section
+from . import Section, SectionItemInfo, SectionItemType
 from ..constants import ARTICLE_MAX_LENGTH
 import uuid
 
@@ -13,4 +13,9 @@ class Article(TimestampMixin, models.Model):
     section = models.ForeignKey(Section, on_delete=models.SET_NULL, null=True, blank=True)
     sequence = models.PositiveIntegerField(null=True, blank=True)
 
+    def save(self, *args, **kwargs):
+        SectionItemInfo.section_item_save_logic(self, super(), SectionItemType.ARTICLE, args, kwargs)
+
+    def delete(self, *args, **kwargs):
+        SectionItemInfo.section_item_delete_logic(self, super(), args, kwargs)
 
@@ -4,6 +4,7 @@ import uuid
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.db.models import Q
+from django.db.models.lookups import StartsWith
 from typing import TYPE_CHECKING
 
 from ...utils.models import TimestampMixin
@@ -20,6 +21,82 @@ class VisibilityChoices(models.TextChoices):
     UNLISTED = "unlisted", "Unlisted"  # Hidden courses that require a direct link
 
 
+class CourseQuerySet(models.QuerySet):
+    """
+    Visibility rules of courses as SQL predicates, so list endpoints only fetch (and paginate)
+    the courses a user may see.
+
+    Staff see every course. Anyone else sees public courses, private courses of their
+    institutions and of the institutions below them, and every course they are related to: as instructor, as personnel of one of
+    its instances, or enrolled in one of its instances. Unlisted courses are left out of
+    listings unless the user is related to them, but can be opened by anyone with the link.
+    """
+
+    def _related_to(self, user):
+        from ...users.models import UserCourseInstance, UserInstitution
+        from .course_instance import CoursePersonnel
+
+        course = models.OuterRef("pk")
+        # Members of an institution also belong to every institution below it. An empty path
+        # (not built yet) would prefix every path, so such memberships only match exactly.
+        member_of_ancestor = UserInstitution.objects.filter(user=user).filter(
+            Q(institution=models.OuterRef("institution"))
+            | Q(
+                Q(institution__path__gt=""),
+                StartsWith(models.OuterRef("institution__path"), models.F("institution__path")),
+            )
+        )
+        return (
+            models.Exists(CourseInstructor.objects.filter(course=course, instructor=user))
+            | models.Exists(CoursePersonnel.objects.filter(course__course=course, personnel=user))
+            | models.Exists(UserCourseInstance.objects.filter(course__course=course, user=user))
+            | (
+                Q(visibility=VisibilityChoices.PRIVATE)
+                & models.Exists(Course.institutions.through.objects.filter(
+                    models.Exists(member_of_ancestor), course=course
+                ))
+            )
+        )
+
+    def _filter_for(self, user, visibilities):
+        if user.is_active and (user.is_staff or user.is_superuser):
+            return self
+        predicate = Q(visibility__in=visibilities)
+        if user.is_authenticated:
+            predicate |= self._related_to(user)
+        return self.filter(predicate)
+
+    def visible_to(self, user: "User"):
+        """
+        Courses the user may see in listings.
+        """
+        return self._filter_for(user, [VisibilityChoices.PUBLIC])
+
+    def accessible_by(self, user: "User"):
+        """
+        Courses the user may open, which also includes unlisted courses.
+        """
+        return self._filter_for(user, [VisibilityChoices.PUBLIC, VisibilityChoices.UNLISTED])
+
+    def in_institution_subtree(self, institution):
+        """
+        Courses of an institution and of every institution below it.
+        """
+        in_subtree = Q(institution__path__startswith=institution.path) if institution.path else Q(institution=institution)
+        return self.filter(models.Exists(Course.institutions.through.objects.filter(
+            in_subtree, course=models.OuterRef("pk")
+        )))
+
+    def is_accessible_by(self, user: "User", course_id):
+        """
+        Whether the user may open the course with this ID, in one query.
+        """
+        try:
+            return self.accessible_by(user).filter(pk=course_id).exists()
+        except (ValidationError, ValueError):
+            return False
+
+
 class Course(TimestampMixin,models.Model):
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -38,6 +115,13 @@ class Course(TimestampMixin,models.Model):
         "users.User", through="CourseInstructor", related_name="instructor_courses"
     )
 
+    objects = CourseQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of course lists
+            models.Index(fields=["created_at", "id"], name="course_created_id_idx"),
+        ]
 
     def __str__(self):
         return self.name
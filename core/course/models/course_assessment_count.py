@@ -5,9 +5,29 @@ from django.db import models
 
 
 class CourseAssessmentCount( models.Model):
+    """
+    Denormalized content counters of a course, kept up to date incrementally by
+    CourseCounterService and rebuilt by the `recompute_course_counts` command.
+
+    Attributes:
+        course (OneToOneField): The course the counters belong to.
+        count (int): Number of assessments in the course.
+        module_count (int): Number of modules in the course.
+        section_count (int): Number of sections in the course.
+        video_count (int): Number of videos in the course.
+        article_count (int): Number of articles in the course.
+        question_count (int): Number of questions in the assessments of the course.
+        updated_at (datetime): When any of the counters last changed.
+    """
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     course = models.OneToOneField(
         "course.Course", on_delete=models.CASCADE, related_name="assessment_count"
     )
-    count = models.PositiveIntegerField(default=0)
+    count = models.PositiveIntegerField(default=0, help_text="Number of assessments in the course.")
+    module_count = models.PositiveIntegerField(default=0)
+    section_count = models.PositiveIntegerField(default=0)
+    video_count = models.PositiveIntegerField(default=0)
+    article_count = models.PositiveIntegerField(default=0)
+    question_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
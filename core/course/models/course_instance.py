@@ -36,6 +36,10 @@ class CourseInstance(TimestampMixin, models.Model):
                 name="unique_course_instance",
             )
         ]
+        indexes = [
+            # Keyset pagination of course instance lists
+            models.Index(fields=["created_at", "id"], name="course_instance_created_id_idx"),
+        ]
 
     def __str__(self):
         """
@@ -17,6 +17,7 @@ class Module(TimestampMixin, models.Model):
         title (str): The title of the module.
         description (str): A detailed description of the module.
         sequence (int): The order of the module within the course.
+        rank (int): Sparse ordering key of the module within the course.
     """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="modules")
@@ -25,6 +26,11 @@ class Module(TimestampMixin, models.Model):
     sequence = models.PositiveIntegerField(
         help_text="The order of this module in the course."
     )
+    rank = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Sparse ordering key used when COURSE_ORDERING_MODE is 'sparse'.",
+    )
 
     class Meta:
         constraints = [
@@ -33,6 +39,7 @@ class Module(TimestampMixin, models.Model):
                 fields=["course", "sequence"], name="module_sequence_in_course"
             )
         ]
+        indexes = [models.Index(fields=["course", "rank"], name="module_rank_in_course")]
         ordering = ["sequence"]  # Default ordering by sequence
 
     def __str__(self):
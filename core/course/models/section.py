@@ -17,6 +17,7 @@ class Section(TimestampMixin, models.Model):
         title (str): The title of the section.
         description (str): A detailed description of the section.
         sequence (int): The order of the section within the module.
+        rank (int): Sparse ordering key of the section within the module.
     """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     module = models.ForeignKey(
@@ -27,6 +28,11 @@ class Section(TimestampMixin, models.Model):
     sequence = models.PositiveIntegerField(
         help_text="The order of this section within the module."
     )
+    rank = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Sparse ordering key used when COURSE_ORDERING_MODE is 'sparse'.",
+    )
 
     class Meta:
         constraints = [
@@ -35,6 +41,7 @@ class Section(TimestampMixin, models.Model):
                 fields=["module", "sequence"], name="section_sequence_in_module"
             )
         ]
+        indexes = [models.Index(fields=["module", "rank"], name="section_rank_in_module")]
         ordering = ["sequence"]  # Default ordering by sequence
 
     def __str__(self):
@@ -1,7 +1,6 @@
 import uuid
 
 from django.db import models, transaction
-from django.db.models.aggregates import Max
 
 from . import Section
 
@@ -28,6 +27,11 @@ class SectionItemInfo(models.Model):
         help_text="The type of this section item (video, article, etc.).",
     )
     item_id = models.UUIDField()
+    rank = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Sparse ordering key used when COURSE_ORDERING_MODE is 'sparse'.",
+    )
 
     class Meta:
         constraints = [
@@ -36,6 +40,7 @@ class SectionItemInfo(models.Model):
                 name="unique_section_sequence",
             )
         ]
+        indexes = [models.Index(fields=["section", "rank"], name="section_item_rank")]
 
     def __str__(self):
         return f"{self.section} - Item Sequence {self.sequence}"
@@ -51,95 +56,41 @@ class SectionItemInfo(models.Model):
         return f"{prefix}{self.item_id}"
 
     @staticmethod
-    def create_item(section, sequence, item_type, item_instance):
+    def section_item_save_logic(self, super, item_type: SectionItemType, args, kwargs):
         """
-        Creates a record in SectionItemInfo in a transaction-safe way.
+        Save a section item (Video, Article or Assessment) and keep its SectionItemInfo
+        row and the sequences of its neighbours in step, using set-based updates.
         """
+        from ..services.sequence_service import SequenceService
+
         with transaction.atomic():
-            print("Creating Section Item")
-            print("Section: ", section)
-            print("Sequence: ", sequence)
-            print("Item Type: ", item_type)
-            print("Item Instance: ", item_instance.id)
-            return SectionItemInfo.objects.create(
-                section=section,
-                sequence=sequence,
-                item_type=item_type,
-                item_id=item_instance.id,
-            )
+            previous = SectionItemInfo.objects.filter(item_id=self.pk).first()
 
-    @staticmethod
-    def section_item_save_logic(self, super, item_type: SectionItemType, args, kwargs):
-        previous = SectionItemInfo.objects.filter(item_id=self.pk).first()
-        previous_sequence = previous.sequence if previous else None
-        current_sequence = self.sequence
+            if previous is not None and previous.section_id != self.section_id:
+                # The item changed section: close its gap in the old one first
+                SequenceService.remove_item(previous)
+                previous = None
 
-        if previous is None:
-            if current_sequence is None:
-                print("Sequence is None")
-                max_sequence = SectionItemInfo.objects.filter(section=self.section).aggregate(Max('sequence'))['sequence__max']
-                self.sequence = max_sequence + 1 if max_sequence else 1
-                super.save(*args, **kwargs)
+            if self.section_id is None:
+                self.sequence = None
+            elif previous is None:
+                self.sequence = SequenceService.insert_item(self.section_id, item_type, self.pk, self.sequence)
+            elif self.sequence is None:
+                self.sequence = previous.sequence
+            elif self.sequence != previous.sequence:
+                self.sequence = SequenceService.move_item(previous, self.sequence)
 
-                print("Sequence assigned is ", self.sequence)
-                SectionItemInfo.create_item(self.section, self.sequence, item_type, self)
-        if previous_sequence == current_sequence:
             super.save(*args, **kwargs)
-            return
-        else:
-            if current_sequence is not None:
-                print("Current Sequence :", current_sequence)
-                print("Previous Sequence :", previous_sequence)
 
-                if current_sequence and not previous_sequence:
-                    items = SectionItemInfo.objects.filter(sequence__gte=current_sequence, section=self.section).order_by(
-                        "-sequence").exclude(item_id=self.pk)
-                    with transaction.atomic():
-                        SectionItemInfo.objects.filter(item_id=self.pk).delete()
-                        for item in items:
-                            item.sequence += 1
-                            item.save()
-                    super.save(*args, **kwargs)
-                    SectionItemInfo.create_item(self.section, self.sequence, item_type, self)
-                    return
-
-                if current_sequence < previous_sequence:
-                    items = SectionItemInfo.objects.filter(sequence__gte=current_sequence,
-                                                           sequence__lte=previous_sequence,
-                                                           section=self.section).order_by("-sequence").exclude(
-                        item_id=self.pk)
-                    with transaction.atomic():
-                        SectionItemInfo.objects.filter(item_id=self.pk).delete()
-                        for item in items:
-                            item.sequence += 1
-                            item.save()
-                    super.save(*args, **kwargs)
-                    SectionItemInfo.create_item(self.section, self.sequence, item_type, self)
-                else:
-                    items = SectionItemInfo.objects.filter(sequence__gte=previous_sequence,
-                                                           sequence__lte=current_sequence,
-                                                           section=self.section).order_by("sequence").exclude(
-                        item_id=self.pk)
-                    with transaction.atomic():
-                        SectionItemInfo.objects.filter(item_id=self.pk).delete()
-                        for item in items:
-                            item.sequence -= 1
-                            item.save()
-                    super.save(*args, **kwargs)
-                    SectionItemInfo.create_item(self.section, self.sequence, SectionItemType.VIDEO, self)
     @staticmethod
     def section_item_delete_logic(self, super, args, kwargs):
-        max_sequence = SectionItemInfo.objects.filter(section=self.section).aggregate(Max('sequence'))['sequence__max']
-        if self.sequence == max_sequence:
-            with transaction.atomic():
-                SectionItemInfo.objects.filter(item_id=self.pk).delete()
-                super.delete(*args, **kwargs)
-        else:
-            items = SectionItemInfo.objects.filter(sequence__gt=self.sequence, section=self.section).order_by(
-                "sequence")
-            with transaction.atomic():
-                SectionItemInfo.objects.filter(item_id=self.pk).delete()
-                for i in items:
-                    i.sequence -= 1
-                    i.save()
-                super.delete(*args, **kwargs)
+        """
+        Delete a section item and close the gap it leaves in its section.
+        """
+        from ..services.sequence_service import SequenceService
+
+        with transaction.atomic():
+            previous = SectionItemInfo.objects.filter(item_id=self.pk).first()
+            if previous is not None:
+                SequenceService.remove_item(previous)
+            return super.delete(*args, **kwargs)
@@ -3,3 +3,4 @@ from .module import ModuleListSerializer, ModuleDetailSerializer
 from .section import SectionListSerializer, SectionDetailSerializer
 from .section_items import VideoSerializer, ArticleSerializer
 from .course_instance import CourseInstanceReadSerializer, CourseInstanceWriteSerializer
+from .reorder import ReorderSerializer
@@ -1,16 +1,34 @@
+from django.db.models import Count
 from rest_framework import serializers
 
-from ..models import Course
+from ..models import Course, CourseAssessmentCount, Section, SectionItemInfo, SectionItemType
 from ...utils.helpers import truncate_text
 
 
+class CourseCountsSerializer(serializers.ModelSerializer):
+    """
+    Maintained content counters of a course.
+    """
+    modules = serializers.IntegerField(source='module_count')
+    sections = serializers.IntegerField(source='section_count')
+    videos = serializers.IntegerField(source='video_count')
+    articles = serializers.IntegerField(source='article_count')
+    assessments = serializers.IntegerField(source='count')
+    questions = serializers.IntegerField(source='question_count')
+
+    class Meta:
+        model = CourseAssessmentCount
+        fields = ['modules', 'sections', 'videos', 'articles', 'assessments', 'questions']
+
+
 class CourseListSerializer(serializers.ModelSerializer):
     description = serializers.SerializerMethodField()
     course_id = serializers.IntegerField(source='id', read_only=True)
+    counts = CourseCountsSerializer(source='assessment_count', read_only=True)
 
     class Meta:
         model = Course
-        fields = ['course_id', 'name', 'description', 'visibility', 'created_at']
+        fields = ['course_id', 'name', 'description', 'visibility', 'created_at', 'counts']
 
     def get_description(self, obj):
         return truncate_text(obj.description)
@@ -18,11 +36,41 @@ class CourseListSerializer(serializers.ModelSerializer):
 
 class CourseDetailSerializer(serializers.ModelSerializer):
     module_count = serializers.SerializerMethodField()
+    section_count = serializers.SerializerMethodField()
+    item_counts = serializers.SerializerMethodField()
     course_id = serializers.IntegerField(source='id', read_only=True)
 
     class Meta:
         model = Course
         fields = '__all__'
 
+    # The counts are read from queryset annotations (see CourseStatsService.annotate_courses)
+    # and only fall back to COUNT queries for instances loaded without them.
+
     def get_module_count(self, obj):
+        if hasattr(obj, 'module_count'):
+            return obj.module_count
         return obj.modules.count()
+
+    def get_section_count(self, obj):
+        if hasattr(obj, 'section_count'):
+            return obj.section_count
+        return Section.objects.filter(module__course=obj).count()
+
+    def get_item_counts(self, obj):
+        return item_counts(obj, SectionItemInfo.objects.filter(section__module__course=obj))
+
+
+def item_counts(obj, section_items):
+    """
+    Per-type item counts of a course or module, from its annotations when present.
+    :param section_items: SectionItemInfo queryset of the object, counted as a fallback.
+    """
+    if hasattr(obj, 'video_item_count'):
+        return {
+            SectionItemType.VIDEO.value: obj.video_item_count,
+            SectionItemType.ARTICLE.value: obj.article_item_count,
+            SectionItemType.ASSESSMENT.value: obj.assessment_item_count,
+        }
+    counts = dict(section_items.order_by().values_list('item_type').annotate(count=Count('pk')))
+    return {item_type.value: counts.get(item_type.value, 0) for item_type in SectionItemType}
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 
-from ..models import Module
+from .course import item_counts
+from .reorder import SparseSequenceMixin
+from ..models import Module, SectionItemInfo
 from ...utils.helpers import truncate_text
 
 class ModuleListSerializer(serializers.ModelSerializer):
@@ -18,17 +20,22 @@ class ModuleListSerializer(serializers.ModelSerializer):
         return truncate_text(obj.description)
 
 
-class ModuleDetailSerializer(serializers.ModelSerializer):
+class ModuleDetailSerializer(SparseSequenceMixin, serializers.ModelSerializer):
     """
     Detailed serializer for the Module model.
     """
     section_count = serializers.SerializerMethodField()
-
-
+    item_counts = serializers.SerializerMethodField()
 
     class Meta:
         model = Module
         fields = '__all__'
+        read_only_fields = ['rank']
 
     def get_section_count(self, obj):
+        if hasattr(obj, 'section_count'):
+            return obj.section_count
         return obj.sections.count()
+
+    def get_item_counts(self, obj):
+        return item_counts(obj, SectionItemInfo.objects.filter(section__module=obj))
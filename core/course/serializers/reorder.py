@@ -0,0 +1,35 @@
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator
+
+from ..constants import ORDERING_MODE_SPARSE
+
+
+class SparseSequenceMixin:
+    """
+    In sparse ordering mode a module's or section's `sequence` is the requested position, and
+    OrderingService.save stores a free sequence instead, so the unique (parent, sequence)
+    check does not apply.
+    """
+
+    def get_validators(self):
+        validators = super().get_validators()
+        if settings.COURSE_ORDERING_MODE == ORDERING_MODE_SPARSE:
+            return [validator for validator in validators if not isinstance(validator, UniqueTogetherValidator)]
+        return validators
+
+
+class ReorderSerializer(serializers.Serializer):
+    """
+    The complete new order of the children of a course, module or section.
+    """
+    order = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        help_text="IDs of all children, in their new order.",
+    )
+
+    def validate_order(self, value):
+        if len(value) != len(set(value)):
+            raise serializers.ValidationError("The new order contains duplicate IDs.")
+        return value
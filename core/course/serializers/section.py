@@ -1,6 +1,7 @@
 from dataclasses import dataclass, asdict
 from rest_framework import serializers
 
+from .reorder import SparseSequenceMixin
 from ..models import Section
 from ...utils.helpers import truncate_text
 
@@ -25,7 +26,7 @@ class SectionListSerializer(serializers.ModelSerializer):
     def get_description(self, obj):
         return truncate_text(obj.description)
 
-class SectionDetailSerializer(serializers.ModelSerializer):
+class SectionDetailSerializer(SparseSequenceMixin, serializers.ModelSerializer):
     """
     Detailed serializer for the Section model.
     """
@@ -34,6 +35,7 @@ class SectionDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Section
         fields = '__all__'
+        read_only_fields = ['rank']
 
     # def get_item_counts(self, obj):
     #     return asdict(ItemCounts(
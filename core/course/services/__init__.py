@@ -0,0 +1,7 @@
+from .cache_service import CourseCacheService
+from .counter_service import CourseCounterService
+from .ordering_service import OrderingService
+from .outline_service import OutlineService
+from .section_item_service import SectionItemService
+from .sequence_service import SequenceService
+from .stats_service import CourseStatsService
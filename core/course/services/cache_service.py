@@ -0,0 +1,179 @@
+# core/course/services/cache_service.py
+
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from ..models import Article, Course, Module, Section, SectionItemInfo, Video
+from ...assessment.models import Assessment
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class CourseCacheService:
+    """
+    Versioned cache for read-heavy course structure responses (outlines, section item lists).
+
+    Every course has a version, and cached entries are keyed by it. A change anywhere in the
+    course bumps the version once the transaction commits, which makes every cached entry of
+    that course unreachable at once; stale entries simply expire. Versions are nanosecond
+    timestamps of the last change, so they double as Last-Modified values. Works with any
+    Django cache backend. Hit and miss counters are kept in the cache so they are shared by
+    all processes using the same backend.
+    """
+
+    VERSION_KEY = "course:{course_id}:version"
+    ENTRY_KEY = "course:{course_id}:v{version}:{name}"
+    HITS_KEY = "course_cache:hits"
+    MISSES_KEY = "course_cache:misses"
+
+    # model -> lookup path from the model to its course ID
+    COURSE_PATHS = {
+        Course: "pk",
+        Module: "course_id",
+        Section: "module__course_id",
+        SectionItemInfo: "section__module__course_id",
+        Video: "section__module__course_id",
+        Article: "section__module__course_id",
+        Assessment: "section__module__course_id",
+    }
+
+    @staticmethod
+    def _normalize(course_id):
+        """
+        Use the canonical form of UUIDs so URL kwargs and model IDs share cache keys.
+        """
+        try:
+            return str(uuid.UUID(str(course_id)))
+        except ValueError:
+            return str(course_id)
+
+    @staticmethod
+    def get_version(course_id):
+        """
+        Return the current cache version of a course, initialising it if needed.
+        A version lost to eviction restarts from the current time, so it never reuses an old value.
+        """
+        key = CourseCacheService.VERSION_KEY.format(course_id=CourseCacheService._normalize(course_id))
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
+        return version
+
+    @staticmethod
+    def bump(course_id):
+        """
+        Invalidate every cached entry of a course right away.
+        """
+        key = CourseCacheService.VERSION_KEY.format(course_id=CourseCacheService._normalize(course_id))
+        cache.set(key, max(time.time_ns(), (cache.get(key) or 0) + 1), timeout=None)
+        logger.debug("Bumped cache version of course %s.", course_id)
+
+    @staticmethod
+    def invalidate(course_id):
+        """
+        Invalidate the cached entries of a course once the current transaction commits,
+        so that readers cannot cache data from before the change under the new version.
+        """
+        if course_id is not None:
+            transaction.on_commit(lambda: CourseCacheService.bump(course_id))
+
+    @staticmethod
+    def get_validators(course_id):
+        """
+        :return: (version, last_modified) of a course for conditional requests.
+        """
+        version = CourseCacheService.get_version(course_id)
+        return version, datetime.fromtimestamp(version / 1e9, tz=timezone.utc)
+
+    @staticmethod
+    def get_or_build(course_id, name, builder):
+        """
+        Return the cached value of `name` for the course, calling `builder()` on a miss.
+        :param name: Identifies the response within the course, e.g. "outline".
+        :param builder: Callable producing a picklable value. Exceptions are not cached.
+        """
+        key = CourseCacheService.ENTRY_KEY.format(
+            course_id=CourseCacheService._normalize(course_id),
+            version=CourseCacheService.get_version(course_id),
+            name=name,
+        )
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            CourseCacheService._count(CourseCacheService.HITS_KEY)
+            return value
+
+        CourseCacheService._count(CourseCacheService.MISSES_KEY)
+        value = builder()
+        cache.set(key, value, timeout=settings.COURSE_CACHE_TIMEOUT)
+        return value
+
+    @staticmethod
+    def _count(key):
+        if not cache.add(key, 1, timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                pass
+
+    @staticmethod
+    def stats():
+        """
+        :return: Dict with the number of cache `hits` and `misses` and the `hit_ratio`.
+        """
+        counters = cache.get_many([CourseCacheService.HITS_KEY, CourseCacheService.MISSES_KEY])
+        hits = counters.get(CourseCacheService.HITS_KEY, 0)
+        misses = counters.get(CourseCacheService.MISSES_KEY, 0)
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+        }
+
+    @staticmethod
+    def reset_stats():
+        cache.delete_many([CourseCacheService.HITS_KEY, CourseCacheService.MISSES_KEY])
+
+    @staticmethod
+    def course_id_of(model, pk):
+        """
+        Look up the ID of the course a row belongs to with a single query.
+        :return: The course ID, or None if the row does not exist, is not in a course or
+                 `pk` is malformed.
+        """
+        if pk is None:
+            return None
+        try:
+            return model.objects.filter(pk=pk).values_list(
+                CourseCacheService.COURSE_PATHS[model], flat=True
+            ).first()
+        except (ValidationError, ValueError):
+            return None
+
+    @staticmethod
+    def course_id_for_section(section_id):
+        return CourseCacheService.course_id_of(Section, section_id)
+
+    @staticmethod
+    def course_id_for(instance):
+        """
+        Return the ID of the course a course, module, section or section item belongs to.
+        """
+        if isinstance(instance, Course):
+            return instance.pk
+        if isinstance(instance, Module):
+            return instance.course_id
+        if isinstance(instance, Section):
+            return CourseCacheService.course_id_of(Module, instance.module_id)
+        # SectionItemInfo, Video, Article and Assessment all point at a section
+        return CourseCacheService.course_id_for_section(getattr(instance, "section_id", None))
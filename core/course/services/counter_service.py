@@ -0,0 +1,135 @@
+# core/course/services/counter_service.py
+
+import logging
+
+from django.db.models import Count, F
+from django.db.models.functions import Greatest, Now
+from django.utils import timezone
+
+from .stats_service import CourseStatsService
+from ..models import Course, CourseAssessmentCount, SectionItemInfo, SectionItemType
+from ...assessment.models import Question
+
+logger = logging.getLogger(__name__)
+
+
+class CourseCounterService:
+    """
+    Keeps the CourseAssessmentCount counters of a course in step with its content.
+
+    Counters are adjusted with atomic F() increments from the paths that add or remove
+    content: SequenceService for videos, articles and assessments entering or leaving a
+    section, and signals for modules, sections and questions. Writes that bypass those
+    paths (e.g. queryset deletes) can make counters drift; `recompute()` rebuilds them.
+    """
+
+    # item_type -> counter field
+    ITEM_COUNTERS = {
+        SectionItemType.VIDEO: "video_count",
+        SectionItemType.ARTICLE: "article_count",
+        SectionItemType.ASSESSMENT: "count",
+    }
+
+    COUNTER_FIELDS = ["count", "module_count", "section_count", "video_count", "article_count", "question_count"]
+
+    @staticmethod
+    def adjust(course_id, **deltas):
+        """
+        Add the given deltas to the counters of a course in one UPDATE, never going below zero.
+        Courses without a counter row are skipped; `recompute()` creates it.
+        """
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if course_id is None or not deltas:
+            return
+        updated = CourseAssessmentCount.objects.filter(course_id=course_id).update(
+            **{field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()},
+            updated_at=Now(),
+        )
+        if not updated:
+            logger.debug("Course %s has no counters to adjust.", course_id)
+
+    @staticmethod
+    def item_deltas(item_type, item_id, sign):
+        """
+        Counter deltas for an item entering (sign=1) or leaving (sign=-1) a course.
+        Assessments carry their questions with them.
+        """
+        deltas = {CourseCounterService.ITEM_COUNTERS[item_type]: sign}
+        if item_type == SectionItemType.ASSESSMENT:
+            deltas["question_count"] = sign * Question.objects.filter(assessment_id=item_id).count()
+        return deltas
+
+    @staticmethod
+    def section_deltas(section_id):
+        """
+        Counter deltas for a section and everything in it leaving its course.
+        """
+        deltas = {"section_count": -1}
+        item_counts = (
+            SectionItemInfo.objects.filter(section_id=section_id)
+            .order_by()
+            .values_list("item_type")
+            .annotate(count=Count("pk"))
+        )
+        for item_type, count in item_counts:
+            deltas[CourseCounterService.ITEM_COUNTERS[item_type]] = -count
+        deltas["question_count"] = -Question.objects.filter(
+            assessment_id__in=SectionItemInfo.objects.filter(
+                section_id=section_id, item_type=SectionItemType.ASSESSMENT
+            ).values("item_id")
+        ).count()
+        return deltas
+
+    @staticmethod
+    def course_id_for_assessment(assessment_id):
+        """
+        Return the course an assessment is placed in, based on its SectionItemInfo row.
+        """
+        return SectionItemInfo.objects.filter(
+            item_id=assessment_id, item_type=SectionItemType.ASSESSMENT
+        ).values_list("section__module__course_id", flat=True).first()
+
+    @staticmethod
+    def recompute(course_ids=None, batch_size=500):
+        """
+        Rebuild the counters from scratch with one aggregate query and batched upserts.
+        :param course_ids: Only recompute these courses. All courses when None.
+        :return: Number of courses recomputed.
+        """
+        courses = Course.objects.all()
+        if course_ids is not None:
+            courses = courses.filter(pk__in=course_ids)
+
+        courses = CourseStatsService.annotate_courses(courses).annotate(
+            question_count=CourseStatsService.count_subquery(
+                Question.objects.filter(
+                    assessment_id__in=SectionItemInfo.objects.filter(
+                        item_type=SectionItemType.ASSESSMENT
+                    ).values("item_id")
+                ),
+                "assessment__section__module__course_id",
+            )
+        )
+        now = timezone.now()
+        counters = [
+            CourseAssessmentCount(
+                course_id=course.pk,
+                count=course.assessment_item_count,
+                module_count=course.module_count,
+                section_count=course.section_count,
+                video_count=course.video_item_count,
+                article_count=course.article_item_count,
+                question_count=course.question_count,
+                updated_at=now,
+            )
+            for course in courses.iterator()
+        ]
+        CourseAssessmentCount.objects.bulk_create(
+            counters,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["course"],
+            update_fields=CourseCounterService.COUNTER_FIELDS + ["updated_at"],
+        )
+        logger.info("Recomputed content counters of %s courses.", len(counters))
+        return len(counters)
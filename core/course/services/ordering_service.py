@@ -0,0 +1,287 @@
+# core/course/services/ordering_service.py
+
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BigIntegerField, Case, Count, F, PositiveIntegerField, Q, Value, When
+from django.db.models.aggregates import Max
+
+from .cache_service import CourseCacheService
+from ..constants import ORDERING_MODE_SPARSE, ORDERING_RANK_GAP
+from ..models import Course, Module, Section, SectionItemInfo
+
+logger = logging.getLogger(__name__)
+
+
+class OrderingService:
+    """
+    Sparse (gap-based) ordering of modules, sections and section items.
+
+    In sparse mode each row carries a `rank` with room between neighbours, so moving a
+    row rewrites that row's rank and shifts the `sequence` of the rows between its old and
+    new position, which keeps `sequence` in rank order for API clients. When two neighbours
+    run out of room, the siblings are rebalanced: ranks are spread out again and `sequence`
+    is renumbered 1..N to match. Removals leave gaps in `sequence` until the next rebalance.
+    Rows written without a rank (e.g. in dense mode) sort last until their siblings are next
+    rebalanced.
+    """
+
+    # model -> (parent model, parent field on the model)
+    PARENTS = {
+        Module: (Course, "course_id"),
+        Section: (Module, "module_id"),
+        SectionItemInfo: (Section, "section_id"),
+    }
+
+    @staticmethod
+    def is_sparse():
+        return settings.COURSE_ORDERING_MODE == ORDERING_MODE_SPARSE
+
+    @staticmethod
+    def ordering():
+        """
+        Return the order_by() fields for listing siblings in the active ordering mode.
+        """
+        if OrderingService.is_sparse():
+            return (F("rank").asc(nulls_last=True), "sequence")
+        return ("sequence",)
+
+    @staticmethod
+    def siblings(model, parent_id):
+        _, parent_field = OrderingService.PARENTS[model]
+        return model.objects.filter(**{parent_field: parent_id})
+
+    @staticmethod
+    def invalidate_cache(model, parent_id):
+        """
+        Invalidate the cached structure of the course; queryset updates send no signals.
+        """
+        parent_model, _ = OrderingService.PARENTS[model]
+        CourseCacheService.invalidate(CourseCacheService.course_id_of(parent_model, parent_id))
+
+    @staticmethod
+    def lock_parent(model, parent_id):
+        """
+        Lock the parent row so concurrent reorders of the same siblings are serialized.
+        """
+        parent_model, _ = OrderingService.PARENTS[model]
+        list(parent_model.objects.select_for_update().filter(pk=parent_id).values_list("pk"))
+
+    @staticmethod
+    def shift(model, parent_id, lower, upper, delta, offset, pinned=None):
+        """
+        Shift the sequence of every sibling in [lower, upper] by `delta` in two UPDATEs.
+        Rows are parked above `offset` first so the unique sequence constraint holds after each statement.
+        :param offset: A value greater than the current maximum sequence of the siblings.
+        :param pinned: Optional (pk, sequence) of a row in the range that should be
+                       placed at an explicit sequence instead of being shifted.
+        """
+        siblings = OrderingService.siblings(model, parent_id)
+        parked = siblings.filter(sequence__gte=lower, sequence__lte=upper).update(
+            sequence=F("sequence") + offset
+        )
+        if not parked:
+            return
+
+        shifted = F("sequence") - offset + delta
+        if pinned is not None:
+            pk, sequence = pinned
+            shifted = Case(When(pk=pk, then=Value(sequence)), default=shifted)
+        siblings.filter(sequence__gte=offset).update(sequence=shifted)
+
+    @staticmethod
+    def renumber(model, parent_id, ordered_pks):
+        """
+        Write sequence 1..N and evenly spaced ranks following `ordered_pks`, in two UPDATEs.
+        :param ordered_pks: Primary keys of *all* siblings in their new order.
+        """
+        siblings = OrderingService.siblings(model, parent_id)
+        offset = (siblings.aggregate(Max("sequence"))["sequence__max"] or 0) + 1
+
+        # Park every sibling above the current maximum so the new values cannot collide.
+        siblings.update(sequence=F("sequence") + offset)
+        siblings.update(
+            sequence=Case(
+                *[When(pk=pk, then=Value(i)) for i, pk in enumerate(ordered_pks, start=1)],
+                output_field=PositiveIntegerField(),
+            ),
+            rank=Case(
+                *[When(pk=pk, then=Value(i * ORDERING_RANK_GAP)) for i, pk in enumerate(ordered_pks, start=1)],
+                output_field=BigIntegerField(),
+            ),
+        )
+
+        if model is SectionItemInfo:
+            from .sequence_service import SequenceService
+
+            SequenceService.sync_item_sequences(parent_id)
+        OrderingService.invalidate_cache(model, parent_id)
+
+    @staticmethod
+    def rebalance(model, parent_id):
+        """
+        Spread ranks out evenly and renumber `sequence` to match the current order.
+        """
+        with transaction.atomic():
+            OrderingService.lock_parent(model, parent_id)
+            ordered_pks = list(
+                OrderingService.siblings(model, parent_id)
+                .order_by(F("rank").asc(nulls_last=True), "sequence")
+                .values_list("pk", flat=True)
+            )
+            OrderingService.renumber(model, parent_id, ordered_pks)
+        logger.info("Rebalanced %s %s under %s.", len(ordered_pks), model.__name__, parent_id)
+
+    @staticmethod
+    def ensure_ranked(model, parent_id):
+        """
+        Rebalance the siblings if any of them has no rank yet (e.g. rows written in dense mode).
+        :return: Dict with the sibling `count`, `max_sequence` and `max_rank`.
+        """
+        stats = OrderingService.siblings(model, parent_id).aggregate(
+            count=Count("pk"),
+            unranked=Count("pk", filter=Q(rank__isnull=True)),
+            max_sequence=Max("sequence"),
+            max_rank=Max("rank"),
+        )
+        if stats["unranked"]:
+            OrderingService.rebalance(model, parent_id)
+            stats["max_sequence"] = stats["count"]
+            stats["max_rank"] = stats["count"] * ORDERING_RANK_GAP
+        stats["max_sequence"] = stats["max_sequence"] or 0
+        stats["max_rank"] = stats["max_rank"] or 0
+        return stats
+
+    @staticmethod
+    def rank_between(before, after):
+        """
+        Return a rank strictly between two neighbouring ranks, or None when there is no room.
+        """
+        lower = before if before is not None else 0
+        if after is None:
+            return lower + ORDERING_RANK_GAP
+        if after - lower < 2:
+            return None
+        return (lower + after) // 2
+
+    @staticmethod
+    def place(obj, position):
+        """
+        Move a module, section or section item to a 1-based position among its siblings.
+        Only the moved row's rank and the sequences between its old and new position are
+        written, unless its neighbours have run out of room.
+        """
+        model = type(obj)
+        _, parent_field = OrderingService.PARENTS[model]
+        parent_id = getattr(obj, parent_field)
+
+        with transaction.atomic():
+            OrderingService.lock_parent(model, parent_id)
+            stats = OrderingService.ensure_ranked(model, parent_id)
+
+            others = OrderingService.siblings(model, parent_id).exclude(pk=obj.pk).order_by("rank", "sequence")
+            position = min(max(position, 1), stats["count"])
+            neighbours = list(others.values_list("rank", "sequence")[max(position - 2, 0):position])
+            before = neighbours[0] if position > 1 else (None, None)
+            after = neighbours[-1] if position < stats["count"] else (None, None)
+
+            rank = OrderingService.rank_between(before[0], after[0])
+            if rank is None:
+                ordered_pks = list(others.values_list("pk", flat=True))
+                ordered_pks.insert(position - 1, obj.pk)
+                OrderingService.renumber(model, parent_id, ordered_pks)
+                obj.rank = position * ORDERING_RANK_GAP
+                obj.sequence = position
+                logger.info("No rank gap left under %s, rebalanced %s siblings.", parent_id, len(ordered_pks))
+                return obj
+
+            # `sequence` follows the rank order, so the rows between the old and new position
+            # are exactly those with a sequence between the moved row's and its new neighbour's.
+            current = model.objects.values_list("sequence", flat=True).get(pk=obj.pk)
+            sequence = current
+            if after[1] is not None and after[1] < current:
+                sequence, lower, upper, delta = after[1], after[1], current, 1
+            elif before[1] is not None and before[1] > current:
+                sequence, lower, upper, delta = before[1], current, before[1], -1
+            if sequence != current:
+                OrderingService.shift(
+                    model, parent_id, lower, upper, delta, stats["max_sequence"] + 1, pinned=(obj.pk, sequence)
+                )
+                if model is SectionItemInfo:
+                    from .sequence_service import SequenceService
+
+                    SequenceService.sync_item_sequences(parent_id, lower=lower, upper=upper)
+
+            model.objects.filter(pk=obj.pk).update(rank=rank)
+            obj.rank = rank
+            obj.sequence = sequence
+            OrderingService.invalidate_cache(model, parent_id)
+        return obj
+
+    @staticmethod
+    def save(serializer):
+        """
+        Save a module or section through its serializer. In sparse mode the submitted
+        `sequence` is a requested position, as for section items: a new row is appended after
+        its last sibling and an existing row keeps its sequence (or is appended to its new
+        parent), then the row is moved there with `place`.
+        :return: The saved instance.
+        """
+        if not OrderingService.is_sparse():
+            return serializer.save()
+
+        model = serializer.Meta.model
+        _, parent_field = OrderingService.PARENTS[model]
+        instance = serializer.instance
+        parent = serializer.validated_data.get(parent_field.removesuffix("_id"))
+        parent_id = parent.pk if parent is not None else getattr(instance, parent_field)
+        position = serializer.validated_data.get("sequence")
+
+        with transaction.atomic():
+            OrderingService.lock_parent(model, parent_id)
+            reparented = instance is not None and parent_id != getattr(instance, parent_field)
+            if instance is not None and not reparented and position is None:
+                return serializer.save()
+
+            stats = OrderingService.ensure_ranked(model, parent_id)
+            if instance is None or reparented:
+                obj = serializer.save(
+                    sequence=stats["max_sequence"] + 1, rank=stats["max_rank"] + ORDERING_RANK_GAP
+                )
+            else:
+                # Other moves may have shifted the row since it was read
+                sequence = model.objects.values_list("sequence", flat=True).get(pk=instance.pk)
+                obj = serializer.save(sequence=sequence)
+            if position is not None:
+                OrderingService.place(obj, position)
+            return obj
+
+    @staticmethod
+    def reorder(model, parent_id, ordered_ids, key="pk"):
+        """
+        Apply a complete new order to the children of a course, module or section.
+        :param ordered_ids: Values of `key` for every sibling, in the new order.
+        :param key: Field identifying siblings in `ordered_ids` (e.g. "item_id" for section items).
+        :raises ValueError: If `ordered_ids` is not a permutation of the current siblings.
+        :return: Primary keys of the siblings in their new order.
+        """
+        with transaction.atomic():
+            OrderingService.lock_parent(model, parent_id)
+            pk_by_key = dict(OrderingService.siblings(model, parent_id).values_list(key, "pk"))
+
+            if len(ordered_ids) != len(set(ordered_ids)):
+                raise ValueError("The new order contains duplicate IDs.")
+            if set(ordered_ids) != set(pk_by_key):
+                missing = set(pk_by_key) - set(ordered_ids)
+                unknown = set(ordered_ids) - set(pk_by_key)
+                raise ValueError(
+                    f"The new order must list every {model.__name__} exactly once "
+                    f"(missing: {sorted(map(str, missing))}, unknown: {sorted(map(str, unknown))})."
+                )
+
+            ordered_pks = [pk_by_key[value] for value in ordered_ids]
+            OrderingService.renumber(model, parent_id, ordered_pks)
+
+        logger.info("Reordered %s %s under %s.", len(ordered_pks), model.__name__, parent_id)
+        return ordered_pks
@@ -0,0 +1,85 @@
+# core/course/services/section_item_service.py
+
+import logging
+from collections import defaultdict
+
+from ..models import Article, SectionItemType, Video
+from ..serializers import ArticleSerializer, VideoSerializer
+from ...assessment.models import Assessment
+from ...assessment.serializers import AssessmentSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class SectionItemService:
+    """
+    Hydrates SectionItemInfo rows into their concrete Video, Article and Assessment objects.
+    """
+
+    # item_type -> (model, serializer)
+    ITEM_TYPES = {
+        SectionItemType.VIDEO: (Video, VideoSerializer),
+        SectionItemType.ARTICLE: (Article, ArticleSerializer),
+        SectionItemType.ASSESSMENT: (Assessment, AssessmentSerializer),
+    }
+
+    @staticmethod
+    def get_item_queryset(item_type):
+        """
+        Return the base queryset used to load items of the given type.
+        :param item_type: A SectionItemType value.
+        :return: QuerySet for the concrete item model.
+        """
+        model, _ = SectionItemService.ITEM_TYPES[item_type]
+        if item_type == SectionItemType.VIDEO:
+            return model.objects.select_related("source")
+        return model.objects.all()
+
+    @staticmethod
+    def resolve_items(section_items):
+        """
+        Resolve section items to their concrete objects with one query per item type.
+        :param section_items: Iterable of SectionItemInfo, already in the desired order.
+        :return: List of (section_item, instance) pairs in the same order. `instance` is None
+                 when the item type is unsupported or the referenced object no longer exists.
+        """
+        section_items = list(section_items)
+
+        ids_by_type = defaultdict(list)
+        for item in section_items:
+            if item.item_type in SectionItemService.ITEM_TYPES:
+                ids_by_type[item.item_type].append(item.item_id)
+
+        instances_by_type = {
+            item_type: SectionItemService.get_item_queryset(item_type).in_bulk(item_ids)
+            for item_type, item_ids in ids_by_type.items()
+        }
+
+        resolved = []
+        for item in section_items:
+            instance = instances_by_type.get(item.item_type, {}).get(item.item_id)
+            if instance is None and item.item_type in SectionItemService.ITEM_TYPES:
+                logger.error("%s with ID %s not found.", item.item_type, item.item_id)
+            resolved.append((item, instance))
+        return resolved
+
+    @staticmethod
+    def serialize_items(section_items):
+        """
+        Serialize section items in order, tagging each payload with its `item_type`.
+        :param section_items: Iterable of SectionItemInfo, already in the desired order.
+        :return: List of serialized item dictionaries.
+        """
+        data = []
+        for item, instance in SectionItemService.resolve_items(section_items):
+            if item.item_type not in SectionItemService.ITEM_TYPES:
+                data.append({"detail": f"Unsupported item_type: {item.item_type}"})
+                continue
+            if instance is None:
+                continue
+
+            _, serializer_class = SectionItemService.ITEM_TYPES[item.item_type]
+            serializer_data = serializer_class(instance).data
+            serializer_data["item_type"] = item.item_type
+            data.append(serializer_data)
+        return data
@@ -0,0 +1,210 @@
+# core/course/services/sequence_service.py
+
+import logging
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.aggregates import Max
+
+from .cache_service import CourseCacheService
+from .counter_service import CourseCounterService
+from .ordering_service import OrderingService
+from ..constants import ORDERING_RANK_GAP
+from ..models import Article, Section, SectionItemInfo, SectionItemType, Video
+from ...assessment.models import Assessment
+
+logger = logging.getLogger(__name__)
+
+
+class SequenceService:
+    """
+    Set-based resequencing of SectionItemInfo rows within a section.
+
+    Every operation runs inside one transaction and issues a constant number of
+    statements regardless of section size. Rows that have to shift are first parked
+    above the current maximum sequence and then moved to their final position, so
+    the `unique_section_sequence` constraint holds after every single statement.
+
+    In sparse ordering mode (see OrderingService) moves rewrite the moved row's rank and
+    shift the rows in between, and removals leave a gap in `sequence` until the next rebalance.
+
+    Inserts and removals also adjust the content counters of the course (see CourseCounterService).
+    """
+
+    ITEM_MODELS = {
+        SectionItemType.VIDEO: Video,
+        SectionItemType.ARTICLE: Article,
+        SectionItemType.ASSESSMENT: Assessment,
+    }
+
+    @staticmethod
+    def _lock_section(section_id):
+        """
+        Lock the section row so concurrent edits of the same section are serialized.
+        Returns the current maximum item sequence of the section (0 when empty).
+        """
+        list(Section.objects.select_for_update().filter(pk=section_id).values_list("pk"))
+        max_sequence = SectionItemInfo.objects.filter(section_id=section_id).aggregate(
+            Max("sequence")
+        )["sequence__max"]
+        return max_sequence or 0
+
+    @staticmethod
+    def _section_changed(section_id, **deltas):
+        """
+        Invalidate the cached structure of the section's course and adjust its counters.
+        """
+        course_id = CourseCacheService.course_id_for_section(section_id)
+        CourseCacheService.invalidate(course_id)
+        CourseCounterService.adjust(course_id, **deltas)
+
+    @staticmethod
+    def _shift(section_id, lower, upper, delta, offset, pinned=None):
+        """
+        Shift the sequence of every item in [lower, upper] by `delta` in two UPDATEs.
+        See OrderingService.shift.
+        """
+        OrderingService.shift(SectionItemInfo, section_id, lower, upper, delta, offset, pinned=pinned)
+
+    @staticmethod
+    def sync_item_sequences(section_id, lower=None, upper=None):
+        """
+        Copy SectionItemInfo.sequence onto the denormalized `sequence` of the
+        Video, Article and Assessment rows of a section, with one UPDATE per item type.
+        Optionally limited to items whose sequence lies in [lower, upper].
+        """
+        items = SectionItemInfo.objects.filter(section_id=section_id)
+        if lower is not None:
+            items = items.filter(sequence__gte=lower)
+        if upper is not None:
+            items = items.filter(sequence__lte=upper)
+
+        for item_type, model in SequenceService.ITEM_MODELS.items():
+            model.objects.filter(
+                id__in=items.filter(item_type=item_type).values("item_id")
+            ).update(
+                sequence=Subquery(
+                    SectionItemInfo.objects.filter(
+                        section_id=section_id, item_id=OuterRef("pk")
+                    ).values("sequence")[:1]
+                )
+            )
+
+    @staticmethod
+    def insert_item(section_id, item_type, item_id, sequence=None):
+        """
+        Insert an item into a section, shifting the items at or after `sequence` down by one.
+        :param sequence: Requested position. Appended to the end when None or past the end.
+        :return: The sequence assigned to the item.
+        """
+        if OrderingService.is_sparse():
+            return SequenceService._insert_item_sparse(section_id, item_type, item_id, sequence)
+
+        with transaction.atomic():
+            max_sequence = SequenceService._lock_section(section_id)
+            if sequence is None or sequence > max_sequence:
+                sequence = max_sequence + 1
+            sequence = max(sequence, 1)
+
+            if sequence <= max_sequence:
+                SequenceService._shift(section_id, sequence, max_sequence, 1, max_sequence + 1)
+
+            SectionItemInfo.objects.bulk_create([
+                SectionItemInfo(
+                    section_id=section_id,
+                    sequence=sequence,
+                    item_type=item_type,
+                    item_id=item_id,
+                )
+            ])
+            if sequence <= max_sequence:
+                SequenceService.sync_item_sequences(section_id, lower=sequence + 1)
+            SequenceService._section_changed(
+                section_id, **CourseCounterService.item_deltas(item_type, item_id, 1)
+            )
+
+        logger.debug("Inserted %s %s into section %s at %s.", item_type, item_id, section_id, sequence)
+        return sequence
+
+    @staticmethod
+    def _insert_item_sparse(section_id, item_type, item_id, position=None):
+        """
+        Append the item after the last sequence and give it a rank at the requested position.
+        """
+        with transaction.atomic():
+            OrderingService.lock_parent(SectionItemInfo, section_id)
+            stats = OrderingService.ensure_ranked(SectionItemInfo, section_id)
+            section_item = SectionItemInfo(
+                section_id=section_id,
+                sequence=stats["max_sequence"] + 1,
+                rank=stats["max_rank"] + ORDERING_RANK_GAP,
+                item_type=item_type,
+                item_id=item_id,
+            )
+            SectionItemInfo.objects.bulk_create([section_item])
+            if position is not None and position <= stats["count"]:
+                OrderingService.place(section_item, position)
+            SequenceService._section_changed(
+                section_id, **CourseCounterService.item_deltas(item_type, item_id, 1)
+            )
+
+        logger.debug("Inserted %s %s into section %s with rank %s.", item_type, item_id, section_id, section_item.rank)
+        return section_item.sequence
+
+    @staticmethod
+    def move_item(section_item, sequence):
+        """
+        Move an item to a new position within its section, shifting the items in between.
+        :param section_item: The SectionItemInfo row being moved.
+        :param sequence: Requested position, clamped to the bounds of the section.
+        :return: The sequence assigned to the item.
+        """
+        if OrderingService.is_sparse():
+            OrderingService.place(section_item, sequence)
+            return section_item.sequence
+
+        section_id = section_item.section_id
+        with transaction.atomic():
+            max_sequence = SequenceService._lock_section(section_id)
+            current = SectionItemInfo.objects.values_list("sequence", flat=True).get(pk=section_item.pk)
+            sequence = min(max(sequence, 1), max_sequence)
+            if sequence == current:
+                return sequence
+
+            lower, upper = min(sequence, current), max(sequence, current)
+            delta = 1 if sequence < current else -1
+            SequenceService._shift(
+                section_id, lower, upper, delta, max_sequence + 1, pinned=(section_item.pk, sequence)
+            )
+            SequenceService.sync_item_sequences(section_id, lower=lower, upper=upper)
+            SequenceService._section_changed(section_id)
+
+        section_item.sequence = sequence
+        logger.debug("Moved item %s in section %s from %s to %s.", section_item.item_id, section_id, current, sequence)
+        return sequence
+
+    @staticmethod
+    def remove_item(section_item):
+        """
+        Remove an item from its section and close the gap it leaves behind.
+        :param section_item: The SectionItemInfo row being removed.
+        """
+        section_id = section_item.section_id
+        deltas = CourseCounterService.item_deltas(section_item.item_type, section_item.item_id, -1)
+        if OrderingService.is_sparse():
+            SectionItemInfo.objects.filter(pk=section_item.pk).delete()
+            SequenceService._section_changed(section_id, **deltas)
+            logger.debug("Removed item %s from section %s.", section_item.item_id, section_id)
+            return
+
+        with transaction.atomic():
+            max_sequence = SequenceService._lock_section(section_id)
+            sequence = SectionItemInfo.objects.values_list("sequence", flat=True).get(pk=section_item.pk)
+            SectionItemInfo.objects.filter(pk=section_item.pk).delete()
+
+            if sequence < max_sequence:
+                SequenceService._shift(section_id, sequence + 1, max_sequence, -1, max_sequence + 1)
+                SequenceService.sync_item_sequences(section_id, lower=sequence)
+            SequenceService._section_changed(section_id, **deltas)
+
+        logger.debug("Removed item %s from section %s.", section_item.item_id, section_id)
@@ -0,0 +1,102 @@
+# core/course/services/stats_service.py
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .ordering_service import OrderingService
+from ..models import Module, Section, SectionItemInfo, SectionItemType
+
+
+class CourseStatsService:
+    """
+    Module, section and item counts computed in SQL as queryset annotations.
+
+    Each count is a correlated subquery rather than a JOIN + GROUP BY, so several counts
+    can be annotated on the same queryset without the joins multiplying each other.
+    """
+
+    # item_type -> name of the annotated count
+    ITEM_COUNT_FIELDS = {
+        SectionItemType.VIDEO: "video_item_count",
+        SectionItemType.ARTICLE: "article_item_count",
+        SectionItemType.ASSESSMENT: "assessment_item_count",
+    }
+
+    @staticmethod
+    def count_subquery(queryset, outer_field):
+        """
+        Return an expression counting the rows of `queryset` whose `outer_field` is the outer row.
+        """
+        counts = (
+            queryset.filter(**{outer_field: OuterRef("pk")})
+            .order_by()
+            .values(outer_field)
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+    @staticmethod
+    def _item_counts(outer_field):
+        return {
+            name: CourseStatsService.count_subquery(SectionItemInfo.objects.filter(item_type=item_type), outer_field)
+            for item_type, name in CourseStatsService.ITEM_COUNT_FIELDS.items()
+        }
+
+    @staticmethod
+    def annotate_courses(queryset):
+        """
+        Annotate courses with `module_count`, `section_count` and per-type item counts.
+        """
+        return queryset.annotate(
+            module_count=CourseStatsService.count_subquery(Module.objects.all(), "course_id"),
+            section_count=CourseStatsService.count_subquery(Section.objects.all(), "module__course_id"),
+            **CourseStatsService._item_counts("section__module__course_id"),
+        )
+
+    @staticmethod
+    def annotate_modules(queryset):
+        """
+        Annotate modules with `section_count` and per-type item counts.
+        """
+        return queryset.annotate(
+            section_count=CourseStatsService.count_subquery(Section.objects.all(), "module_id"),
+            **CourseStatsService._item_counts("section__module_id"),
+        )
+
+    @staticmethod
+    def item_counts(obj):
+        """
+        Return the per-type item counts annotated on a course or module as a dict.
+        """
+        return {
+            item_type.value: getattr(obj, name)
+            for item_type, name in CourseStatsService.ITEM_COUNT_FIELDS.items()
+        }
+
+    @staticmethod
+    def course_stats(course):
+        """
+        Roll up the counts of a course and of each of its modules, in two queries.
+        :param course: A course annotated by `annotate_courses()`.
+        """
+        modules = CourseStatsService.annotate_modules(
+            Module.objects.filter(course_id=course.pk).only("id", "title", "sequence", "rank")
+        ).order_by(*OrderingService.ordering())
+
+        return {
+            "course_id": course.pk,
+            "module_count": course.module_count,
+            "section_count": course.section_count,
+            "item_counts": CourseStatsService.item_counts(course),
+            "modules": [
+                {
+                    "id": module.id,
+                    "title": module.title,
+                    "sequence": module.sequence,
+                    "section_count": module.section_count,
+                    "item_counts": CourseStatsService.item_counts(module),
+                }
+                for module in modules
+            ],
+        }
@@ -1 +1,3 @@
-from .section_item_info_signal import *
\ No newline at end of file
+from .section_item_info_signal import *
+from .cache_signal import *
+from .counter_signal import *
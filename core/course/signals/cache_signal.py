@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.assessment.models import Assessment
+from core.course.models import Article, Course, Module, Section, SectionItemInfo, Video
+from core.course.services.cache_service import CourseCacheService
+
+CACHED_MODELS = (Course, Module, Section, SectionItemInfo, Video, Article, Assessment)
+# SectionItemInfo rows are deleted by SequenceService, which invalidates explicitly. A
+# post_delete receiver would stop Django from fast-deleting them on section cascades.
+DELETE_CACHED_MODELS = (Course, Module, Section, Video, Article, Assessment)
+
+
+def invalidate_course_cache(sender, instance, **kwargs):
+    """
+    Invalidate the cached outline and item lists of the course the saved or deleted row belongs to.
+    Bulk resequencing does not send signals and invalidates explicitly instead.
+    """
+    CourseCacheService.invalidate(CourseCacheService.course_id_for(instance))
+
+
+for model in CACHED_MODELS:
+    post_save.connect(invalidate_course_cache, sender=model, dispatch_uid=f"course_cache_save_{model.__name__}")
+for model in DELETE_CACHED_MODELS:
+    post_delete.connect(invalidate_course_cache, sender=model, dispatch_uid=f"course_cache_delete_{model.__name__}")
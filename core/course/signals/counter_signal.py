@@ -0,0 +1,61 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from core.assessment.models import Question
+from core.course.models import Course, CourseAssessmentCount, Module, Section
+from core.course.services.cache_service import CourseCacheService
+from core.course.services.counter_service import CourseCounterService
+
+# Videos, articles and assessments are counted by SequenceService as they enter or leave a section.
+
+
+@receiver(post_save, sender=Course)
+def create_course_counters(sender, instance, created, **kwargs):
+    if created:
+        CourseAssessmentCount.objects.get_or_create(course=instance)
+
+
+@receiver(post_save, sender=Module)
+def count_module_on_create(sender, instance, created, **kwargs):
+    if created:
+        CourseCounterService.adjust(instance.course_id, module_count=1)
+
+
+@receiver(post_delete, sender=Module)
+def count_module_on_delete(sender, instance, **kwargs):
+    CourseCounterService.adjust(instance.course_id, module_count=-1)
+
+
+@receiver(post_save, sender=Section)
+def count_section_on_create(sender, instance, created, **kwargs):
+    if created:
+        CourseCounterService.adjust(CourseCacheService.course_id_of(Module, instance.module_id), section_count=1)
+
+
+@receiver(pre_delete, sender=Section)
+def count_section_on_delete(sender, instance, **kwargs):
+    """
+    Deleting a section takes its items out of the course without going through
+    SequenceService, so everything it contains is subtracted here, before the cascade.
+    """
+    CourseCounterService.adjust(
+        CourseCacheService.course_id_of(Module, instance.module_id),
+        **CourseCounterService.section_deltas(instance.pk),
+    )
+
+
+@receiver(post_save, sender=Question)
+def count_question_on_create(sender, instance, created, **kwargs):
+    if created:
+        CourseCounterService.adjust(
+            CourseCounterService.course_id_for_assessment(instance.assessment_id), question_count=1
+        )
+
+
+@receiver(post_delete, sender=Question)
+def count_question_on_delete(sender, instance, **kwargs):
+    # Questions deleted along with their assessment were already subtracted when the
+    # assessment left its section, and no longer resolve to a course here.
+    CourseCounterService.adjust(
+        CourseCounterService.course_id_for_assessment(instance.assessment_id), question_count=-1
+    )
@@ -70,29 +70,28 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 from core.assessment.models import Assessment
-from core.course.models import SectionItemInfo, Video, SectionItemType
+from core.course.models import SectionItemInfo, Video, Article, SectionItemType
+
+logger = logging.getLogger(__name__)
+
+ITEM_MODELS = {
+    SectionItemType.VIDEO: Video,
+    SectionItemType.ARTICLE: Article,
+    SectionItemType.ASSESSMENT: Assessment,
+}
 
 
 @receiver(post_save, sender=SectionItemInfo)
 def handle_sequence_update(sender, instance: SectionItemInfo, created, **kwargs):
     """
-    After saving SectionItemInfo, update the sequence of all items in the same section.
+    After saving a SectionItemInfo row directly, copy its sequence onto the item it points to.
+    Resequencing through SequenceService syncs items in bulk and does not go through here.
     """
-    print("THISSSSSSS SIGNAL IS CALLLEDDDDDDD")
-    if instance.item_type == SectionItemType.VIDEO:
-        video = Video.objects.filter(id=instance.item_id).first()
-        if video and video.sequence != instance.sequence:
-            video.sequence = instance.sequence
-            video.save()
-        else:
-            logging.error("Video with ID %s not found.", instance.item_id)
-            return
-    if instance.item_type == SectionItemType.ASSESSMENT:
-        assessment = Assessment.objects.filter(id=instance.item_id).first()
-        if assessment and assessment.sequence != instance.sequence:
-            assessment.sequence = instance.sequence
-            assessment.save()
-        else:
-            logging.error("Assessment with ID %s not found.", instance.item_id)
-            return
-
+    model = ITEM_MODELS.get(instance.item_type)
+    if model is None:
+        logger.error("Unsupported item_type %s for item %s.", instance.item_type, instance.item_id)
+        return
+    # A queryset update does not call the item's save(), so this cannot recurse.
+    model.objects.filter(id=instance.item_id).exclude(sequence=instance.sequence).update(
+        sequence=instance.sequence
+    )
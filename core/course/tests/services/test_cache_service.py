@@ -0,0 +1,78 @@
+# tests/services/test_cache_service.py
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.course.models import Article, Course, Module, Section
+from core.course.services import CourseCacheService, OrderingService
+
+
+class TestCourseCacheService(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.course = Course.objects.create(name="Test Course", description="Test Description")
+        self.module = Module.objects.create(course=self.course, title="Module", description="Module", sequence=1)
+        self.section = Section.objects.create(module=self.module, title="Section", description="Section", sequence=1)
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return {"build": self.builds}
+
+    def cached(self):
+        return CourseCacheService.get_or_build(self.course.pk, "outline", self.build)
+
+    def test_hits_until_the_version_is_bumped(self):
+        self.assertEqual(self.cached(), {"build": 1})
+        self.assertEqual(self.cached(), {"build": 1})
+
+        CourseCacheService.bump(self.course.pk)
+        self.assertEqual(self.cached(), {"build": 2})
+        self.assertEqual(CourseCacheService.stats(), {"hits": 1, "misses": 2, "hit_ratio": 1 / 3})
+
+        CourseCacheService.reset_stats()
+        self.assertEqual(CourseCacheService.stats()["hits"], 0)
+
+    def test_builder_errors_are_not_cached(self):
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            CourseCacheService.get_or_build(self.course.pk, "outline", fail)
+        self.assertEqual(self.cached(), {"build": 1})
+
+    def test_saves_invalidate_on_commit(self):
+        self.cached()
+        for change in (
+            lambda: Module.objects.create(course=self.course, title="Module 2", description="Module", sequence=2),
+            lambda: Section.objects.filter(pk=self.section.pk).first().save(),
+            lambda: Article(content="Article", section=self.section).save(),
+            lambda: Article.objects.get(section=self.section).delete(),
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            builds = self.builds
+            self.cached()
+            self.assertEqual(self.builds, builds + 1)
+
+    def test_reorder_invalidates(self):
+        Module.objects.create(course=self.course, title="Module 2", description="Module", sequence=2)
+        self.cached()
+        with self.captureOnCommitCallbacks(execute=True):
+            OrderingService.reorder(Module, self.course.pk, list(
+                Module.objects.filter(course=self.course).order_by("-sequence").values_list("pk", flat=True)
+            ))
+        self.cached()
+        self.assertEqual(self.builds, 2)
+
+    def test_other_courses_stay_cached(self):
+        other = Course.objects.create(name="Other", description="Other")
+        self.cached()
+        with self.captureOnCommitCallbacks(execute=True):
+            Module.objects.create(course=other, title="Module", description="Module", sequence=1)
+        self.cached()
+        self.assertEqual(self.builds, 1)
+
+    def test_keys_do_not_depend_on_id_formatting(self):
+        CourseCacheService.get_or_build(str(self.course.pk).upper(), "outline", self.build)
+        self.cached()
+        self.assertEqual(self.builds, 1)
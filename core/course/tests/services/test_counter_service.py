@@ -0,0 +1,77 @@
+# tests/services/test_counter_service.py
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.assessment.models import Assessment, Question
+from core.course.models import Article, Course, CourseAssessmentCount, Module, Section, Source, Video
+from core.course.services import CourseCounterService
+
+
+class TestCourseCounterService(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(name="Test Course", description="Test Description")
+        self.module = Module.objects.create(course=self.course, title="Module", description="Module", sequence=1)
+        self.section = Section.objects.create(module=self.module, title="Section", description="Section", sequence=1)
+        self.article = Article(content="Article", section=self.section)
+        self.article.save()
+        source = Source.objects.create(url="https://example.com/video")
+        Video(source=source, start_time=0, end_time=60, section=self.section).save()
+        self.assessment = Assessment(title="Quiz", question_visibility_limit=5, time_limit=600, section=self.section)
+        self.assessment.save()
+        for i in range(3):
+            Question.objects.create(assessment=self.assessment, text=f"Q{i}", type="MCQ", marks=1)
+
+    def counters(self):
+        counters = CourseAssessmentCount.objects.get(course=self.course)
+        return {field: getattr(counters, field) for field in CourseCounterService.COUNTER_FIELDS}
+
+    def expected(self, **overrides):
+        counts = {
+            "count": 1, "module_count": 1, "section_count": 1,
+            "video_count": 1, "article_count": 1, "question_count": 3,
+        }
+        counts.update(overrides)
+        return counts
+
+    def test_counters_follow_creates(self):
+        self.assertEqual(self.counters(), self.expected())
+
+    def test_counters_follow_deletes(self):
+        self.article.delete()
+        self.assertEqual(self.counters(), self.expected(article_count=0))
+
+        Question.objects.filter(assessment=self.assessment).first().delete()
+        self.assertEqual(self.counters(), self.expected(article_count=0, question_count=2))
+
+        self.assessment.delete()
+        self.assertEqual(self.counters(), self.expected(article_count=0, count=0, question_count=0))
+
+    def test_items_moving_between_courses(self):
+        other = Course.objects.create(name="Other", description="Other")
+        module = Module.objects.create(course=other, title="Module", description="Module", sequence=1)
+        section = Section.objects.create(module=module, title="Section", description="Section", sequence=1)
+
+        self.assessment.section = section
+        self.assessment.save()
+
+        self.assertEqual(self.counters(), self.expected(count=0, question_count=0))
+        other_counters = CourseAssessmentCount.objects.get(course=other)
+        self.assertEqual((other_counters.count, other_counters.question_count), (1, 3))
+
+    def test_section_delete_subtracts_its_content(self):
+        self.section.delete()
+        self.assertEqual(
+            self.counters(),
+            self.expected(count=0, section_count=0, video_count=0, article_count=0, question_count=0),
+        )
+
+    def test_recompute_repairs_drift(self):
+        CourseAssessmentCount.objects.filter(course=self.course).update(count=7, video_count=0, question_count=1)
+        CourseAssessmentCount.objects.filter(course=self.course).delete()
+        Course.objects.create(name="Empty", description="Empty")
+
+        call_command("recompute_course_counts", stdout=StringIO())
+        self.assertEqual(self.counters(), self.expected())
+        self.assertEqual(CourseAssessmentCount.objects.count(), 2)
@@ -0,0 +1,129 @@
+# tests/services/test_ordering_service.py
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.course.constants import ORDERING_RANK_GAP
+from core.course.models import Article, Course, Module, Section, SectionItemInfo
+from core.course.serializers import ModuleDetailSerializer
+from core.course.services import OrderingService
+
+
+@override_settings(COURSE_ORDERING_MODE="sparse")
+class TestOrderingService(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(name="Test Course", description="Test Description")
+        self.modules = [
+            Module.objects.create(course=self.course, title=f"Module {i}", description="Module", sequence=i)
+            for i in range(1, 6)
+        ]
+        self.section = Section.objects.create(
+            module=self.modules[0], title="Section", description="Section", sequence=1
+        )
+
+    def module_sequences(self):
+        return list(
+            Module.objects.filter(course=self.course)
+            .order_by(*OrderingService.ordering())
+            .values_list("sequence", flat=True)
+        )
+
+    def module_order(self):
+        return list(
+            Module.objects.filter(course=self.course)
+            .order_by(*OrderingService.ordering())
+            .values_list("pk", flat=True)
+        )
+
+    def test_unranked_siblings_are_rebalanced_first(self):
+        OrderingService.place(self.modules[4], 1)
+        ranks = list(Module.objects.filter(course=self.course).order_by("rank").values_list("rank", flat=True))
+        self.assertNotIn(None, ranks)
+        self.assertEqual(self.module_order()[0], self.modules[4].pk)
+
+    def test_move_shifts_only_the_rows_in_between(self):
+        OrderingService.rebalance(Module, self.course.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            moved = OrderingService.place(self.modules[4], 2)
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        # Park and shift the sequences in between, then write the moved row's rank
+        self.assertEqual(len(updates), 3)
+
+        ids = [m.pk for m in self.modules]
+        self.assertEqual(self.module_order(), [ids[0], ids[4], ids[1], ids[2], ids[3]])
+        self.assertEqual(self.module_sequences(), [1, 2, 3, 4, 5])
+        self.assertEqual(moved.sequence, 2)
+
+        OrderingService.place(self.modules[1], 5)
+        self.assertEqual(self.module_order(), [ids[0], ids[4], ids[2], ids[3], ids[1]])
+        self.assertEqual(self.module_sequences(), [1, 2, 3, 4, 5])
+
+    def test_unranked_rows_sort_last(self):
+        OrderingService.rebalance(Module, self.course.pk)
+        new = Module.objects.create(course=self.course, title="New", description="Module", sequence=6)
+        self.assertEqual(self.module_order()[-1], new.pk)
+
+    def test_saving_through_a_serializer_keeps_ranks(self):
+        OrderingService.rebalance(Module, self.course.pk)
+        data = {"course": str(self.course.pk), "title": "New", "description": "Module", "sequence": 9}
+        serializer = ModuleDetailSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        new = OrderingService.save(serializer)
+        self.assertEqual((new.sequence, new.rank), (6, 6 * ORDERING_RANK_GAP))
+        self.assertEqual(self.module_order()[-1], new.pk)
+
+        # `sequence` is the requested position, even when another module has that sequence
+        serializer = ModuleDetailSerializer(data={**data, "sequence": 2, "title": "Second"})
+        serializer.is_valid(raise_exception=True)
+        second = OrderingService.save(serializer)
+        self.assertEqual(self.module_order()[:3], [self.modules[0].pk, second.pk, self.modules[1].pk])
+        self.assertEqual(serializer.data["sequence"], 2)
+
+        serializer = ModuleDetailSerializer(new, data={"sequence": 1}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        OrderingService.save(serializer)
+        self.assertEqual(self.module_order()[:2], [new.pk, self.modules[0].pk])
+        # The sequences clients see follow the new order
+        self.assertEqual(serializer.data["sequence"], 1)
+        self.assertEqual(self.module_sequences(), list(range(1, 8)))
+
+    def test_rebalance_when_gap_runs_out(self):
+        OrderingService.rebalance(Module, self.course.pk)
+        # Keep inserting between the first two modules until their gap is exhausted
+        for _ in range(ORDERING_RANK_GAP.bit_length() + 1):
+            OrderingService.place(self.modules[4], 2)
+            OrderingService.place(self.modules[3], 2)
+
+        order = self.module_order()
+        self.assertEqual(order[0], self.modules[0].pk)
+        self.assertEqual(set(order), {m.pk for m in self.modules})
+        ranks = list(Module.objects.filter(course=self.course).order_by("rank").values_list("rank", flat=True))
+        self.assertEqual(len(set(ranks)), len(ranks))
+
+    def test_section_items_use_ranks(self):
+        articles = []
+        for i in range(4):
+            article = Article(content=f"Article {i}", section=self.section)
+            article.save()
+            articles.append(article)
+
+        article = articles[3]
+        article.sequence = 1
+        article.save()
+
+        order = list(
+            SectionItemInfo.objects.filter(section=self.section)
+            .order_by(*OrderingService.ordering())
+            .values_list("item_id", flat=True)
+        )
+        self.assertEqual(order, [articles[3].id, articles[0].id, articles[1].id, articles[2].id])
+
+    def test_rebalance_command_renumbers_sequences(self):
+        OrderingService.place(self.modules[4], 1)
+        call_command("rebalance_ordering", course=str(self.course.pk), stdout=StringIO())
+        sequences = dict(Module.objects.filter(course=self.course).values_list("pk", "sequence"))
+        self.assertEqual(sequences[self.modules[4].pk], 1)
+        self.assertEqual(sequences[self.modules[0].pk], 2)
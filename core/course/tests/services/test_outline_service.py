@@ -0,0 +1,48 @@
+# tests/services/test_outline_service.py
+from django.test import TestCase
+
+from core.course.models import Article, Course, Module, Section, SectionItemType
+from core.course.services import OutlineService
+
+
+class TestOutlineService(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(name="Test Course", description="Test Description")
+        for m in range(1, 4):
+            module = Module.objects.create(course=self.course, title=f"Module {m}", description="Module", sequence=m)
+            for s in range(1, 4):
+                section = Section.objects.create(module=module, title=f"Section {s}", description="Section", sequence=s)
+                for a in range(2):
+                    Article(content=f"Article {m}.{s}.{a}", section=section).save()
+
+    def load(self):
+        return OutlineService.get_course_queryset().get(pk=self.course.pk)
+
+    def test_outline_uses_a_fixed_number_of_queries(self):
+        with self.assertNumQueries(4):
+            outline = OutlineService.build_outline(self.load())
+
+        self.assertEqual(outline["course_id"], self.course.pk)
+        self.assertEqual([m["title"] for m in outline["modules"]], ["Module 1", "Module 2", "Module 3"])
+        for module in outline["modules"]:
+            self.assertEqual([s["sequence"] for s in module["sections"]], [1, 2, 3])
+            for section in module["sections"]:
+                self.assertEqual([i["sequence"] for i in section["items"]], [1, 2])
+                self.assertTrue(all(i["item_type"] == SectionItemType.ARTICLE for i in section["items"]))
+                self.assertNotIn("item", section["items"][0])
+
+    def test_outline_follows_sequence_order(self):
+        module = Module.objects.get(course=self.course, sequence=1)
+        module.sequence = 4
+        module.save()
+
+        outline = OutlineService.build_outline(self.load())
+        self.assertEqual([m["title"] for m in outline["modules"]], ["Module 2", "Module 3", "Module 1"])
+
+    def test_hydrated_outline_adds_one_query_per_item_type(self):
+        with self.assertNumQueries(5):
+            outline = OutlineService.build_outline(self.load(), hydrate=True)
+
+        item = outline["modules"][0]["sections"][0]["items"][0]
+        self.assertEqual(item["item"]["content"], "Article 1.1.0")
+        self.assertEqual(item["item"]["id"], str(item["id"]))
@@ -0,0 +1,47 @@
+# tests/services/test_section_item_service.py
+from django.test import TestCase
+
+from core.assessment.models import Assessment
+from core.course.models import Article, Course, Module, Section, SectionItemInfo, SectionItemType, Source, Video
+from core.course.services import SectionItemService
+
+
+class TestSectionItemService(TestCase):
+    def setUp(self):
+        course = Course.objects.create(name="Test Course", description="Test Description")
+        module = Module.objects.create(course=course, title="Module", description="Module", sequence=1)
+        self.section = Section.objects.create(module=module, title="Section", description="Section", sequence=1)
+
+        for i in range(3):
+            source = Source.objects.create(url=f"https://example.com/video/{i}")
+            Video(source=source, start_time=0, end_time=60, section=self.section).save()
+        for i in range(2):
+            Article(content=f"Article {i}", section=self.section).save()
+        Assessment(title="Quiz", question_visibility_limit=5, time_limit=600, section=self.section).save()
+        self.section_items = list(
+            SectionItemInfo.objects.filter(section=self.section).order_by("sequence")
+        )
+
+    def test_resolve_items_uses_one_query_per_item_type(self):
+        with self.assertNumQueries(3):
+            resolved = SectionItemService.resolve_items(self.section_items)
+            # Video sources are loaded with the videos
+            sources = [instance.source.url for item, instance in resolved if item.item_type == SectionItemType.VIDEO]
+
+        self.assertEqual(len(sources), 3)
+        self.assertEqual([item for item, _ in resolved], self.section_items)
+        for item, instance in resolved:
+            self.assertEqual(instance.id, item.item_id)
+
+    def test_serialize_items_preserves_sequence_order(self):
+        data = SectionItemService.serialize_items(self.section_items)
+        self.assertEqual(
+            [entry["item_type"] for entry in data],
+            [item.item_type for item in self.section_items],
+        )
+        self.assertEqual(data[0]["source"], "https://example.com/video/0")
+
+    def test_missing_item_is_skipped(self):
+        Article.objects.filter(id=self.section_items[3].item_id).delete()
+        data = SectionItemService.serialize_items(self.section_items)
+        self.assertEqual(len(data), len(self.section_items) - 1)
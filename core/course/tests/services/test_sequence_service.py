@@ -0,0 +1,96 @@
+# tests/services/test_sequence_service.py
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.course.models import Article, Course, Module, Section, SectionItemInfo, SectionItemType
+from core.course.services.sequence_service import SequenceService
+
+
+class TestSequenceService(TestCase):
+    def setUp(self):
+        course = Course.objects.create(name="Test Course", description="Test Description")
+        module = Module.objects.create(course=course, title="Module", description="Module", sequence=1)
+        self.section = Section.objects.create(module=module, title="Section", description="Section", sequence=1)
+        self.articles = [self.create_article(f"Article {i}") for i in range(5)]
+
+    def create_article(self, content, sequence=None):
+        article = Article(content=content, section=self.section, sequence=sequence)
+        article.save()
+        return article
+
+    def order(self):
+        return list(
+            SectionItemInfo.objects.filter(section=self.section)
+            .order_by("sequence")
+            .values_list("item_id", flat=True)
+        )
+
+    def assert_in_sync(self):
+        items = SectionItemInfo.objects.filter(section=self.section).order_by("sequence")
+        self.assertEqual([item.sequence for item in items], list(range(1, items.count() + 1)))
+        sequences = dict(Article.objects.filter(section=self.section).values_list("id", "sequence"))
+        for item in items:
+            self.assertEqual(sequences[item.item_id], item.sequence)
+
+    def test_append_assigns_next_sequence(self):
+        self.assertEqual([article.sequence for article in self.articles], [1, 2, 3, 4, 5])
+        self.assertEqual(self.order(), [article.id for article in self.articles])
+        self.assert_in_sync()
+
+    def test_insert_in_the_middle(self):
+        article = self.create_article("Inserted", sequence=2)
+        self.assertEqual(article.sequence, 2)
+        ids = [a.id for a in self.articles]
+        self.assertEqual(self.order(), ids[:1] + [article.id] + ids[1:])
+        self.assert_in_sync()
+
+    def test_move_up_and_down(self):
+        ids = [a.id for a in self.articles]
+
+        last = self.articles[4]
+        last.sequence = 1
+        last.save()
+        self.assertEqual(self.order(), [ids[4]] + ids[:4])
+        self.assert_in_sync()
+
+        last.sequence = 3
+        last.save()
+        self.assertEqual(self.order(), ids[:2] + [ids[4]] + ids[2:4])
+        self.assert_in_sync()
+
+    def test_move_is_clamped_to_section_bounds(self):
+        first = self.articles[0]
+        first.sequence = 99
+        first.save()
+        self.assertEqual(first.sequence, 5)
+        self.assert_in_sync()
+
+    def test_delete_closes_gap(self):
+        self.articles[1].delete()
+        self.assertEqual(self.order(), [a.id for a in self.articles if a != self.articles[1]])
+        self.assert_in_sync()
+
+    def test_move_to_another_section(self):
+        other = Section.objects.create(
+            module=self.section.module, title="Other", description="Other", sequence=2
+        )
+        article = self.articles[2]
+        article.section = other
+        article.sequence = None
+        article.save()
+        self.assertEqual(article.sequence, 1)
+        self.assertEqual(SectionItemInfo.objects.get(item_id=article.id).section_id, other.id)
+        self.assert_in_sync()
+
+    def test_query_count_does_not_grow_with_section_size(self):
+        def count_move_queries():
+            item = SectionItemInfo.objects.filter(section=self.section).order_by("-sequence").first()
+            with CaptureQueriesContext(connection) as ctx:
+                SequenceService.move_item(item, 1)
+            return len(ctx.captured_queries)
+
+        small = count_move_queries()
+        for i in range(50):
+            SequenceService.insert_item(self.section.id, SectionItemType.ARTICLE, Article.objects.create(content=f"Extra {i}").id)
+        self.assertEqual(count_move_queries(), small)
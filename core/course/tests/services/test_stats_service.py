@@ -0,0 +1,62 @@
+# tests/services/test_stats_service.py
+from django.test import TestCase
+
+from core.assessment.models import Assessment
+from core.course.models import Article, Course, Module, Section, Source, Video
+from core.course.serializers import CourseDetailSerializer, ModuleDetailSerializer
+from core.course.services import CourseStatsService
+
+
+class TestCourseStatsService(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(name="Test Course", description="Test Description")
+        Course.objects.create(name="Empty Course", description="Test Description")
+        for m in range(1, 3):
+            module = Module.objects.create(course=self.course, title=f"Module {m}", description="Module", sequence=m)
+            for s in range(1, m + 1):
+                section = Section.objects.create(module=module, title=f"Section {s}", description="Section", sequence=s)
+                Article(content="Article", section=section).save()
+                source = Source.objects.create(url=f"https://example.com/video/{m}/{s}")
+                Video(source=source, start_time=0, end_time=60, section=section).save()
+        Assessment(
+            title="Quiz", question_visibility_limit=5, time_limit=600, section=Section.objects.first()
+        ).save()
+
+    def test_course_annotations(self):
+        with self.assertNumQueries(1):
+            courses = {c.name: c for c in CourseStatsService.annotate_courses(Course.objects.all())}
+
+        course = courses["Test Course"]
+        self.assertEqual((course.module_count, course.section_count), (2, 3))
+        self.assertEqual(CourseStatsService.item_counts(course), {"video": 3, "article": 3, "assessment": 1})
+        self.assertEqual(courses["Empty Course"].module_count, 0)
+        self.assertEqual(courses["Empty Course"].video_item_count, 0)
+
+    def test_serializers_read_annotations(self):
+        course = CourseStatsService.annotate_courses(Course.objects.filter(pk=self.course.pk)).get()
+        # Only the institutions and instructors many-to-many fields are queried
+        with self.assertNumQueries(2):
+            data = CourseDetailSerializer(course).data
+        self.assertEqual(data["module_count"], 2)
+        self.assertEqual(data["item_counts"]["video"], 3)
+
+        modules = CourseStatsService.annotate_modules(Module.objects.filter(course=self.course).order_by("sequence"))
+        with self.assertNumQueries(1):
+            data = ModuleDetailSerializer(modules, many=True).data
+        self.assertEqual([m["section_count"] for m in data], [1, 2])
+
+    def test_serializers_fall_back_without_annotations(self):
+        data = CourseDetailSerializer(self.course).data
+        self.assertEqual((data["module_count"], data["section_count"]), (2, 3))
+        self.assertEqual(data["item_counts"], {"video": 3, "article": 3, "assessment": 1})
+
+    def test_course_stats(self):
+        course = CourseStatsService.annotate_courses(Course.objects.filter(pk=self.course.pk)).get()
+        with self.assertNumQueries(1):
+            stats = CourseStatsService.course_stats(course)
+
+        self.assertEqual(stats["section_count"], 3)
+        self.assertEqual([m["section_count"] for m in stats["modules"]], [1, 2])
+        self.assertEqual(
+            [m["item_counts"]["article"] for m in stats["modules"]], [1, 2]
+        )
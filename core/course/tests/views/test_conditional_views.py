@@ -0,0 +1,68 @@
+# tests/views/test_conditional_views.py
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from core.course.models import Course, Module, Section
+from core.course.views import CourseViewSet, ModuleViewSet, SectionViewSet
+from core.users.models import User
+
+
+class TestConditionalGet(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="reader@example.com", firebase_uid="reader-uid")
+        self.course = Course.objects.create(name="Test Course", description="Test Description")
+        self.module = Module.objects.create(course=self.course, title="Module", description="Module", sequence=1)
+        self.section = Section.objects.create(module=self.module, title="Section", description="Section", sequence=1)
+
+    def get(self, viewset, action, path="/", **kwargs):
+        headers = kwargs.pop("headers", {})
+        request = APIRequestFactory().get(path, headers=headers)
+        force_authenticate(request, user=self.user)
+        return viewset.as_view({"get": action})(request, **kwargs)
+
+    def test_outline_not_modified_with_only_the_access_check(self):
+        response = self.get(CourseViewSet, "outline", pk=self.course.pk)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response.headers["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.get(CourseViewSet, "outline", pk=self.course.pk, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers["ETag"], etag)
+
+    def test_changes_produce_a_new_etag(self):
+        etag = self.get(CourseViewSet, "retrieve", pk=self.course.pk).headers["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Module.objects.create(course=self.course, title="Module 2", description="Module", sequence=2)
+
+        response = self.get(CourseViewSet, "retrieve", pk=self.course.pk, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_if_modified_since(self):
+        last_modified = self.get(ModuleViewSet, "retrieve", pk=self.module.pk).headers["Last-Modified"]
+        response = self.get(ModuleViewSet, "retrieve", pk=self.module.pk, headers={"If-Modified-Since": last_modified})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_filtered_list_uses_course_version(self):
+        path = f"/?module_id={self.module.pk}"
+        etag = self.get(SectionViewSet, "list", path=path).headers["ETag"]
+        response = self.get(SectionViewSet, "list", path=path, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        other = self.get(SectionViewSet, "list", path=f"/?course_id={self.course.pk}", headers={"If-None-Match": etag})
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
+
+    def test_course_list_changes_with_updates(self):
+        etag = self.get(CourseViewSet, "list").headers["ETag"]
+        self.assertEqual(self.get(CourseViewSet, "list", headers={"If-None-Match": etag}).status_code, 304)
+
+        Course.objects.create(name="Another Course", description="Test Description")
+        self.assertEqual(self.get(CourseViewSet, "list", headers={"If-None-Match": etag}).status_code, 200)
+
+    def test_missing_object_is_not_found(self):
+        response = self.get(ModuleViewSet, "retrieve", pk="not-a-uuid", headers={"If-None-Match": '"x"'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,71 @@
+# tests/views/test_pagination_views.py
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from core.course.models import Course
+from core.course.views import CourseViewSet
+from core.users.models import User
+
+
+class TestKeysetPagination(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="staff@example.com", firebase_uid="staff-uid", is_staff=True)
+        for number in range(7):
+            Course.objects.create(name=f"Course {number}", description="-")
+        # Ties on created_at are broken by id
+        now = timezone.now()
+        Course.objects.filter(name__in=["Course 0", "Course 1", "Course 2"]).update(created_at=now)
+        Course.objects.exclude(name__in=["Course 0", "Course 1", "Course 2"]).update(
+            created_at=now + timedelta(seconds=1)
+        )
+        self.expected = list(Course.objects.order_by("created_at", "id").values_list("name", flat=True))
+
+    def get(self, url):
+        request = APIRequestFactory().get(url)
+        force_authenticate(request, user=self.user)
+        response = CourseViewSet.as_view({"get": "list"})(request)
+        return response
+
+    def names(self, response):
+        return [course["name"] for course in response.data["results"]]
+
+    def test_pages_forward_and_back_without_gaps(self):
+        response = self.get("/courses/?limit=3")
+        self.assertEqual(response.data["count"], 7)
+        self.assertIsNone(response.data["previous"])
+        seen = self.names(response)
+        pages = [response]
+        while response.data["next"]:
+            response = self.get(response.data["next"])
+            seen += self.names(response)
+            pages.append(response)
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(pages), 3)
+
+        back = self.get(pages[-1].data["previous"])
+        self.assertEqual(self.names(back), self.names(pages[1]))
+        first = self.get(back.data["previous"])
+        self.assertEqual(self.names(first), self.expected[:3])
+        self.assertIsNone(first.data["previous"])
+
+    def test_deep_pages_cost_the_same_and_count_is_optional(self):
+        with self.assertNumQueries(1):  # the page itself: no count, no list validators
+            first = self.get("/courses/?limit=2&count=false")
+        self.assertNotIn("count", first.data)
+        self.assertNotIn("ETag", first.headers)
+        self.assertIn("count=false", first.data["next"])
+
+        last = first
+        while last.data["next"]:
+            with self.assertNumQueries(1):
+                last = self.get(last.data["next"])
+        self.assertEqual(self.names(last), self.expected[6:])
+
+    def test_invalid_cursor(self):
+        response = self.get("/courses/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
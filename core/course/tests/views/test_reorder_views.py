@@ -0,0 +1,65 @@
+# tests/views/test_reorder_views.py
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from core.course.models import Article, Course, Module, Section, SectionItemInfo
+from core.course.views import CourseViewSet, ModuleViewSet, SectionViewSet
+from core.users.models import User
+
+
+class TestReorderViews(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="instructor@example.com", firebase_uid="instructor-uid")
+        self.course = Course.objects.create(name="Test Course", description="Test Description")
+        self.modules = [
+            Module.objects.create(course=self.course, title=f"Module {i}", description="Module", sequence=i)
+            for i in range(1, 4)
+        ]
+        self.sections = [
+            Section.objects.create(module=self.modules[0], title=f"Section {i}", description="Section", sequence=i)
+            for i in range(1, 4)
+        ]
+        self.articles = []
+        for i in range(3):
+            article = Article(content=f"Article {i}", section=self.sections[0])
+            article.save()
+            self.articles.append(article)
+
+    def post_reorder(self, viewset, pk, order):
+        request = APIRequestFactory().post("/reorder/", {"order": order}, format="json")
+        force_authenticate(request, user=self.user)
+        return viewset.as_view({"post": "reorder"})(request, pk=pk)
+
+    def test_reorder_modules(self):
+        order = [str(m.pk) for m in reversed(self.modules)]
+        response = self.post_reorder(CourseViewSet, self.course.pk, order)
+        assert response.status_code == status.HTTP_200_OK
+        assert [m["title"] for m in response.data] == ["Module 3", "Module 2", "Module 1"]
+        assert [m["sequence"] for m in response.data] == [1, 2, 3]
+
+    def test_reorder_sections(self):
+        order = [str(self.sections[i].pk) for i in (1, 2, 0)]
+        response = self.post_reorder(ModuleViewSet, self.modules[0].pk, order)
+        assert response.status_code == status.HTTP_200_OK
+        assert [str(s["id"]) for s in response.data] == order
+
+    def test_reorder_section_items(self):
+        order = [str(self.articles[i].pk) for i in (2, 0, 1)]
+        response = self.post_reorder(SectionViewSet, self.sections[0].pk, order)
+        assert response.status_code == status.HTTP_200_OK
+        assert [str(item["id"]) for item in response.data] == order
+        assert [item["sequence"] for item in response.data] == [1, 2, 3]
+        assert list(
+            SectionItemInfo.objects.filter(section=self.sections[0]).order_by("sequence").values_list("item_id", flat=True)
+        ) == [self.articles[i].pk for i in (2, 0, 1)]
+
+    def test_rejects_incomplete_order(self):
+        order = [str(self.modules[0].pk), str(self.modules[1].pk)]
+        response = self.post_reorder(CourseViewSet, self.course.pk, order)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert list(Module.objects.filter(course=self.course).values_list("sequence", flat=True)) == [1, 2, 3]
+
+    def test_rejects_duplicates(self):
+        order = [str(self.modules[0].pk)] * 3
+        response = self.post_reorder(CourseViewSet, self.course.pk, order)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,120 @@
+# tests/views/test_visibility_views.py
+from datetime import date
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from core.course.models import Article, Course, CourseInstance, CourseInstructor, Module, Section, VisibilityChoices
+from core.course.views import ArticleViewSet, CourseViewSet, ModuleViewSet
+from core.course.views.section_items import SectionItemViewSet
+from core.institution.models import Institution
+from core.users.models import User, UserCourseInstance, UserInstitution
+
+
+class TestCourseVisibility(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="reader@example.com", firebase_uid="reader-uid")
+        self.institution = Institution.objects.create(name="Example University")
+        UserInstitution.objects.create(user=self.user, institution=self.institution)
+
+        def course(name, visibility):
+            return Course.objects.create(name=name, description=name, visibility=visibility)
+
+        self.public = course("Public", VisibilityChoices.PUBLIC)
+        self.unlisted = course("Unlisted", VisibilityChoices.UNLISTED)
+        self.private_other = course("Private elsewhere", VisibilityChoices.PRIVATE)
+        self.private_mine = course("Private here", VisibilityChoices.PRIVATE)
+        self.private_mine.institutions.add(self.institution)
+        self.taught = course("Taught", VisibilityChoices.PRIVATE)
+        CourseInstructor.objects.create(course=self.taught, instructor=self.user)
+        self.enrolled = course("Enrolled", VisibilityChoices.UNLISTED)
+        instance = CourseInstance.objects.create(
+            course=self.enrolled, start_date=date(2026, 1, 1), end_date=date(2026, 6, 1)
+        )
+        UserCourseInstance.objects.create(user=self.user, course=instance)
+
+    def get(self, viewset, action, path="/", user=None, **kwargs):
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, user=user or self.user)
+        return viewset.as_view({"get": action})(request, **kwargs)
+
+    def test_queryset_predicates(self):
+        listed = set(Course.objects.visible_to(self.user).values_list("name", flat=True))
+        self.assertEqual(listed, {"Public", "Private here", "Taught", "Enrolled"})
+        self.assertIn(self.unlisted, Course.objects.accessible_by(self.user))
+        self.assertNotIn(self.private_other, Course.objects.accessible_by(self.user))
+
+        staff = User.objects.create(email="staff@example.com", firebase_uid="staff-uid", is_staff=True)
+        self.assertEqual(Course.objects.visible_to(staff).count(), 6)
+
+    def test_membership_extends_to_sub_institutions(self):
+        department = Institution.objects.create(name="Department", parent=self.institution)
+        program = Institution.objects.create(name="Program", parent=department)
+        self.private_other.institutions.add(program)
+        self.assertIn(self.private_other, Course.objects.visible_to(self.user))
+
+        # ...but not upwards: a program member does not see the university's private courses
+        member = User.objects.create(email="program@example.com", firebase_uid="program-uid")
+        UserInstitution.objects.create(user=member, institution=program)
+        listed = set(Course.objects.visible_to(member).values_list("name", flat=True))
+        self.assertEqual(listed, {"Public", "Private elsewhere"})
+
+        self.assertEqual(
+            set(Course.objects.in_institution_subtree(department).values_list("name", flat=True)),
+            {"Private elsewhere"},
+        )
+
+    def test_institutions_without_a_path_only_match_exactly(self):
+        self.private_other.institutions.add(Institution.objects.create(name="Elsewhere"))
+        # Rows written before paths were maintained, or with update()/bulk_create()
+        Institution.objects.update(path="", depth=0)
+        self.institution.refresh_from_db()
+        listed = set(Course.objects.visible_to(self.user).values_list("name", flat=True))
+        self.assertEqual(listed, {"Public", "Private here", "Taught", "Enrolled"})
+        self.assertEqual(
+            set(Course.objects.in_institution_subtree(self.institution).values_list("name", flat=True)),
+            {"Private here"},
+        )
+
+    def test_list_only_fetches_visible_courses(self):
+        response = self.get(CourseViewSet, "list")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {course["name"] for course in response.data["results"]},
+            {"Public", "Private here", "Taught", "Enrolled"},
+        )
+
+    def test_detail_endpoints_hide_inaccessible_courses(self):
+        self.assertEqual(self.get(CourseViewSet, "retrieve", pk=self.unlisted.pk).status_code, status.HTTP_200_OK)
+        for action in ("retrieve", "outline", "stats"):
+            response = self.get(CourseViewSet, action, pk=self.private_other.pk)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, action)
+
+    def test_section_items_follow_course_access(self):
+        articles = {}
+        for course in (self.public, self.private_other):
+            module = Module.objects.create(course=course, title="Module", description="-", sequence=1)
+            section = Section.objects.create(module=module, title="Section", description="-", sequence=1)
+            article = Article(content=f"{course.name} article", section=section)
+            article.save()
+            articles[course] = article
+
+        for course, expected in ((self.public, status.HTTP_200_OK), (self.private_other, status.HTTP_404_NOT_FOUND)):
+            article = articles[course]
+            request = APIRequestFactory().get(f"/?section_id={article.section_id}")
+            force_authenticate(request, user=self.user)
+            self.assertEqual(SectionItemViewSet.as_view()(request).status_code, expected, course.name)
+            self.assertEqual(self.get(ArticleViewSet, "retrieve", pk=article.pk).status_code, expected, course.name)
+
+    def test_module_list_follows_course_access(self):
+        Module.objects.create(course=self.private_other, title="Hidden", description="Hidden", sequence=1)
+        Module.objects.create(course=self.public, title="Shown", description="Shown", sequence=1)
+
+        response = self.get(ModuleViewSet, "list")
+        self.assertEqual([module["title"] for module in response.data["results"]], ["Shown"])
+
+        response = self.get(ModuleViewSet, "list", path=f"/?course_id={self.private_other.pk}")
+        self.assertEqual(response.data["results"], [])
+        self.assertNotIn("ETag", response.headers)
@@ -7,11 +7,18 @@ from ..models import Course
 from ...utils.helpers import get_user
 
 
-from rest_framework import viewsets
+from django.db.models import Count, Max
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
-from ..serializers import CourseListSerializer, CourseDetailSerializer
-from ..models import Course
+from ..serializers import CourseListSerializer, CourseDetailSerializer, ModuleListSerializer, ReorderSerializer
+from ..models import Course, Module
+from ..services import CourseCacheService, CourseStatsService, OrderingService, OutlineService
+from ...utils.conditional import ConditionalGetMixin
 from ...utils.helpers import get_user
+from ...utils.pagination import KeysetPagination
 
 
 @extend_schema_view(
@@ -54,20 +61,128 @@ from ...utils.helpers import get_user
         description="Delete an existing course.",
         responses={"204": "Course deleted successfully."},
     ),
+    stats=extend_schema(
+        tags=["Course"],
+        summary="Course Stats",
+        description="Retrieve the number of modules, sections, videos, articles and assessments "
+                    "of a course, in total and per module.",
+        responses={200: "Rolled-up counts of the course"},
+    ),
+    reorder=extend_schema(
+        tags=["Course"],
+        summary="Reorder Modules",
+        description="Set the order of all modules of a course in one request. "
+                    "`order` must list every module ID of the course exactly once.",
+        request=ReorderSerializer,
+        responses=ModuleListSerializer(many=True),
+    ),
+    outline=extend_schema(
+        tags=["Course"],
+        summary="Course Outline",
+        description="Retrieve the complete module, section and item tree of a course in one request. "
+                    "Items carry their type, ID and sequence; pass `hydrate=true` to embed the full items.",
+        parameters=[
+            OpenApiParameter(
+                name="hydrate",
+                description="Embed the serialized video, article or assessment of every item.",
+                required=False,
+                type=bool,
+            )
+        ],
+        responses={200: "Nested outline of the course"},
+    ),
 )
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = Course.objects.all()
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        if self.action == 'retrieve':
+        user = self.request.user
+        if self.action in ['retrieve', 'stats']:
             course_id = self.kwargs.get('pk')
-            return Course.objects.filter(id=course_id)
+            return CourseStatsService.annotate_courses(Course.objects.accessible_by(user).filter(id=course_id))
+        if self.action == 'outline':
+            return OutlineService.get_course_queryset().accessible_by(user)
         
-        # For list and other actions, use the existing method
-        return Course.objects.all()
+        if self.action == 'list':
+            # Counts come from the maintained counters, not from aggregating the content
+            return Course.objects.visible_to(user).select_related('assessment_count')
+
+        # For other actions, use the existing method
+        return Course.objects.accessible_by(user)
 
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]:
             return CourseDetailSerializer if self.action == "retrieve" else CourseListSerializer
-        return CourseDetailSerializer
\ No newline at end of file
+        return CourseDetailSerializer
+
+    def get_validators(self):
+        if self.action in ["retrieve", "outline", "stats"]:
+            # Checked before answering from the cache, which is shared by all users
+            if not Course.objects.is_accessible_by(self.request.user, self.kwargs["pk"]):
+                raise NotFound()
+            return CourseCacheService.get_validators(self.kwargs["pk"])
+        if self.action == "list":
+            # The validators aggregate every visible course. Only the first page, with its
+            # total count, already pays for that; cursor pages and count=false stay flat.
+            paginator = self.paginator
+            if paginator is not None and (
+                self.request.query_params.get(paginator.cursor_query_param)
+                or not paginator.include_count(self.request)
+            ):
+                return None
+            stats = self.filter_queryset(self.get_queryset()).aggregate(
+                course_modified=Max("updated_at"),
+                counts_modified=Max("assessment_count__updated_at"),
+                count=Count("pk"),
+            )
+            last_modified = max(filter(None, [stats["course_modified"], stats["counts_modified"]]), default=None)
+            return f"{stats['count']}:{stats['course_modified']}:{stats['counts_modified']}", last_modified
+        return None
+
+    @action(detail=True, methods=["get"])
+    def outline(self, request, pk=None):
+        """
+        Return the nested outline of the course, loaded with a fixed number of queries
+        and cached until the course changes.
+        """
+        return self.respond_conditionally(request, self.get_validators(), self.build_outline, pk=pk)
+
+    def build_outline(self, request, pk=None):
+        hydrate = request.query_params.get("hydrate", "").lower() in ("1", "true", "yes")
+        data = CourseCacheService.get_or_build(
+            pk,
+            "outline:hydrated" if hydrate else "outline",
+            lambda: OutlineService.build_outline(self.get_object(), hydrate=hydrate),
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        """
+        Return module, section and per-type item counts of the course and of each module.
+        """
+        return self.respond_conditionally(request, self.get_validators(), self.build_stats, pk=pk)
+
+    def build_stats(self, request, pk=None):
+        data = CourseCacheService.get_or_build(
+            pk, "stats", lambda: CourseStatsService.course_stats(self.get_object())
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"])
+    def reorder(self, request, pk=None):
+        """
+        Apply a complete new module order to the course.
+        """
+        course = self.get_object()
+        serializer = ReorderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            OrderingService.reorder(Module, course.pk, serializer.validated_data["order"])
+        except ValueError as e:
+            return Response({"order": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        modules = Module.objects.filter(course=course).order_by(*OrderingService.ordering())
+        return Response(ModuleListSerializer(modules, many=True).data, status=status.HTTP_200_OK)
@@ -1,8 +1,9 @@
 from rest_framework import viewsets
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
-from ..models import CourseInstance
+from ..models import Course, CourseInstance
 from ..serializers.course_instance import CourseInstanceReadSerializer, CourseInstanceWriteSerializer
 from ...utils.helpers import get_user
+from ...utils.pagination import KeysetPagination
 from rest_framework.permissions import IsAuthenticated
 from django.core.exceptions import PermissionDenied
 
@@ -55,6 +56,7 @@ from django.core.exceptions import PermissionDenied
     ),
 )
 class CourseInstanceViewSet(viewsets.ModelViewSet):
+    pagination_class = KeysetPagination
 
     def get_serializer_class(self):
         # TODO: Look into this when implementing update and delete methods.
@@ -64,8 +66,14 @@ class CourseInstanceViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """
-        Retrieve the list of course instances accessible by the current user.
+        Retrieve the list of course instances accessible by the current user: instances of the
+        courses they may see in listings, or open when retrieving one directly.
         """
-        return CourseInstance.objects.all()
+        courses = Course.objects.all()
+        if self.action == "list":
+            courses = courses.visible_to(self.request.user)
+        else:
+            courses = courses.accessible_by(self.request.user)
+        return CourseInstance.objects.filter(course__in=courses)
 
 
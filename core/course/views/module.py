@@ -1,7 +1,11 @@
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
-from ..serializers import ModuleListSerializer, ModuleDetailSerializer
-from ..models import Module
+from ..serializers import ModuleListSerializer, ModuleDetailSerializer, ReorderSerializer, SectionListSerializer
+from ..models import Course, Module, Section
+from ..services import CourseCacheService, CourseStatsService, OrderingService
+from ...utils.conditional import ConditionalGetMixin
 from ...utils.helpers import get_user
 
 
@@ -53,8 +57,16 @@ from ...utils.helpers import get_user
         description="Delete an existing module.",
         responses={"204": "Module deleted successfully."},
     ),
+    reorder=extend_schema(
+        tags=["Module"],
+        summary="Reorder Sections",
+        description="Set the order of all sections of a module in one request. "
+                    "`order` must list every section ID of the module exactly once.",
+        request=ReorderSerializer,
+        responses=SectionListSerializer(many=True),
+    ),
 )
-class ModuleViewSet(viewsets.ModelViewSet):
+class ModuleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing modules. Provides actions to list, retrieve, create, update, and delete modules.
     """
@@ -64,12 +76,28 @@ class ModuleViewSet(viewsets.ModelViewSet):
         Retrieve the list of modules accessible by the current user.
         Optionally filter by course_id.
         """
-        queryset = Module.objects.all()
+        queryset = Module.objects.filter(
+            course__in=Course.objects.accessible_by(self.request.user)
+        ).order_by(*OrderingService.ordering())
+        if self.action == "retrieve":
+            queryset = CourseStatsService.annotate_modules(queryset)
         course_id = self.request.query_params.get("course_id")
         if course_id is not None:
             return queryset.filter(course_id=course_id)
         return queryset
 
+    def get_validators(self):
+        if self.action == "retrieve":
+            course_id = CourseCacheService.course_id_of(Module, self.kwargs["pk"])
+        elif self.action == "list":
+            course_id = self.request.query_params.get("course_id")
+        else:
+            course_id = None
+        # Courses the user cannot open are served unconditionally, i.e. as not found or empty
+        if not course_id or not Course.objects.is_accessible_by(self.request.user, course_id):
+            return None
+        return CourseCacheService.get_validators(course_id)
+
     def get_serializer_class(self):
         """
         Return the appropriate serializer class based on the action.
@@ -77,3 +105,25 @@ class ModuleViewSet(viewsets.ModelViewSet):
         if self.action in ["list", "retrieve"]:
             return ModuleDetailSerializer if self.action == "retrieve" else ModuleListSerializer
         return ModuleDetailSerializer
+
+    def perform_create(self, serializer):
+        OrderingService.save(serializer)
+
+    def perform_update(self, serializer):
+        OrderingService.save(serializer)
+
+    @action(detail=True, methods=["post"])
+    def reorder(self, request, pk=None):
+        """
+        Apply a complete new section order to the module.
+        """
+        module = self.get_object()
+        serializer = ReorderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            OrderingService.reorder(Section, module.pk, serializer.validated_data["order"])
+        except ValueError as e:
+            return Response({"order": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        sections = Section.objects.filter(module=module).order_by(*OrderingService.ordering())
+        return Response(SectionListSerializer(sections, many=True).data, status=status.HTTP_200_OK)
@@ -1,7 +1,11 @@
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
-from ..serializers import SectionListSerializer, SectionDetailSerializer
-from ..models import Section
+from ..serializers import SectionListSerializer, SectionDetailSerializer, ReorderSerializer
+from ..models import Course, Module, Section, SectionItemInfo
+from ..services import CourseCacheService, OrderingService, SectionItemService
+from ...utils.conditional import ConditionalGetMixin
 from ...utils.helpers import get_user
 
 
@@ -62,8 +66,16 @@ from ...utils.helpers import get_user
         description="Delete an existing section.",
         responses={"204": "Section deleted successfully."},
     ),
+    reorder=extend_schema(
+        tags=["Section"],
+        summary="Reorder Section Items",
+        description="Set the order of all items of a section in one request. "
+                    "`order` must list the ID of every video, article and assessment in the section exactly once.",
+        request=ReorderSerializer,
+        responses={200: "List of Section Items"},
+    ),
 )
-class SectionViewSet(viewsets.ModelViewSet):
+class SectionViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing sections. Provides actions to list, retrieve, create, update, and delete sections.
     """
@@ -73,7 +85,9 @@ class SectionViewSet(viewsets.ModelViewSet):
         Retrieve the list of sections accessible by the current user.
         Optionally filter by `course_id` or `module_id`.
         """
-        queryset = Section.objects.all()
+        queryset = Section.objects.filter(
+            module__course__in=Course.objects.accessible_by(self.request.user)
+        ).order_by(*OrderingService.ordering())
 
         course_id = self.request.query_params.get('course_id')
         if course_id is not None:
@@ -85,6 +99,20 @@ class SectionViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def get_validators(self):
+        if self.action == "retrieve":
+            course_id = CourseCacheService.course_id_of(Section, self.kwargs["pk"])
+        elif self.action == "list":
+            course_id = self.request.query_params.get("course_id") or CourseCacheService.course_id_of(
+                Module, self.request.query_params.get("module_id")
+            )
+        else:
+            course_id = None
+        # Courses the user cannot open are served unconditionally, i.e. as not found or empty
+        if not course_id or not Course.objects.is_accessible_by(self.request.user, course_id):
+            return None
+        return CourseCacheService.get_validators(course_id)
+
     def get_serializer_class(self):
         """
         Return the appropriate serializer class based on the action.
@@ -92,3 +120,27 @@ class SectionViewSet(viewsets.ModelViewSet):
         if self.action in ['list', 'retrieve']:
             return SectionDetailSerializer if self.action == 'retrieve' else SectionListSerializer
         return SectionDetailSerializer
+
+    def perform_create(self, serializer):
+        OrderingService.save(serializer)
+
+    def perform_update(self, serializer):
+        OrderingService.save(serializer)
+
+    @action(detail=True, methods=["post"])
+    def reorder(self, request, pk=None):
+        """
+        Apply a complete new item order to the section.
+        """
+        section = self.get_object()
+        serializer = ReorderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            OrderingService.reorder(
+                SectionItemInfo, section.pk, serializer.validated_data["order"], key="item_id"
+            )
+        except ValueError as e:
+            return Response({"order": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        section_items = SectionItemInfo.objects.filter(section=section).order_by(*OrderingService.ordering())
+        return Response(SectionItemService.serialize_items(section_items), status=status.HTTP_200_OK)
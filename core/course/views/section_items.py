@@ -1,17 +1,19 @@
 from rest_framework import generics, viewsets, serializers
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiExample
 
-from ..models import Section, Video, Article, SectionItemInfo, SectionItemType
+from ..models import Course, Section, Video, Article, SectionItemInfo, SectionItemType
 
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound, MethodNotAllowed
 from ..models import SectionItemInfo
 from ..serializers import VideoSerializer, ArticleSerializer
+from ..services import CourseCacheService, OrderingService, SectionItemService
 
 from drf_spectacular.utils import extend_schema, OpenApiParameter, extend_schema_view
 
 from ...assessment.models import Assessment
 from ...assessment.serializers import AssessmentSerializer
+from ...utils.conditional import ConditionalGetMixin
 
 
 @extend_schema_view(
@@ -31,7 +33,7 @@ from ...assessment.serializers import AssessmentSerializer
         responses={200: "List of Section Items"},
     )
 )
-class SectionItemViewSet(generics.ListAPIView):
+class SectionItemViewSet(ConditionalGetMixin, generics.ListAPIView):
     """
     API endpoint to list section items based on section ID in ascending order of sequence.
     """
@@ -44,37 +46,34 @@ class SectionItemViewSet(generics.ListAPIView):
                 {"detail": "section_id query parameter is required."}, status=400
             )
 
-        # Fetch the section items
-        section_items = SectionItemInfo.objects.filter(section_id=section_id).order_by(
-            "sequence"
-        )
-
-        if not section_items.exists():
+        course_id = CourseCacheService.course_id_for_section(section_id)
+        # Checked before answering from the cache, which is shared by all users
+        if course_id is None or not Course.objects.is_accessible_by(request.user, course_id):
             raise NotFound(f"No items found for section_id={section_id}.")
 
-        # Prepare the response data
-        data = []
+        return self.respond_conditionally(
+            request,
+            CourseCacheService.get_validators(course_id),
+            lambda request: Response(
+                CourseCacheService.get_or_build(
+                    course_id, f"section:{section_id}:items", lambda: self.build_items(section_id)
+                ),
+                status=200,
+            ),
+        )
 
-        for item in section_items:
-            if item.item_type == SectionItemType.VIDEO:
-                video = Video.objects.get(id=item.item_id)
-                serializer_data = VideoSerializer(video).data
-                serializer_data["item_type"] = SectionItemType.VIDEO
-            elif item.item_type == SectionItemType.ARTICLE:
-                print(item)
-                article = Article.objects.get(id=item.item_id)
-                serializer_data = ArticleSerializer(article).data
-                serializer_data["item_type"] = SectionItemType.ARTICLE
-            elif item.item_type == SectionItemType.ASSESSMENT:
-                assessment = Assessment.objects.get(id=item.item_id)
-                serializer_data = AssessmentSerializer(assessment).data
-                serializer_data["item_type"] = SectionItemType.ASSESSMENT
-            else:
-                serializer_data = {"detail": f"Unsupported item_type: {item.item_type}"}
+    @staticmethod
+    def build_items(section_id):
+        # Fetch the section items
+        section_items = list(
+            SectionItemInfo.objects.filter(section_id=section_id).order_by(*OrderingService.ordering())
+        )
 
-            data.append(serializer_data)
+        if not section_items:
+            raise NotFound(f"No items found for section_id={section_id}.")
 
-        return Response(data, status=200)
+        # Prepare the response data, hydrating each item type with a single query
+        return SectionItemService.serialize_items(section_items)
 
 
 @extend_schema_view(
@@ -107,9 +106,19 @@ class SectionItemViewSet(generics.ListAPIView):
         responses={204: None},
     ),
 )
-class VideoViewSet(viewsets.ModelViewSet):
+class VideoViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Video.objects.all()
     serializer_class = VideoSerializer
+
+    def get_validators(self):
+        if self.action == "retrieve":
+            course_id = CourseCacheService.course_id_of(Video, self.kwargs["pk"])
+            if not course_id:
+                return None
+            if not Course.objects.is_accessible_by(self.request.user, course_id):
+                raise NotFound()
+            return CourseCacheService.get_validators(course_id)
+        return None
     #
     # def list(self, request, *args, **kwargs):
     #     return MethodNotAllowed(detail="This method is not allowed")
@@ -145,9 +154,19 @@ class VideoViewSet(viewsets.ModelViewSet):
         responses={204: None},
     ),
 )
-class ArticleViewSet(viewsets.ModelViewSet):
+class ArticleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
 
+    def get_validators(self):
+        if self.action == "retrieve":
+            course_id = CourseCacheService.course_id_of(Article, self.kwargs["pk"])
+            if not course_id:
+                return None
+            if not Course.objects.is_accessible_by(self.request.user, course_id):
+                raise NotFound()
+            return CourseCacheService.get_validators(course_id)
+        return None
+
     # def list(self, request, *args, **kwargs):
     #     return MethodNotAllowed(detail="This method is not allowed")
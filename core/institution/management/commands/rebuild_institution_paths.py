@@ -0,0 +1,12 @@
+# In core/institution/management/commands/rebuild_institution_paths.py
+from django.core.management.base import BaseCommand
+
+from core.institution.models import Institution
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized paths and depths of all institutions from their parent links"
+
+    def handle(self, *args, **kwargs):
+        count = Institution.objects.rebuild_paths()
+        self.stdout.write(self.style.SUCCESS(f"Updated the paths of {count} institutions."))
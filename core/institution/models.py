@@ -1,11 +1,74 @@
 import uuid
 
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
 
 from core.utils.models import TimestampMixin
 
 
+class InstitutionQuerySet(models.QuerySet):
+    """
+    Tree queries on the materialized `path` of institutions, each a single indexed query.
+    """
+
+    def descendants_of(self, institution, include_self=False):
+        """
+        Institutions below `institution` at any depth. Until its path is built (see
+        `rebuild_paths`), an institution has no known descendants.
+        """
+        if not institution.path:
+            return self.filter(pk=institution.pk) if include_self else self.none()
+        queryset = self.filter(path__startswith=institution.path)
+        return queryset if include_self else queryset.exclude(pk=institution.pk)
+
+    def ancestors_of(self, institution, include_self=False):
+        """
+        Institutions above `institution`, read off its path; ordered from the root down.
+        """
+        ids = Institution.ids_in_path(institution.path)
+        if not include_self:
+            ids = ids[:-1]
+        return self.filter(pk__in=ids).order_by("depth")
+
+    def rebuild_paths(self):
+        """
+        Recompute the path and depth of every institution from the parent links, e.g. for rows
+        created before paths were maintained.
+        :return: Number of institutions updated.
+        """
+        institutions = list(Institution.objects.only("id", "parent_id", "path", "depth"))
+        children = {}
+        for institution in institutions:
+            children.setdefault(institution.parent_id, []).append(institution)
+
+        changed = []
+        stack = [(institution, "", 0) for institution in children.get(None, [])]
+        while stack:
+            institution, parent_path, depth = stack.pop()
+            path = f"{parent_path}{institution.pk.hex}{Institution.PATH_SEPARATOR}"
+            if (institution.path, institution.depth) != (path, depth):
+                institution.path, institution.depth = path, depth
+                changed.append(institution)
+            stack.extend((child, path, depth + 1) for child in children.get(institution.pk, []))
+
+        Institution.objects.bulk_update(changed, ["path", "depth"], batch_size=500)
+        return len(changed)
+
+
 class Institution(TimestampMixin, models.Model):
+    """
+    Institutions form a tree through `parent` (e.g. university, department, program).
+
+    Every institution also stores its materialized path, the hex IDs of its ancestors and of
+    itself, each followed by PATH_SEPARATOR, and its depth. Both are maintained on save and
+    reparenting, so subtree and ancestor questions need no recursive walks.
+    """
+
+    PATH_SEPARATOR = "/"
+    PATH_SEGMENT_LENGTH = 33  # 32 hex digits and the separator
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=1000, unique=True)
     description = models.TextField(
@@ -19,7 +82,59 @@ class Institution(TimestampMixin, models.Model):
         related_name="children",
     )
     is_active = models.BooleanField(default=False)
+    path = models.CharField(max_length=1024, db_index=True, editable=False, default="")
+    depth = models.PositiveSmallIntegerField(editable=False, default=0)
 
+    objects = InstitutionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of institution lists
+            models.Index(fields=["created_at", "id"], name="institution_created_id_idx"),
+        ]
 
     def __str__(self):
         return self.name + (" (active)" if self.is_active else "(inactive)")
+
+    @staticmethod
+    def ids_in_path(path):
+        return [uuid.UUID(segment) for segment in path.split(Institution.PATH_SEPARATOR) if segment]
+
+    def save(self, *args, **kwargs):
+        """
+        Derive the path from the parent's current path. When the institution moves, rewrite the
+        paths of its whole subtree with one UPDATE.
+        """
+        parent_path = ""
+        if self.parent_id is not None:
+            parent_path = Institution.objects.filter(pk=self.parent_id).values_list("path", flat=True).get()
+            if self.own_path_segment() in parent_path:
+                raise ValidationError("An institution cannot be moved below itself.")
+        new_path = parent_path + self.own_path_segment()
+        new_depth = len(parent_path) // self.PATH_SEGMENT_LENGTH
+
+        with transaction.atomic():
+            old = Institution.objects.filter(pk=self.pk).values_list("path", "depth").first()
+            self.path, self.depth = new_path, new_depth
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "path", "depth"}
+            super().save(*args, **kwargs)
+
+            if old is not None and old[0] and old[0] != new_path:
+                old_path, old_depth = old
+                Institution.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(new_path), Substr("path", len(old_path) + 1)),
+                    depth=F("depth") + (new_depth - old_depth),
+                )
+
+    def own_path_segment(self):
+        return f"{self.pk.hex}{self.PATH_SEPARATOR}"
+
+    def get_descendants(self, include_self=False):
+        return Institution.objects.descendants_of(self, include_self=include_self)
+
+    def get_ancestors(self, include_self=False):
+        return Institution.objects.ancestors_of(self, include_self=include_self)
+
+    def is_descendant_of(self, other):
+        return self.pk != other.pk and bool(other.path) and self.path.startswith(other.path)
@@ -5,3 +5,13 @@ class InstitutionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Institution
         fields = '__all__'
+
+    def validate_parent(self, parent):
+        """
+        Reject moving an institution below itself or one of its descendants.
+        """
+        if parent is not None and self.instance is not None and (
+            parent.pk == self.instance.pk or parent.is_descendant_of(self.instance)
+        ):
+            raise serializers.ValidationError("An institution cannot be moved below itself.")
+        return parent
@@ -0,0 +1,21 @@
+# core/institution/signals.py
+from django.db.models import F
+from django.db.models.functions import Substr
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from core.institution.models import Institution
+
+
+@receiver(pre_delete, sender=Institution)
+def detach_subtree_on_delete(sender, instance, **kwargs):
+    """
+    Children of a deleted institution become roots (`parent` is SET_NULL), so drop the deleted
+    institution's path prefix from its whole subtree.
+    """
+    if not instance.path:
+        return
+    Institution.objects.filter(path__startswith=instance.path).exclude(pk=instance.pk).update(
+        path=Substr("path", len(instance.path) + 1),
+        depth=F("depth") - (instance.depth + 1),
+    )
@@ -0,0 +1,72 @@
+# tests/test_tree.py
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.institution.models import Institution
+from core.institution.views import InstitutionViewSet
+from core.users.models import User
+
+
+class TestInstitutionTree(TestCase):
+    def setUp(self):
+        self.university = Institution.objects.create(name="University")
+        self.faculty = Institution.objects.create(name="Faculty", parent=self.university)
+        self.department = Institution.objects.create(name="Department", parent=self.faculty)
+        self.program = Institution.objects.create(name="Program", parent=self.department)
+        self.other = Institution.objects.create(name="Other University")
+
+    def names(self, queryset):
+        return [institution.name for institution in queryset]
+
+    def test_descendants_and_ancestors_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                set(self.names(self.faculty.get_descendants())), {"Department", "Program"}
+            )
+        with self.assertNumQueries(1):
+            self.assertEqual(self.names(self.program.get_ancestors()), ["University", "Faculty", "Department"])
+        self.assertEqual(self.program.depth, 3)
+        self.assertTrue(self.program.is_descendant_of(self.university))
+
+    def test_reparenting_moves_the_subtree(self):
+        self.faculty.parent = self.other
+        self.faculty.save()
+
+        self.program.refresh_from_db()
+        self.assertEqual(self.names(self.program.get_ancestors()), ["Other University", "Faculty", "Department"])
+        self.assertEqual(self.names(self.university.get_descendants()), [])
+
+        self.other.parent = self.department
+        with self.assertRaises(ValidationError):
+            self.other.save()
+
+    def test_deleting_a_parent_detaches_its_subtree(self):
+        self.faculty.delete()
+        self.program.refresh_from_db()
+        self.assertEqual(self.names(self.program.get_ancestors()), ["Department"])
+        self.assertEqual(self.program.depth, 1)
+
+    def test_rebuild_paths(self):
+        Institution.objects.update(path="", depth=0)
+        self.university.refresh_from_db()
+        self.assertEqual(self.names(self.university.get_descendants()), [])
+        self.assertEqual(self.names(self.university.get_descendants(include_self=True)), ["University"])
+
+        self.assertEqual(Institution.objects.rebuild_paths(), 5)
+        self.assertEqual(Institution.objects.rebuild_paths(), 0)
+        self.program.refresh_from_db()
+        self.assertEqual(self.names(self.program.get_ancestors()), ["University", "Faculty", "Department"])
+
+    def test_moving_below_a_descendant_is_a_bad_request(self):
+        admin = User.objects.create(email="admin@example.com", firebase_uid="admin-uid", is_staff=True)
+        for parent in (self.program, self.faculty):
+            request = APIRequestFactory().patch("/", {"parent": str(parent.pk)}, format="json")
+            force_authenticate(request, user=admin)
+            response = InstitutionViewSet.as_view({"patch": "partial_update"})(request, pk=self.faculty.pk)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("parent", response.data)
+        self.faculty.refresh_from_db()
+        self.assertEqual(self.faculty.parent_id, self.university.pk)
+
@@ -1,9 +1,15 @@
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from .models import Institution
 from .serializers import InstitutionSerializer
+from ..users.serializers import UserImportSerializer
+from ..users.services.user_import_service import UserImportService
+from ..utils.pagination import KeysetPagination
 
 
 @extend_schema_view(
@@ -65,6 +71,29 @@ from .serializers import InstitutionSerializer
             }
         }
     ),
+    import_users=extend_schema(
+        tags=["Institution"],
+        summary="Import Users",
+        description=(
+                "Create the users of an uploaded CSV or JSON Lines file in Firebase and link them to the "
+                "institution, in batches of up to 1000.\n\n"
+                "Rows whose email already exists are skipped, so a partially failed import can be uploaded "
+                "again. Failed rows are reported with their row number and reason. Staff only."
+        ),
+        request={"multipart/form-data": UserImportSerializer},
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "created": {"type": "integer"},
+                    "skipped": {"type": "integer"},
+                    "failed": {"type": "integer"},
+                    "last_row": {"type": "integer"},
+                    "failures": {"type": "array", "items": {"type": "object"}},
+                }
+            }
+        },
+    ),
 )
 class InstitutionViewSet(viewsets.ModelViewSet):
     """
@@ -83,6 +112,7 @@ class InstitutionViewSet(viewsets.ModelViewSet):
     """
     queryset = Institution.objects.all()
     serializer_class = InstitutionSerializer
+    pagination_class = KeysetPagination
 
     def destroy(self, request, *args, **kwargs):
         # Deactivate an institution by setting `is_active` to False instead of deleting it.
@@ -92,4 +122,27 @@ class InstitutionViewSet(viewsets.ModelViewSet):
         return Response(
             {"message": f"Institution '{instance.name}' has been deactivated."},
             status=status.HTTP_200_OK,
-        )
\ No newline at end of file
+        )
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="import-users",
+        permission_classes=[IsAdminUser],
+        parser_classes=[MultiPartParser, FormParser],
+    )
+    def import_users(self, request, pk=None):
+        """
+        Import the users of an uploaded file into the institution.
+        """
+        institution = self.get_object()
+        serializer = UserImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        report = UserImportService.run(
+            UserImportService.read_rows(data["file"], data.get("format")),
+            institution=institution,
+            group_name=data["group"],
+            start_row=data["start_row"],
+        )
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
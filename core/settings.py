@@ -12,6 +12,9 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 
+from decouple import config
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -87,16 +90,63 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE selects "sqlite" (default, for local runs), "postgresql" or "mysql".
+# Connections are kept open for DB_CONN_MAX_AGE seconds and checked before reuse. On
+# PostgreSQL, DB_POOL=true uses psycopg's connection pool instead (needs psycopg[pool]);
+# persistent connections are then left to the pool.
+DB_ENGINE = config("DB_ENGINE", default="sqlite")
+DB_POOL = config("DB_POOL", default=False, cast=bool)
+
+if DB_ENGINE == "sqlite":
+    # WAL lets readers run alongside the single writer, synchronous=NORMAL is durable in WAL
+    # mode except against power loss, and writers wait up to busy_timeout ms for the lock
+    # instead of failing with "database is locked". IMMEDIATE takes that lock when a
+    # transaction starts, so it is never upgraded mid-transaction, where SQLite cannot wait.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config("DB_NAME", default=str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': config("DB_CONN_MAX_AGE", default=60, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'transaction_mode': config("DB_SQLITE_TRANSACTION_MODE", default="IMMEDIATE") or None,
+                'init_command': ";".join([
+                    "PRAGMA journal_mode=WAL",
+                    f"PRAGMA busy_timeout={config('DB_SQLITE_BUSY_TIMEOUT', default=5000, cast=int)}",
+                    f"PRAGMA synchronous={config('DB_SQLITE_SYNCHRONOUS', default='NORMAL')}",
+                    "PRAGMA temp_store=MEMORY",
+                    f"PRAGMA cache_size=-{config('DB_SQLITE_CACHE_KB', default=65536, cast=int)}",
+                    f"PRAGMA mmap_size={config('DB_SQLITE_MMAP_BYTES', default=128 * 1024 * 1024, cast=int)}",
+                ]),
+            },
+        }
     }
-}
+elif DB_ENGINE in ("postgresql", "mysql"):
+    DATABASES = {
+        'default': {
+            'ENGINE': f'django.db.backends.{DB_ENGINE}',
+            'NAME': config("DB_NAME", default="core"),
+            'USER': config("DB_USER", default=""),
+            'PASSWORD': config("DB_PASSWORD", default=""),
+            'HOST': config("DB_HOST", default="localhost"),
+            'PORT': config("DB_PORT", default=""),
+            'CONN_MAX_AGE': 0 if DB_POOL else config("DB_CONN_MAX_AGE", default=60, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if DB_ENGINE == "postgresql" and DB_POOL:
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': config("DB_POOL_MIN_SIZE", default=2, cast=int),
+            'max_size': config("DB_POOL_MAX_SIZE", default=20, cast=int),
+            'timeout': config("DB_POOL_TIMEOUT", default=10, cast=int),
+        }
+else:
+    raise ImproperlyConfigured(f"Unsupported DB_ENGINE {DB_ENGINE!r}; use sqlite, postgresql or mysql.")
 
 AUTHENTICATION_BACKENDS = (
     "django.contrib.auth.backends.ModelBackend",  # Default backend
-    "guardian.backends.ObjectPermissionBackend",  # Add guardian
+    "core.users.permissions.permission_cache.CachedObjectPermissionBackend",  # guardian, cached
 )
 
 # Password validation
@@ -158,11 +208,72 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 import os
-from decouple import config
 
 FIREBASE_ADMIN_SDK_CREDENTIALS_PATH = config("FIREBASE_ADMIN_SDK_CREDENTIALS_PATH", default="")
 print(FIREBASE_ADMIN_SDK_CREDENTIALS_PATH)
 
+# Verified Firebase ID tokens are cached per process until they expire; users looked up
+# by Firebase UID are cached for FIREBASE_USER_CACHE_TTL seconds. Set the size to 0 to disable.
+FIREBASE_TOKEN_CACHE_SIZE = config("FIREBASE_TOKEN_CACHE_SIZE", default=10000, cast=int)
+FIREBASE_USER_CACHE_TTL = config("FIREBASE_USER_CACHE_TTL", default=300, cast=int)
+
+# ID token verifier: "firebase" (Firebase Admin SDK) or "local" (offline RS256 against the
+# JWKS or {kid: PEM} key set at LOCAL_TOKEN_KEYS_PATH, e.g. for load tests without network).
+AUTH_TOKEN_VERIFIER = config("AUTH_TOKEN_VERIFIER", default="firebase")
+LOCAL_TOKEN_KEYS_PATH = config("LOCAL_TOKEN_KEYS_PATH", default="")
+LOCAL_TOKEN_ISSUER = config("LOCAL_TOKEN_ISSUER", default="")
+LOCAL_TOKEN_AUDIENCE = config("LOCAL_TOKEN_AUDIENCE", default="")
+
+# Firebase user deletes, disables and enables are queued in the IdentityOperation outbox and
+# applied by the `sync_identity_operations` worker. Failed operations are retried with
+# exponential backoff starting at IDENTITY_SYNC_RETRY_DELAY seconds and moved to the dead
+# letter state after IDENTITY_SYNC_MAX_ATTEMPTS attempts.
+IDENTITY_SYNC_BATCH_SIZE = config("IDENTITY_SYNC_BATCH_SIZE", default=1000, cast=int)
+IDENTITY_SYNC_MAX_ATTEMPTS = config("IDENTITY_SYNC_MAX_ATTEMPTS", default=8, cast=int)
+IDENTITY_SYNC_RETRY_DELAY = config("IDENTITY_SYNC_RETRY_DELAY", default=30, cast=int)
+
+# Bulk user imports create Firebase users USER_IMPORT_CHUNK_SIZE (at most 1000) at a time.
+# Passwords are sent to Firebase as PBKDF2-SHA256 hashes with USER_IMPORT_HASH_ROUNDS rounds
+# (Firebase accepts up to 120000), computed on USER_IMPORT_HASH_WORKERS threads.
+USER_IMPORT_CHUNK_SIZE = config("USER_IMPORT_CHUNK_SIZE", default=1000, cast=int)
+USER_IMPORT_HASH_ROUNDS = config("USER_IMPORT_HASH_ROUNDS", default=100000, cast=int)
+USER_IMPORT_HASH_WORKERS = config("USER_IMPORT_HASH_WORKERS", default=4, cast=int)
+
+# Ordering of modules, sections and section items: "dense" renumbers siblings on every move,
+# "sparse" only rewrites the moved row's rank and renumbers `sequence` on rebalance.
+COURSE_ORDERING_MODE = config("COURSE_ORDERING_MODE", default="dense")
+
+# Seconds after an assessment attempt's time limit during which autosaves and the submission
+# are still accepted, to allow for requests in flight when time runs out.
+ASSESSMENT_SUBMIT_GRACE = config("ASSESSMENT_SUBMIT_GRACE", default=30, cast=int)
+
+# Bulk question imports insert QUESTION_IMPORT_BATCH_SIZE questions, with their options and
+# solutions, per round of INSERTs.
+QUESTION_IMPORT_BATCH_SIZE = config("QUESTION_IMPORT_BATCH_SIZE", default=500, cast=int)
+
+# Auto-grading loads and scores the responses of GRADING_BATCH_SIZE attempts at a time.
+GRADING_BATCH_SIZE = config("GRADING_BATCH_SIZE", default=1000, cast=int)
+
+# Cache backend, e.g. "django.core.cache.backends.filebased.FileBasedCache" with a directory
+# as CACHE_LOCATION, or a memcached/redis backend with its server address.
+CACHES = {
+    "default": {
+        "BACKEND": config("CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("CACHE_LOCATION", default="core-cache"),
+    }
+}
+
+# Cache timeouts, in seconds. Every cached entry below is invalidated when its data changes,
+# so these only bound how long entries nobody reads any more stay in the cache.
+# Course outlines and section item lists, invalidated on every course change.
+COURSE_CACHE_TIMEOUT = config("COURSE_CACHE_TIMEOUT", default=60 * 60, cast=int)
+# A user's object permissions and roles, invalidated by membership and group changes.
+PERMISSION_CACHE_TIMEOUT = config("PERMISSION_CACHE_TIMEOUT", default=60 * 60, cast=int)
+# Compiled answer keys, invalidated on every question, option or solution change.
+ANSWER_KEY_CACHE_TIMEOUT = config("ANSWER_KEY_CACHE_TIMEOUT", default=60 * 60, cast=int)
+# Rendered question papers, which share the answer key's invalidation.
+PAPER_CACHE_TIMEOUT = config("PAPER_CACHE_TIMEOUT", default=60 * 60, cast=int)
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
-from .models import User, UserInstitution
+from .models import IdentityOperation, IdentityOperationStatus, User, UserInstitution
+from .services.identity_sync_service import IdentitySyncService
 
 
 class UserInstitutionInline(admin.TabularInline):
@@ -71,6 +72,22 @@ class UserAdmin(BaseUserAdmin):
             super().save_model(request, obj, form, change)
 
 
+class IdentityOperationAdmin(admin.ModelAdmin):
+    """Admin view of the Firebase operation outbox; filter by status "Dead" for the dead letters."""
+    list_display = ("operation", "firebase_uid", "status", "attempts", "next_attempt_at", "last_error", "created_at")
+    list_filter = ("status", "operation")
+    search_fields = ("firebase_uid",)
+    ordering = ("-created_at",)
+    readonly_fields = ("operation", "firebase_uid", "attempts", "last_error", "created_at", "updated_at")
+    actions = ["requeue"]
+
+    @admin.action(description="Requeue selected operations")
+    def requeue(self, request, queryset):
+        count = IdentitySyncService.requeue(queryset.exclude(status=IdentityOperationStatus.DONE))
+        self.message_user(request, f"Requeued {count} operations.")
+
+
 # Register the custom User model and the custom UserAdmin
 admin.site.register(User, UserAdmin)
 admin.site.register(UserInstitution, UserInstitutionAdmin)
+admin.site.register(IdentityOperation, IdentityOperationAdmin)
@@ -0,0 +1,48 @@
+# In core/users/management/commands/import_users.py
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.institution.models import Institution
+from core.users.services.user_import_service import UserImportService
+
+
+class Command(BaseCommand):
+    help = "Import users from a CSV or JSON Lines file into Firebase and the database in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file with a header row, or .jsonl file, with an `email` per row.")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="File format. Guessed from the extension by default.")
+        parser.add_argument("--institution", help="ID of the institution to link the users to.")
+        parser.add_argument("--group", default="student", help="Group the users are added to.")
+        parser.add_argument("--chunk-size", type=int, help="Users imported per batch, at most 1000.")
+        parser.add_argument("--start-row", type=int, default=0, help="Resume after this row number.")
+        parser.add_argument("--failures", help="Write the failed rows and their reasons to this CSV file.")
+
+    def handle(self, *args, **kwargs):
+        institution = None
+        if kwargs["institution"]:
+            try:
+                institution = Institution.objects.get(pk=kwargs["institution"])
+            except (Institution.DoesNotExist, ValueError):
+                raise CommandError(f"Institution {kwargs['institution']} does not exist.")
+
+        with open(kwargs["path"], "rb") as file:
+            report = UserImportService.run(
+                UserImportService.read_rows(file, kwargs["format"]),
+                institution=institution,
+                group_name=kwargs["group"],
+                chunk_size=kwargs["chunk_size"],
+                start_row=kwargs["start_row"],
+            )
+
+        if kwargs["failures"] and report.failures:
+            with open(kwargs["failures"], "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["row", "email", "reason"])
+                writer.writerows(report.failures)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report.created} users, skipped {report.skipped} existing, "
+            f"{len(report.failures)} failed. Last row: {report.last_row}."
+        ))
@@ -0,0 +1,36 @@
+# In core/users/management/commands/sync_identity_operations.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.users.models import IdentityOperation, IdentityOperationStatus
+from core.users.services.identity_sync_service import IdentitySyncService
+
+
+class Command(BaseCommand):
+    help = "Apply queued Firebase user deletes, disables and enables in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Operations claimed per batch. Defaults to IDENTITY_SYNC_BATCH_SIZE.")
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new operations instead of exiting once drained.")
+        parser.add_argument("--interval", type=float, default=5, help="Seconds to sleep between polls when idle.")
+        parser.add_argument("--requeue-dead", action="store_true", help="Give dead operations a fresh set of attempts first.")
+
+    def handle(self, *args, **kwargs):
+        if kwargs["requeue_dead"]:
+            count = IdentitySyncService.requeue(IdentityOperation.objects.filter(status=IdentityOperationStatus.DEAD))
+            self.stdout.write(self.style.WARNING(f"Requeued {count} dead operations."))
+
+        totals = {"done": 0, "retried": 0, "dead": 0}
+        while True:
+            result = IdentitySyncService.drain(batch_size=kwargs["batch_size"])
+            for key, value in result.items():
+                totals[key] += value
+            if not any(result.values()):
+                if not kwargs["loop"]:
+                    break
+                time.sleep(kwargs["interval"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {totals['done']}, retried: {totals['retried']}, dead: {totals['dead']}."
+        ))
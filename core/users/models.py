@@ -4,7 +4,9 @@ import uuid
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser, Group
 from django.db import models
+from django.utils import timezone
 from core.institution.models import Institution
+from core.utils.models import FieldTrackerMixin
 from core.users.services.firebase_service import FirebaseAuthService
 
 import logging
@@ -46,7 +48,6 @@ class CustomUserManager(BaseUserManager):
             student_group, _ = Group.objects.get_or_create(name="student")
             user.groups.add(student_group)
 
-        user.save()
         return user
 
     def create_user(self, email, password, **extra_fields):
@@ -63,8 +64,10 @@ class CustomUserManager(BaseUserManager):
 
 
 
-class User(AbstractUser):
+class User(FieldTrackerMixin, AbstractUser):
     """Custom User model with email as the unique identifier."""
+    tracked_fields = ("is_active", "email", "firebase_uid", "is_staff", "is_superuser")
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     username = None  # Remove the default username field
     email = models.EmailField(unique=True)
@@ -112,3 +115,48 @@ class UserCourseInstance(models.Model):
 
     def __str__(self):
         return f"{self.user.first_name} - {self.course.name}"
+
+
+class IdentityOperationType(models.TextChoices):
+    DELETE = "delete", "Delete"
+    DISABLE = "disable", "Disable"
+    ENABLE = "enable", "Enable"
+
+
+class IdentityOperationStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    DONE = "done", "Done"
+    DEAD = "dead", "Dead"
+
+
+class IdentityOperation(models.Model):
+    """
+    Outbox of Firebase user operations, written in the same transaction as the User change
+    and applied in batches by the `sync_identity_operations` worker.
+
+    Attributes:
+        operation (str): What to do with the Firebase user.
+        firebase_uid (str): The Firebase UID the operation applies to.
+        status (str): Pending until applied, dead once it ran out of attempts.
+        attempts (int): Number of failed attempts so far.
+        next_attempt_at (datetime): The operation is not picked up before this time.
+        last_error (str): Error of the last failed attempt.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    operation = models.CharField(max_length=16, choices=IdentityOperationType.choices)
+    firebase_uid = models.CharField(max_length=255, db_index=True)
+    status = models.CharField(
+        max_length=16, choices=IdentityOperationStatus.choices, default=IdentityOperationStatus.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+        ordering = ["created_at"]
+
+    def __str__(self):
+        return f"{self.operation} {self.firebase_uid} ({self.status})"
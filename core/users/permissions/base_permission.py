@@ -0,0 +1,164 @@
+import logging
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from guardian.models import UserObjectPermission
+
+logger = logging.getLogger(__name__)
+
+
+class BasePermissionManager:
+    """
+    Grants guardian object permissions from a user's roles (groups) on the objects they are
+    a member of, e.g. the institutions a user is linked to.
+
+    Subclasses declare the model, the permissions and which permissions each role grants, and
+    implement `get_memberships()`. `sync()` computes the complete set of permission rows the
+    roles and memberships call for, diffs it against the existing rows in one query, and
+    writes the difference with one bulk insert and one bulk delete, no matter how many users,
+    objects or permissions are involved. Only the permissions listed in ROLE_PERMISSIONS are
+    managed; other object permissions are left alone.
+    """
+
+    APP_LABEL = None
+    MODEL_NAME = None
+
+    # codename -> name of the permissions used by this manager
+    DEFAULT_MODEL_PERMISSIONS = {}
+    OBJECT_LEVEL_PERMISSIONS = {}
+
+    # role (group name) -> codenames granted on every object the user is a member of
+    ROLE_PERMISSIONS = {}
+
+    @classmethod
+    def get_memberships(cls, user_ids=None, object_ids=None):
+        """
+        Return (user ID, object ID) pairs of the users and the objects they are members of.
+        :param user_ids: Only these users, when given.
+        :param object_ids: Only these objects, when given.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def get_content_type(cls):
+        return ContentType.objects.get_by_natural_key(cls.APP_LABEL, cls.MODEL_NAME)
+
+    @classmethod
+    def get_permission_ids(cls, content_type):
+        """
+        Return {codename: permission ID} for the managed permissions, creating missing ones.
+        """
+        names = {**cls.DEFAULT_MODEL_PERMISSIONS, **cls.OBJECT_LEVEL_PERMISSIONS}
+        codenames = {codename for codenames in cls.ROLE_PERMISSIONS.values() for codename in codenames}
+        permission_ids = dict(
+            Permission.objects.filter(content_type=content_type, codename__in=codenames)
+            .values_list("codename", "id")
+        )
+        missing = codenames - permission_ids.keys()
+        if missing:
+            Permission.objects.bulk_create(
+                [Permission(content_type=content_type, codename=codename, name=names.get(codename, codename))
+                 for codename in missing],
+                ignore_conflicts=True,
+            )
+            permission_ids = dict(
+                Permission.objects.filter(content_type=content_type, codename__in=codenames)
+                .values_list("codename", "id")
+            )
+        return permission_ids
+
+    @classmethod
+    def target_rows(cls, memberships, user_roles, permission_ids):
+        """
+        Compute the (user ID, permission ID, object pk) rows the roles and memberships call for.
+        :param memberships: (user ID, object ID) pairs.
+        :param user_roles: {user ID: set of role names}.
+        :param permission_ids: {codename: permission ID}.
+        """
+        role_permissions = {
+            role: {permission_ids[codename] for codename in codenames}
+            for role, codenames in cls.ROLE_PERMISSIONS.items()
+        }
+        rows = set()
+        for user_id, object_id in memberships:
+            for role in user_roles.get(user_id, ()):
+                for permission_id in role_permissions.get(role, ()):
+                    rows.add((user_id, permission_id, str(object_id)))
+        return rows
+
+    @classmethod
+    def sync(cls, user_ids=None, object_ids=None):
+        """
+        Bring the managed object permissions of the given users and/or objects in line with
+        their roles and memberships. At least one of `user_ids` and `object_ids` is required.
+        :return: (number of rows added, number of rows removed)
+        """
+        if user_ids is None and object_ids is None:
+            raise ValueError("sync() needs user_ids, object_ids or both.")
+        user_ids = list(user_ids) if user_ids is not None else None
+        object_ids = [str(object_id) for object_id in object_ids] if object_ids is not None else None
+
+        content_type = cls.get_content_type()
+        permission_ids = cls.get_permission_ids(content_type)
+
+        memberships = list(cls.get_memberships(user_ids=user_ids, object_ids=object_ids))
+        user_roles = {}
+        roles = get_user_model().groups.through.objects.filter(
+            user_id__in={user_id for user_id, _ in memberships}
+        ).values_list("user_id", "group__name")
+        for user_id, role in roles:
+            user_roles.setdefault(user_id, set()).add(role)
+        target = cls.target_rows(memberships, user_roles, permission_ids)
+
+        existing_rows = UserObjectPermission.objects.filter(
+            content_type=content_type, permission_id__in=permission_ids.values()
+        )
+        if user_ids is not None:
+            existing_rows = existing_rows.filter(user_id__in=user_ids)
+        if object_ids is not None:
+            existing_rows = existing_rows.filter(object_pk__in=object_ids)
+        existing = {
+            (user_id, permission_id, object_pk): pk
+            for pk, user_id, permission_id, object_pk
+            in existing_rows.values_list("pk", "user_id", "permission_id", "object_pk")
+        }
+
+        to_add = target - existing.keys()
+        to_remove = [pk for row, pk in existing.items() if row not in target]
+        with transaction.atomic():
+            if to_add:
+                UserObjectPermission.objects.bulk_create(
+                    [
+                        UserObjectPermission(
+                            user_id=user_id, permission_id=permission_id,
+                            content_type=content_type, object_pk=object_pk,
+                        )
+                        for user_id, permission_id, object_pk in to_add
+                    ],
+                    ignore_conflicts=True,
+                )
+            if to_remove:
+                UserObjectPermission.objects.filter(pk__in=to_remove).delete()
+
+        logger.info(
+            f"Synced {cls.MODEL_NAME} permissions: {len(to_add)} added, {len(to_remove)} removed."
+        )
+        return len(to_add), len(to_remove)
+
+    @classmethod
+    def assign_permissions(cls, user, obj, roles=None):
+        """
+        Sync the permissions of a user on one object. `roles` is accepted for compatibility;
+        the user's current roles are always used.
+        """
+        return cls.sync(user_ids=[user.pk], object_ids=[obj.pk])
+
+    @classmethod
+    def remove_permissions(cls, user, obj, roles=None):
+        """
+        Sync the permissions of a user on one object after a membership or role was removed.
+        Permissions still granted by a remaining role are kept.
+        """
+        return cls.sync(user_ids=[user.pk], object_ids=[obj.pk])
@@ -0,0 +1,161 @@
+import logging
+import time
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from guardian.backends import ObjectPermissionBackend
+from guardian.models import GroupObjectPermission, UserObjectPermission
+
+logger = logging.getLogger(__name__)
+
+
+class PermissionCache:
+    """
+    Object permission decisions and roles of a user, cached at two levels.
+
+    A user's complete map of object permissions on a model ({object pk: codenames}) is loaded
+    with one query and kept in the shared Django cache, keyed by a per-user version that the
+    UserInstitution and group signals bump. On top of that, every lookup is memoised on the
+    user instance, which lives for one request, so checking N objects costs at most one query.
+    """
+
+    VERSION_KEY = "permissions:{user_id}:version"
+    ENTRY_KEY = "permissions:{user_id}:v{version}:{name}"
+    MEMO_ATTR = "_permission_cache"
+
+    @staticmethod
+    def _memo(user):
+        return user.__dict__.setdefault(PermissionCache.MEMO_ATTR, {})
+
+    @staticmethod
+    def get_version(user_id):
+        """
+        Return the permission cache version of a user, initialising it if needed.
+        """
+        key = PermissionCache.VERSION_KEY.format(user_id=user_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
+        return version
+
+    @staticmethod
+    def forget(user):
+        """
+        Drop the request-scoped memo of a user instance.
+        """
+        user.__dict__.pop(PermissionCache.MEMO_ATTR, None)
+
+    @staticmethod
+    def invalidate(user_ids):
+        """
+        Forget the cached permissions and roles of users once the current transaction commits.
+        """
+        keys = [PermissionCache.VERSION_KEY.format(user_id=user_id) for user_id in user_ids]
+        if keys:
+            transaction.on_commit(lambda: cache.set_many(dict.fromkeys(keys, time.time_ns()), timeout=None))
+
+    @staticmethod
+    def _get_or_load(user, name, loader):
+        memo = PermissionCache._memo(user)
+        if name in memo:
+            return memo[name]
+
+        key = PermissionCache.ENTRY_KEY.format(
+            user_id=user.pk, version=PermissionCache.get_version(user.pk), name=name
+        )
+        value = cache.get(key)
+        if value is None:
+            value = loader()
+            cache.set(key, value, timeout=settings.PERMISSION_CACHE_TIMEOUT)
+        memo[name] = value
+        return value
+
+    @staticmethod
+    def get_roles(user):
+        """
+        Return the names of the user's groups.
+        """
+        if not user.is_authenticated:
+            return frozenset()
+        return PermissionCache._get_or_load(
+            user, "roles", lambda: frozenset(user.groups.values_list("name", flat=True))
+        )
+
+    @staticmethod
+    def get_permission_map(user, model):
+        """
+        Return {object pk: frozenset of codenames} of the object permissions a user has on a
+        model, directly or through their groups, in one query.
+        """
+        content_type = ContentType.objects.get_for_model(model)
+
+        def load():
+            direct = UserObjectPermission.objects.filter(user_id=user.pk, content_type=content_type)
+            via_groups = GroupObjectPermission.objects.filter(group__user=user.pk, content_type=content_type)
+            permission_map = {}
+            rows = direct.values_list("object_pk", "permission__codename").union(
+                via_groups.values_list("object_pk", "permission__codename")
+            )
+            for object_pk, codename in rows:
+                permission_map.setdefault(object_pk, set()).add(codename)
+            return {object_pk: frozenset(codenames) for object_pk, codenames in permission_map.items()}
+
+        return PermissionCache._get_or_load(user, f"objects:{content_type.pk}", load)
+
+    @staticmethod
+    def get_permissions(user, obj):
+        """
+        Return the codenames of the object permissions a user has on `obj`.
+        """
+        if not user.is_authenticated or not user.is_active:
+            return frozenset()
+        return PermissionCache.get_permission_map(user, type(obj)).get(str(obj.pk), frozenset())
+
+    @staticmethod
+    def has_perm(user, perm, obj):
+        """
+        Whether the user has `perm` ("codename" or "app_label.codename") on `obj`.
+        Active superusers have every permission, as with guardian.
+        """
+        if user.is_active and user.is_superuser:
+            return True
+        return perm.rsplit(".", 1)[-1] in PermissionCache.get_permissions(user, obj)
+
+    @staticmethod
+    def visible_ids(user, model, object_ids, perm):
+        """
+        Return which of the given object IDs the user has `perm` on, with at most one query.
+        """
+        object_ids = list(object_ids)
+        if user.is_active and user.is_superuser:
+            return set(object_ids)
+        if not user.is_authenticated or not user.is_active:
+            return set()
+        codename = perm.rsplit(".", 1)[-1]
+        permission_map = PermissionCache.get_permission_map(user, model)
+        return {
+            object_id for object_id in object_ids
+            if codename in permission_map.get(str(object_id), ())
+        }
+
+
+class CachedObjectPermissionBackend(ObjectPermissionBackend):
+    """
+    guardian's ObjectPermissionBackend answering object checks from PermissionCache.
+    """
+
+    def has_perm(self, user_obj, perm, obj=None):
+        if obj is None or not getattr(user_obj, "pk", None):
+            return super().has_perm(user_obj, perm, obj)
+        app_label = perm.split(".", 1)[0] if "." in perm else None
+        if app_label is not None and app_label != obj._meta.app_label:
+            return False
+        return PermissionCache.has_perm(user_obj, perm, obj)
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if obj is None or not getattr(user_obj, "pk", None) or user_obj.is_superuser:
+            return super().get_all_permissions(user_obj, obj)
+        return set(PermissionCache.get_permissions(user_obj, obj))
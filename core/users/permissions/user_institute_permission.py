@@ -2,6 +2,7 @@ from core.users.permissions.base_permission import BasePermissionManager
 
 
 class InstitutionPermissionManager(BasePermissionManager):
+    APP_LABEL = "institution"
     MODEL_NAME = "institution"
 
     DEFAULT_MODEL_PERMISSIONS = {
@@ -37,3 +38,14 @@ class InstitutionPermissionManager(BasePermissionManager):
         ],
         "student": ["view_institution_object", "view_institution"],
     }
+
+    @classmethod
+    def get_memberships(cls, user_ids=None, object_ids=None):
+        from core.users.models import UserInstitution
+
+        links = UserInstitution.objects.all()
+        if user_ids is not None:
+            links = links.filter(user_id__in=user_ids)
+        if object_ids is not None:
+            links = links.filter(institution_id__in=object_ids)
+        return links.values_list("user_id", "institution_id")
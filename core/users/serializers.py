@@ -14,3 +14,14 @@ class UserSerializer(serializers.ModelSerializer):
         user.set_password(password)
         user.save()
         return user
+
+
+class UserImportSerializer(serializers.Serializer):
+    """
+    A CSV (with a header row) or JSON Lines file of users to import, one `email` per row and
+    optionally `password`, `first_name` and `last_name`.
+    """
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=["csv", "jsonl"], required=False, help_text="Guessed from the file name by default.")
+    group = serializers.CharField(default="student", help_text="Group the users are added to.")
+    start_row = serializers.IntegerField(default=0, min_value=0, help_text="Resume after this row number.")
@@ -3,6 +3,9 @@
 import logging
 from firebase_admin import auth as firebase_auth
 
+from ...authentication.token_cache import TokenCache
+from ...authentication.verifiers import get_firebase_app
+
 # Get a logger instance for this module
 logger = logging.getLogger(__name__)
 
@@ -19,7 +22,8 @@ class FirebaseAuthService:
             raise ValueError("Firebase UID is required for user deletion.")
 
         try:
-            firebase_auth.delete_user(firebase_uid)
+            TokenCache.purge_user(firebase_uid)
+            firebase_auth.delete_user(firebase_uid, app=get_firebase_app())
             logger.info(f"Firebase user with UID {firebase_uid} deleted successfully.")
         except firebase_auth.UserNotFoundError:
             logger.warning(f"Firebase user with UID {firebase_uid} not found.")
@@ -35,7 +39,7 @@ class FirebaseAuthService:
         :return: Firebase UserRecord object.
         """
         try:
-            firebase_user = firebase_auth.create_user(email=email, password=password)
+            firebase_user = firebase_auth.create_user(email=email, password=password, app=get_firebase_app())
             logger.info(f"Firebase user created with UID {firebase_user.uid}")
             return firebase_user
         except Exception as e:
@@ -52,8 +56,10 @@ class FirebaseAuthService:
             logger.error("Firebase UID is required to disable a user.")
             raise ValueError("Firebase UID is required to disable a user.")
 
+        # Stop serving the user's cached tokens, even if the Firebase call below fails
+        TokenCache.purge_user(firebase_uid)
         try:
-            firebase_auth.update_user(firebase_uid, disabled=True)
+            firebase_auth.update_user(firebase_uid, disabled=True, app=get_firebase_app())
             logger.info(f"Firebase user with UID {firebase_uid} disabled successfully.")
         except firebase_auth.UserNotFoundError:
             logger.warning(f"Firebase user with UID {firebase_uid} not found.")
@@ -72,10 +78,39 @@ class FirebaseAuthService:
             raise ValueError("Firebase UID is required to enable a user.")
 
         try:
-            firebase_auth.update_user(firebase_uid, disabled=False)
+            firebase_auth.update_user(firebase_uid, disabled=False, app=get_firebase_app())
             logger.info(f"Firebase user with UID {firebase_uid} enabled successfully.")
         except firebase_auth.UserNotFoundError:
             logger.warning(f"Firebase user with UID {firebase_uid} not found.")
         except Exception as e:
             logger.exception(f"Unexpected error while enabling Firebase user with UID {firebase_uid}: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def delete_users(firebase_uids):
+        """
+        Deletes up to 1000 users from Firebase in one call. Unknown UIDs count as deleted.
+        :param firebase_uids: The Firebase UIDs of the users to delete.
+        :return: Dict of Firebase UID to error reason, for the users that could not be deleted.
+        """
+        firebase_uids = list(firebase_uids)
+        TokenCache.purge_users(firebase_uids)
+        result = firebase_auth.delete_users(firebase_uids, app=get_firebase_app())
+        failures = {firebase_uids[error.index]: error.reason for error in result.errors}
+        logger.info(f"Deleted {result.success_count} Firebase users, {result.failure_count} failed.")
+        return failures
+
+    @staticmethod
+    def import_users(users, hash_rounds=None):
+        """
+        Creates up to 1000 users in Firebase in one call.
+        :param users: Dicts with `uid`, `email` and optionally `password_hash` and `password_salt`.
+        :param hash_rounds: PBKDF2-SHA256 rounds of the password hashes, if any.
+        :return: Dict of Firebase UID to error reason, for the users that could not be created.
+        """
+        records = [firebase_auth.ImportUserRecord(**user) for user in users]
+        hash_alg = firebase_auth.UserImportHash.pbkdf2_sha256(hash_rounds) if hash_rounds else None
+        result = firebase_auth.import_users(records, hash_alg=hash_alg, app=get_firebase_app())
+        failures = {users[error.index]["uid"]: error.reason for error in result.errors}
+        logger.info(f"Imported {result.success_count} Firebase users, {result.failure_count} failed.")
+        return failures
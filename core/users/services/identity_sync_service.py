@@ -0,0 +1,167 @@
+# users/services/identity_sync_service.py
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .firebase_service import FirebaseAuthService
+from ..models import IdentityOperation, IdentityOperationStatus, IdentityOperationType
+from ...authentication.token_cache import TokenCache
+
+logger = logging.getLogger(__name__)
+
+
+class IdentitySyncService:
+    """
+    Queues Firebase user operations in the IdentityOperation outbox and applies them in batches.
+
+    Operations are written in the caller's transaction, so they only exist if the User change
+    commits. `drain()` claims due operations, deletes users with one `delete_users` call per
+    1000 UIDs, and retries failures with exponential backoff until they are moved to the dead
+    letter state. The Firebase client is a parameter, so tests can pass a fake one.
+    """
+
+    # Firebase accepts at most this many UIDs per delete_users call
+    DELETE_CHUNK_SIZE = 1000
+    # Claimed operations are not picked up by other workers for this long
+    CLAIM_TIMEOUT = timedelta(minutes=5)
+    MAX_RETRY_DELAY = timedelta(hours=6)
+
+    @staticmethod
+    def enqueue(operation, firebase_uids):
+        """
+        Queue an operation for each Firebase UID. Deletes and disables also stop serving the
+        users' cached tokens right away, rather than when the worker gets to them.
+        :param operation: An IdentityOperationType.
+        :param firebase_uids: Firebase UIDs; empty ones are skipped.
+        :return: The created operations.
+        """
+        firebase_uids = [uid for uid in firebase_uids if uid]
+        if operation != IdentityOperationType.ENABLE:
+            TokenCache.purge_users(firebase_uids)
+
+        operations = IdentityOperation.objects.bulk_create(
+            [IdentityOperation(operation=operation, firebase_uid=uid) for uid in firebase_uids]
+        )
+        logger.debug(f"Queued {len(operations)} Firebase {operation} operations.")
+        return operations
+
+    @staticmethod
+    def claim(batch_size, now):
+        """
+        Claim up to `batch_size` due operations by moving their next attempt past the claim
+        timeout, so that concurrent workers skip them.
+        """
+        with transaction.atomic():
+            ids = list(
+                IdentityOperation.objects.select_for_update(skip_locked=True)
+                .filter(status=IdentityOperationStatus.PENDING, next_attempt_at__lte=now)
+                .order_by("created_at")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            IdentityOperation.objects.filter(id__in=ids).update(
+                next_attempt_at=now + IdentitySyncService.CLAIM_TIMEOUT
+            )
+        return list(IdentityOperation.objects.filter(id__in=ids).order_by("created_at"))
+
+    @staticmethod
+    def drain(client=FirebaseAuthService, batch_size=None):
+        """
+        Apply one batch of due operations.
+        :param client: Provides `delete_users(uids)` returning {uid: error}, `disable_user(uid)`
+            and `enable_user(uid)`, like FirebaseAuthService.
+        :return: Dict with the number of operations done, retried and dead.
+        """
+        now = timezone.now()
+        operations = IdentitySyncService.claim(batch_size or settings.IDENTITY_SYNC_BATCH_SIZE, now)
+
+        # Only the latest operation queued for a user needs to run. Earlier ones are superseded
+        # whether the newer one is in this batch, still queued or already applied, so that a
+        # retried disable cannot undo a later enable.
+        newer = IdentityOperation.objects.filter(
+            firebase_uid=OuterRef("firebase_uid"), created_at__gt=OuterRef("created_at")
+        )
+        superseded = set(
+            IdentityOperation.objects.filter(id__in=[op.id for op in operations])
+            .filter(Exists(newer))
+            .values_list("id", flat=True)
+        )
+        done = [op for op in operations if op.id in superseded]
+        latest = {op.firebase_uid: op for op in operations if op.id not in superseded}
+        errors = {}
+
+        deletes = [op for op in latest.values() if op.operation == IdentityOperationType.DELETE]
+        for start in range(0, len(deletes), IdentitySyncService.DELETE_CHUNK_SIZE):
+            chunk = deletes[start:start + IdentitySyncService.DELETE_CHUNK_SIZE]
+            try:
+                failures = client.delete_users([op.firebase_uid for op in chunk])
+            except Exception as e:
+                logger.exception(f"Deleting {len(chunk)} Firebase users failed: {e}")
+                failures = {op.firebase_uid: str(e) for op in chunk}
+            for op in chunk:
+                if op.firebase_uid in failures:
+                    errors[op] = failures[op.firebase_uid]
+                else:
+                    done.append(op)
+
+        updates = {
+            IdentityOperationType.DISABLE: client.disable_user,
+            IdentityOperationType.ENABLE: client.enable_user,
+        }
+        for op in latest.values():
+            if op.operation not in updates:
+                continue
+            try:
+                updates[op.operation](op.firebase_uid)
+                done.append(op)
+            except Exception as e:
+                errors[op] = str(e)
+
+        IdentityOperation.objects.filter(id__in=[op.id for op in done]).update(
+            status=IdentityOperationStatus.DONE, updated_at=now
+        )
+        dead = IdentitySyncService.record_failures(errors, now)
+
+        result = {"done": len(done), "retried": len(errors) - dead, "dead": dead}
+        if operations:
+            logger.info(f"Applied Firebase user operations: {result}.")
+        return result
+
+    @staticmethod
+    def record_failures(errors, now):
+        """
+        Schedule failed operations for a retry with exponential backoff, or move them to the
+        dead letter state once they ran out of attempts.
+        :param errors: Dict of operation to error message.
+        :return: Number of operations moved to the dead letter state.
+        """
+        dead = 0
+        for op, error in errors.items():
+            op.attempts += 1
+            op.last_error = error
+            if op.attempts >= settings.IDENTITY_SYNC_MAX_ATTEMPTS:
+                op.status = IdentityOperationStatus.DEAD
+                dead += 1
+                logger.error(f"Giving up on Firebase {op.operation} of {op.firebase_uid}: {error}")
+            else:
+                delay = timedelta(seconds=settings.IDENTITY_SYNC_RETRY_DELAY * 2 ** (op.attempts - 1))
+                op.next_attempt_at = now + min(delay, IdentitySyncService.MAX_RETRY_DELAY)
+            op.updated_at = now
+        IdentityOperation.objects.bulk_update(
+            errors.keys(), ["attempts", "last_error", "status", "next_attempt_at", "updated_at"]
+        )
+        return dead
+
+    @staticmethod
+    def requeue(queryset):
+        """
+        Give operations, typically dead ones, a fresh set of attempts starting now.
+        :return: Number of requeued operations.
+        """
+        return queryset.update(
+            status=IdentityOperationStatus.PENDING, attempts=0, next_attempt_at=timezone.now(), last_error=""
+        )
@@ -0,0 +1,224 @@
+# users/services/user_import_service.py
+
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from .firebase_service import FirebaseAuthService
+from ..models import User, UserInstitution
+from ..permissions.user_institute_permission import InstitutionPermissionManager
+
+logger = logging.getLogger(__name__)
+
+# Firebase UIDs of imported users are derived from their email, so that re-running an import
+# after a failure re-imports the same Firebase users instead of creating duplicates.
+IMPORT_UID_NAMESPACE = uuid.UUID("0f6d3c1e-3b8a-4f3e-9a51-2d4c1b7e8a90")
+
+
+@dataclass(frozen=True)
+class InvalidRow:
+    """
+    Stands in for a row that could not be read, e.g. a malformed JSON line.
+    """
+    reason: str
+
+
+@dataclass
+class UserImportReport:
+    """
+    Outcome of an import. `failures` holds (row number, email, reason) for each rejected row;
+    `last_row` is the last row processed, to resume from with `start_row`.
+    """
+    created: int = 0
+    skipped: int = 0
+    failures: list = field(default_factory=list)
+    last_row: int = 0
+
+    def add_failure(self, row_number, email, reason):
+        self.failures.append((row_number, email, reason))
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "skipped": self.skipped,
+            "failed": len(self.failures),
+            "last_row": self.last_row,
+            "failures": [
+                {"row": row_number, "email": email, "reason": reason}
+                for row_number, email, reason in self.failures
+            ],
+        }
+
+
+class UserImportService:
+    """
+    Streams users from a CSV or JSON Lines file into Firebase and the database, in chunks.
+
+    Each chunk costs one Firebase `import_users` call and a handful of bulk queries, and only
+    one chunk is held in memory at a time. Rows whose email already exists are skipped, so a
+    partially failed import can simply be run again, or resumed after its `last_row`.
+    """
+
+    # Firebase accepts at most this many users per import_users call
+    MAX_CHUNK_SIZE = 1000
+
+    @staticmethod
+    def read_rows(file, file_format=None):
+        """
+        Yield (row number, row dict) from a CSV file with a header row, or a JSON Lines file.
+        JSON lines that are not an object are yielded as InvalidRow and reported by `run`.
+        :param file: A binary or text file object.
+        :param file_format: "csv" or "jsonl". Guessed from the file name when None.
+        """
+        if file_format is None:
+            name = getattr(file, "name", "") or ""
+            file_format = "jsonl" if os.path.splitext(name)[1] in (".jsonl", ".json", ".ndjson") else "csv"
+
+        if isinstance(file.read(0), bytes):
+            file = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+        if file_format == "csv":
+            yield from enumerate(csv.DictReader(file), start=1)
+        elif file_format == "jsonl":
+            for row_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield row_number, InvalidRow(f"Invalid JSON: {e}")
+                    continue
+                yield row_number, row if isinstance(row, dict) else InvalidRow("Expected a JSON object.")
+        else:
+            raise ValueError(f"Unsupported import format: {file_format}")
+
+    @staticmethod
+    def firebase_uid_for(email):
+        return uuid.uuid5(IMPORT_UID_NAMESPACE, email).hex
+
+    @staticmethod
+    def hash_password(password, salt):
+        """
+        PBKDF2-SHA256 hash of a password, as Firebase expects it for `pbkdf2_sha256` imports.
+        hashlib releases the GIL here, so a chunk is hashed on several threads.
+        """
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, settings.USER_IMPORT_HASH_ROUNDS)
+
+    @staticmethod
+    def run(rows, institution=None, group_name="student", chunk_size=None, start_row=0, client=FirebaseAuthService):
+        """
+        Import users from (row number, row dict) pairs. Rows need an `email` and may have
+        `password`, `first_name` and `last_name`.
+        :param institution: Institution to link every imported user to, if any.
+        :param group_name: Group every imported user is added to.
+        :param start_row: Skip rows up to and including this row number.
+        :param client: Provides `import_users(users, hash_rounds)` like FirebaseAuthService.
+        :return: A UserImportReport.
+        """
+        chunk_size = min(chunk_size or settings.USER_IMPORT_CHUNK_SIZE, UserImportService.MAX_CHUNK_SIZE)
+        group, _ = Group.objects.get_or_create(name=group_name)
+        report = UserImportReport(last_row=start_row)
+
+        rows = ((number, row) for number, row in rows if number > start_row)
+        with ThreadPoolExecutor(max_workers=settings.USER_IMPORT_HASH_WORKERS) as executor:
+            while chunk := list(islice(rows, chunk_size)):
+                UserImportService.import_chunk(chunk, report, institution, group, client, executor)
+                report.last_row = chunk[-1][0]
+                logger.info(
+                    f"Imported users up to row {report.last_row}: {report.created} created, "
+                    f"{report.skipped} skipped, {len(report.failures)} failed."
+                )
+        return report
+
+    @staticmethod
+    def import_chunk(chunk, report, institution, group, client, executor):
+        """
+        Import one chunk of rows: validate, create the Firebase users in one call, then insert
+        the users, their group and their institution link with one bulk query each, and grant
+        their institution permissions with one diff.
+        """
+        candidates = {}
+        for row_number, row in chunk:
+            if isinstance(row, InvalidRow):
+                report.add_failure(row_number, "", row.reason)
+                continue
+            email = row.get("email")
+            email = User.objects.normalize_email(email.strip() if isinstance(email, str) else "")
+            try:
+                validate_email(email)
+            except ValidationError:
+                report.add_failure(row_number, email, "Invalid email address.")
+                continue
+            if email in candidates:
+                report.add_failure(row_number, email, "Duplicate email in import.")
+                continue
+            candidates[email] = (row_number, row)
+
+        existing = set(User.objects.filter(email__in=candidates).values_list("email", flat=True))
+        report.skipped += len(existing)
+        candidates = {email: value for email, value in candidates.items() if email not in existing}
+        if not candidates:
+            return
+
+        firebase_users = []
+        passwords = []
+        for email, (_, row) in candidates.items():
+            firebase_users.append({"uid": UserImportService.firebase_uid_for(email), "email": email})
+            if row.get("password") and isinstance(row["password"], str):
+                passwords.append((firebase_users[-1], row["password"], os.urandom(16)))
+
+        hashes = executor.map(lambda item: UserImportService.hash_password(item[1], item[2]), passwords)
+        for (firebase_user, _, salt), password_hash in zip(passwords, hashes):
+            firebase_user.update(password_hash=password_hash, password_salt=salt)
+
+        try:
+            failures = client.import_users(
+                firebase_users, hash_rounds=settings.USER_IMPORT_HASH_ROUNDS if passwords else None
+            )
+        except Exception as e:
+            logger.exception(f"Importing {len(firebase_users)} Firebase users failed: {e}")
+            failures = {firebase_user["uid"]: str(e) for firebase_user in firebase_users}
+
+        # Imported users sign in through Firebase, so their Django password is unusable.
+        password = make_password(None)
+        users = []
+        for firebase_user in firebase_users:
+            email = firebase_user["email"]
+            row_number, row = candidates[email]
+            if firebase_user["uid"] in failures:
+                report.add_failure(row_number, email, failures[firebase_user["uid"]])
+                continue
+            users.append(User(
+                email=email,
+                firebase_uid=firebase_user["uid"],
+                first_name=row.get("first_name") or "",
+                last_name=row.get("last_name") or "",
+                password=password,
+            ))
+
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            User.groups.through.objects.bulk_create(
+                [User.groups.through(user_id=user.pk, group_id=group.pk) for user in users]
+            )
+            if institution is not None:
+                UserInstitution.objects.bulk_create(
+                    [UserInstitution(user=user, institution=institution) for user in users]
+                )
+                # bulk_create sends no signals, so grant the role permissions in one diff
+                InstitutionPermissionManager.sync(user_ids=[user.pk for user in users], object_ids=[institution.pk])
+        report.created += len(users)
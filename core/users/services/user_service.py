@@ -3,9 +3,11 @@
 import logging
 
 from django.contrib.auth.models import Group
+from django.db import transaction
 
 from .firebase_service import FirebaseAuthService
-from ..models import User
+from .identity_sync_service import IdentitySyncService
+from ..models import IdentityOperationType, User
 
 logger = logging.getLogger(__name__)
 
@@ -74,4 +76,22 @@ class UserService:
             logger.info(f"User {user.email} enabled in Firebase.")
         except Exception as e:
             logger.error(f"Failed to enable user {user.email} in Firebase: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def set_active(users, is_active):
+        """
+        Activate or deactivate many users at once, e.g. a whole cohort. The users are updated
+        in one query and their Firebase enables or disables are queued in the same transaction.
+        :param users: Queryset of users.
+        :param is_active: The new `is_active` value.
+        :return: Number of users whose `is_active` changed.
+        """
+        operation = IdentityOperationType.ENABLE if is_active else IdentityOperationType.DISABLE
+        with transaction.atomic():
+            changed = users.exclude(is_active=is_active)
+            firebase_uids = list(changed.values_list("firebase_uid", flat=True))
+            count = changed.update(is_active=is_active)
+            IdentitySyncService.enqueue(operation, firebase_uids)
+        logger.info(f"Set is_active={is_active} on {count} users.")
+        return count
@@ -1,6 +1,7 @@
 from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from core.users.models import UserInstitution, User
+from core.users.permissions.permission_cache import PermissionCache
 from core.users.permissions.user_institute_permission import InstitutionPermissionManager
 import logging
 
@@ -16,25 +17,12 @@ def assign_permissions_on_save(sender, instance, created, **kwargs):
     :param instance: UserInstitution instance
     :param created: Boolean indicating if the instance was created
     """
-    roles = instance.user.groups.values_list("name", flat=True)  # Get all role names
-    if created:
-        logger.info(
-            f"[Signal: post_save] UserInstitution created. Assigning permissions for user '{instance.user.email}' "
-            f"and institution '{instance.institution.name}' [Roles: {list(roles)}]."
-        )
-    else:
-        logger.info(
-            f"[Signal: post_save] UserInstitution updated. Reassigning permissions for user '{instance.user.email}' "
-            f"and institution '{instance.institution.name}' [Roles: {list(roles)}]."
-        )
-
-    # Assign permissions
-    InstitutionPermissionManager.assign_permissions(instance.user, instance.institution, roles)
-
     logger.info(
-        f"[Signal: post_save] Completed assigning permissions for user '{instance.user.email}' "
-        f"and institution '{instance.institution.name}'."
+        f"[Signal: post_save] UserInstitution {'created' if created else 'updated'}. Syncing permissions "
+        f"for user {instance.user_id} and institution {instance.institution_id}."
     )
+    InstitutionPermissionManager.sync(user_ids=[instance.user_id], object_ids=[instance.institution_id])
+    PermissionCache.invalidate([instance.user_id])
 
 
 @receiver(post_delete, sender=UserInstitution)
@@ -45,64 +33,44 @@ def remove_permissions_on_delete(sender, instance, **kwargs):
     :param sender: Model class
     :param instance: UserInstitution instance
     """
-    roles = instance.user.groups.values_list("name", flat=True)
-
-    logger.info(
-        f"[Signal: post_delete] Removing permissions for user '{instance.user.email}' "
-        f"and institution '{instance.institution.name}' [Roles: {list(roles)}]."
-    )
-
-    # Remove permissions
-    InstitutionPermissionManager.remove_permissions(instance.user, instance.institution, roles)
-
     logger.info(
-        f"[Signal: post_delete] Completed removing permissions for user '{instance.user.email}' "
-        f"and institution '{instance.institution.name}'."
+        f"[Signal: post_delete] Removing permissions for user {instance.user_id} "
+        f"and institution {instance.institution_id}."
     )
+    InstitutionPermissionManager.sync(user_ids=[instance.user_id], object_ids=[instance.institution_id])
+    PermissionCache.invalidate([instance.user_id])
 
 
 @receiver(m2m_changed, sender=User.groups.through)
-def update_permissions_on_group_change(sender, instance, action, pk_set, **kwargs):
+def update_permissions_on_group_change(sender, instance, action, reverse, pk_set, **kwargs):
     """
     Update permissions when a user's group membership changes.
 
+    Works in both directions: `user.groups.add(group)` syncs that user, and
+    `group.user_set.add(*users)` syncs the added users, each in one diff.
+
     :param sender: The intermediate model for the m2m relation.
-    :param instance: The user instance whose group membership changed.
+    :param instance: The user (or group, when reverse) whose memberships changed.
     :param action: The type of change (e.g., 'post_add', 'post_remove', 'post_clear').
-    :param pk_set: The primary keys of the groups being added or removed.
+    :param reverse: Whether the change was made from the group side.
+    :param pk_set: The primary keys of the groups (or users, when reverse) added or removed.
     """
-    from django.contrib.auth.models import Group  # Import Group for querying
-
-    if action == "post_add":
-        # Roles being added
-        new_roles = Group.objects.filter(pk__in=pk_set).values_list("name", flat=True)
-        logger.info(f"user_institute_signal [Group Change: post_add] Adding permissions for user '{instance.email}' [New Roles: {list(new_roles)}].")
-
-        # Assign permissions for all institutions related to the user
-        for user_institution in instance.user_institution_links.all():
-            InstitutionPermissionManager.assign_permissions(instance, user_institution.institution, new_roles)
-
-    elif action == "post_remove":
-        # Roles being removed
-        removed_roles = Group.objects.filter(pk__in=pk_set).values_list("name", flat=True)
-        remaining_roles = instance.groups.values_list("name", flat=True)
-
-        logger.info(
-            f"user_institute_signal [Group Change: post_remove] Removing permissions for user '{instance.email}' [Removed Roles: {list(removed_roles)}]. Remaining Roles: {list(remaining_roles)}."
-        )
-
-        # Remove only permissions specific to the removed roles
-        for user_institution in instance.user_institution_links.all():
-            InstitutionPermissionManager.remove_permissions(instance, user_institution.institution, removed_roles)
-
+    if reverse and action == "pre_clear":
+        # The cleared users are unknown after the fact; remember them.
+        instance._cleared_user_ids = list(instance.user_set.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        user_ids = [instance.pk]
+        PermissionCache.forget(instance)
     elif action == "post_clear":
-        # All roles are being removed
-        logger.info(f"user_institute_signal [Group Change: post_clear] Clearing all permissions for user '{instance.email}'.")
-        all_roles = InstitutionPermissionManager.ROLE_PERMISSIONS.keys()
-
-        # Remove permissions for all institutions related to the user
-        for user_institution in instance.user_institution_links.all():
-            InstitutionPermissionManager.remove_permissions(instance, user_institution.institution, all_roles)
-
-
+        user_ids = instance.__dict__.pop("_cleared_user_ids", [])
+    else:
+        user_ids = list(pk_set)
 
+    logger.info(f"user_institute_signal [Group Change: {action}] Syncing permissions of {len(user_ids)} users.")
+    if user_ids:
+        InstitutionPermissionManager.sync(user_ids=user_ids)
+        PermissionCache.invalidate(user_ids)
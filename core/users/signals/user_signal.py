@@ -2,25 +2,31 @@
 
 import logging
 from django.db.models.signals import m2m_changed, pre_save
-from ..models import User, UserInstitution
+from ..models import IdentityOperationType, User, UserInstitution
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from ..services.user_service import UserService
+from ..services.identity_sync_service import IdentitySyncService
+from ...authentication.token_cache import TokenCache
+from ...utils.models import fields_changed
 
 logger = logging.getLogger(__name__)
 
 @receiver(post_delete, sender=User)
 def handle_user_deletion(sender, instance, **kwargs):
     """
-    Handles user deletion by delegating to the UserService.
+    Queues the deletion of the Firebase user, in the transaction that deletes the user.
     """
     if instance.pk:
-        logger.debug(f"Preparing to delete user {instance.email}.")
-        try:
-            UserService.delete_user(instance)
-            logger.info(f"User {instance.email} deletion handled successfully.")
-        except Exception as e:
-            logger.exception(f"Error handling user deletion for {instance.email}: {e}")
+        logger.debug(f"Queueing Firebase deletion of user {instance.email}.")
+        IdentitySyncService.enqueue(IdentityOperationType.DELETE, [instance.firebase_uid])
+
+@receiver(post_save, sender=User)
+def refresh_cached_user(sender, instance, **kwargs):
+    """
+    Drop the user from the authentication cache so the next request loads the saved state.
+    """
+    if instance.firebase_uid:
+        TokenCache.users.pop(instance.firebase_uid)
 
 # @receiver(pre_save, sender=User)
 # def handle_user_creation(sender, instance:User, **kwargs):
@@ -37,31 +43,12 @@ def handle_user_deletion(sender, instance, **kwargs):
 #         except Exception as e:
 #             raise ValueError(f"Failed to create user in Firebase: {str(e)}")
 #
-@receiver(pre_save, sender=User)
-def handle_user_disable(sender, instance, **kwargs):
-    """
-    Pre-save signal to disable a user in Firebase when `is_active` changes to False.
-    """
-    if instance.pk:  # Ensure this is not a new user
-        try:
-            existing_user = User.objects.get(pk=instance.pk)
-            # Check if `is_active` has changed to False
-            if not instance.is_active and existing_user.is_active:
-                UserService.disable_user(instance)
-        except User.DoesNotExist:
-            # Handle the case where the user doesn't exist in the database
-            logger.warning(f"User {instance.email} does not exist for disable handling.")
-
-@receiver(pre_save, sender=User)
-def handle_user_enable(sender, instance, **kwargs):
+@receiver(fields_changed, sender=User)
+def handle_user_activation(sender, instance, changes, **kwargs):
     """
-    Pre-save signal to enable a user in Firebase when `is_active` changes to True.
+    Queues a Firebase disable or enable when a saved user's `is_active` changed, in the
+    transaction that saves the user (see FieldTrackerMixin).
     """
-    if instance.pk:  # Ensure this is not a new user
-        try:
-            existing_user = User.objects.get(pk=instance.pk)
-            # Check if `is_active` has changed to True
-            if instance.is_active and not existing_user.is_active:
-                UserService.enable_user(instance)  # Implement enable_user in UserService
-        except User.DoesNotExist:
-            logger.warning(f"User {instance.email} does not exist for enable handling.")
+    if "is_active" in changes:
+        operation = IdentityOperationType.ENABLE if instance.is_active else IdentityOperationType.DISABLE
+        IdentitySyncService.enqueue(operation, [instance.firebase_uid])
@@ -1,3 +1,353 @@
-from django.test import TestCase
+import io
+from unittest import mock
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.institution.models import Institution
+from core.institution.views import InstitutionViewSet
+from django.contrib.auth.models import Group
+from guardian.models import UserObjectPermission
+
+from core.users.models import IdentityOperation, IdentityOperationStatus, IdentityOperationType, User
+from core.users.models import UserInstitution
+from core.users.permissions.permission_cache import PermissionCache
+from core.users.permissions.user_institute_permission import InstitutionPermissionManager
+from core.users.services.firebase_service import FirebaseAuthService
+from core.users.services.identity_sync_service import IdentitySyncService
+from core.users.services.user_import_service import UserImportService
+from core.users.services.user_service import UserService
+
+
+class FakeFirebase:
+    """Records calls like FirebaseAuthService; UIDs in `failing` fail every time."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.delete_calls = []
+        self.updates = []
+        self.imports = []
+
+    def delete_users(self, firebase_uids):
+        self.delete_calls.append(list(firebase_uids))
+        return {uid: "internal error" for uid in firebase_uids if uid in self.failing}
+
+    def disable_user(self, firebase_uid):
+        self._update(firebase_uid, "disable")
+
+    def enable_user(self, firebase_uid):
+        self._update(firebase_uid, "enable")
+
+    def _update(self, firebase_uid, operation):
+        if firebase_uid in self.failing:
+            raise RuntimeError("unavailable")
+        self.updates.append((operation, firebase_uid))
+
+    def import_users(self, users, hash_rounds=None):
+        self.imports.append((users, hash_rounds))
+        return {user["uid"]: "email exists" for user in users if user["email"] in self.failing}
+
+
+def statuses():
+    return dict(IdentityOperation.objects.values_list("firebase_uid", "status"))
+
+
+class TestIdentitySync(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create(email=f"student{i}@example.com", firebase_uid=f"uid-{i}") for i in range(3)
+        ]
+
+    def students(self):
+        return User.objects.filter(firebase_uid__startswith="uid-")
+
+    def test_user_changes_are_queued_not_applied(self):
+        user = self.users[0]
+        user.is_active = False
+        user.save()
+        user.save()  # Unchanged, nothing more to queue
+        self.users[1].delete()
+
+        self.assertEqual(
+            sorted(IdentityOperation.objects.values_list("operation", "firebase_uid")),
+            [(IdentityOperationType.DELETE, "uid-1"), (IdentityOperationType.DISABLE, "uid-0")],
+        )
+
+    def test_saves_do_not_fetch_the_previous_row(self):
+        user = User.objects.get(firebase_uid="uid-0")
+        user.last_login = timezone.now()
+        with self.assertNumQueries(1):
+            user.save(update_fields=["last_login"])
+
+        user.is_active = False
+        with self.assertNumQueries(4):  # savepoint, UPDATE, queued operation, release
+            user.save()
+        self.assertEqual(user.changed_fields(), {})
+        self.assertEqual(IdentityOperation.objects.get().operation, IdentityOperationType.DISABLE)
+
+    def test_user_change_rolls_back_when_queueing_fails(self):
+        user = User.objects.get(firebase_uid="uid-0")
+        user.is_active = False
+        with mock.patch.object(IdentitySyncService, "enqueue", side_effect=RuntimeError("outbox down")):
+            with self.assertRaises(RuntimeError):
+                user.save()
+
+        self.assertTrue(User.objects.get(pk=user.pk).is_active)
+        self.assertFalse(IdentityOperation.objects.exists())
+        self.assertEqual(user.changed_fields(), {"is_active": (True, False)})
+
+    def test_tracker_follows_update_fields_and_refresh(self):
+        user = User.objects.only("email").get(firebase_uid="uid-0")
+        self.assertEqual(user.changed_fields(), {})
+
+        user.refresh_from_db(fields=["is_active"])
+        user.is_active = False
+        user.email = "renamed@example.com"
+        user.save(update_fields=["email"])
+        self.assertEqual(user.changed_fields(), {"is_active": (True, False)})
+        self.assertFalse(IdentityOperation.objects.exists())
+
+    def test_bulk_deactivation_queues_in_one_go(self):
+        with self.assertNumQueries(5):
+            count = UserService.set_active(self.students(), False)
+        self.assertEqual(count, 3)
+        self.assertFalse(self.students().filter(is_active=True).exists())
+        self.assertEqual(IdentityOperation.objects.filter(operation=IdentityOperationType.DISABLE).count(), 3)
+
+    def test_drain_batches_deletes(self):
+        self.students().delete()
+        client = FakeFirebase()
+
+        with self.settings(IDENTITY_SYNC_BATCH_SIZE=10):
+            result = IdentitySyncService.drain(client=client)
+
+        self.assertEqual(result, {"done": 3, "retried": 0, "dead": 0})
+        self.assertEqual([sorted(call) for call in client.delete_calls], [["uid-0", "uid-1", "uid-2"]])
+        self.assertEqual(set(statuses().values()), {IdentityOperationStatus.DONE})
+
+    def test_only_the_latest_operation_per_user_runs(self):
+        user = self.users[0]
+        user.is_active = False
+        user.save()
+        user.is_active = True
+        user.save()
+        client = FakeFirebase()
+
+        result = IdentitySyncService.drain(client=client)
+
+        self.assertEqual(result["done"], 2)
+        self.assertEqual(client.updates, [("enable", "uid-0")])
+
+    def test_a_failed_operation_is_superseded_by_a_newer_one(self):
+        user = self.users[0]
+        user.is_active = False
+        user.save()
+        IdentitySyncService.drain(client=FakeFirebase(failing={"uid-0"}))  # The disable backs off
+
+        user.is_active = True
+        user.save()
+        client = FakeFirebase()
+        self.assertEqual(IdentitySyncService.drain(client=client)["done"], 1)
+        self.assertEqual(client.updates, [("enable", "uid-0")])
+
+        # The disable comes due again, after the enable was applied
+        IdentityOperation.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(IdentitySyncService.drain(client=client)["done"], 1)
+        self.assertEqual(client.updates, [("enable", "uid-0")])
+        self.assertEqual(set(statuses().values()), {IdentityOperationStatus.DONE})
+
+    @override_settings(IDENTITY_SYNC_MAX_ATTEMPTS=2, IDENTITY_SYNC_RETRY_DELAY=30)
+    def test_failures_back_off_then_go_dead(self):
+        UserService.set_active(self.students(), False)
+        client = FakeFirebase(failing={"uid-1"})
+
+        result = IdentitySyncService.drain(client=client)
+        self.assertEqual(result, {"done": 2, "retried": 1, "dead": 0})
+        failed = IdentityOperation.objects.get(firebase_uid="uid-1")
+        self.assertEqual((failed.attempts, failed.last_error), (1, "unavailable"))
+        self.assertGreater(failed.next_attempt_at, timezone.now() + timedelta(seconds=25))
+
+        # Not due yet
+        self.assertEqual(IdentitySyncService.drain(client=client), {"done": 0, "retried": 0, "dead": 0})
+
+        IdentityOperation.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(IdentitySyncService.drain(client=client)["dead"], 1)
+        self.assertEqual(statuses()["uid-1"], IdentityOperationStatus.DEAD)
+
+        client.failing.clear()
+        IdentitySyncService.requeue(IdentityOperation.objects.filter(status=IdentityOperationStatus.DEAD))
+        self.assertEqual(IdentitySyncService.drain(client=client)["done"], 1)
+        self.assertEqual(statuses()["uid-1"], IdentityOperationStatus.DONE)
+
+
+CSV = """email,password,first_name
+a@example.com,secret-a,Ada
+not-an-email,,
+b@example.com,,Ben
+a@example.com,,Again
+taken@example.com,,
+c@example.com,secret-c,
+"""
+
+
+@override_settings(USER_IMPORT_HASH_ROUNDS=1000)
+class TestUserImport(TestCase):
+    def setUp(self):
+        self.institution = Institution.objects.create(name="Example University")
+
+    def run_import(self, client, **kwargs):
+        rows = UserImportService.read_rows(io.BytesIO(CSV.encode()), "csv")
+        return UserImportService.run(rows, institution=self.institution, client=client, **kwargs)
+
+    def test_imports_in_chunks_and_reports_failures(self):
+        client = FakeFirebase(failing={"taken@example.com"})
+
+        # Group lookup, then a constant number of queries per chunk of 3 rows
+        # (and two more to create the institution object permissions once)
+        with self.assertNumQueries(32):
+            report = self.run_import(client, chunk_size=3)
+
+        # Row 4 repeats row 1 and is skipped, as it was created by the first chunk
+        self.assertEqual((report.created, report.skipped, report.last_row), (3, 1, 6))
+        self.assertEqual(
+            [(row, reason) for row, _, reason in report.failures],
+            [(2, "Invalid email address."), (5, "email exists")],
+        )
+        self.assertEqual(len(client.imports), 2)
+        first_chunk, hash_rounds = client.imports[0]
+        self.assertEqual(hash_rounds, 1000)
+        self.assertEqual(len(first_chunk[0]["password_hash"]), 32)
+        self.assertNotIn("password_hash", first_chunk[1])
+
+        user = User.objects.get(email="a@example.com")
+        self.assertEqual(user.first_name, "Ada")
+        self.assertFalse(user.has_usable_password())
+        self.assertEqual(list(user.groups.values_list("name", flat=True)), ["student"])
+        self.assertEqual(list(self.institution.users.order_by("email").values_list("email", flat=True)),
+                         ["a@example.com", "b@example.com", "c@example.com"])
+
+    def test_rerun_resumes_failed_rows(self):
+        self.run_import(FakeFirebase(failing={"taken@example.com"}))
+
+        client = FakeFirebase()
+        report = self.run_import(client)
+
+        self.assertEqual((report.created, report.skipped), (1, 3))
+        self.assertEqual([user["email"] for user in client.imports[0][0]], ["taken@example.com"])
+
+        report = self.run_import(client, start_row=5)
+        self.assertEqual((report.created, report.skipped), (0, 1))
+
+    def test_malformed_json_lines_are_reported_per_row(self):
+        lines = b'{"email": "d@example.com"}\n{"email": \n["e@example.com"]\n{"email": 5}\n{"email": "f@example.com"}\n'
+        rows = UserImportService.read_rows(io.BytesIO(lines), "jsonl")
+        report = UserImportService.run(rows, client=FakeFirebase())
+        self.assertEqual(report.created, 2)
+        self.assertEqual(
+            [(row, reason.split(":")[0]) for row, _, reason in report.failures],
+            [(2, "Invalid JSON"), (3, "Expected a JSON object."), (4, "Invalid email address.")],
+        )
+
+    def test_import_endpoint(self):
+        admin = User.objects.create(email="admin@example.com", firebase_uid="admin-uid", is_staff=True)
+        upload = SimpleUploadedFile("users.jsonl", b'{"email": "d@example.com"}\n{"email": "bad"}\n')
+        request = APIRequestFactory().post("/", {"file": upload}, format="multipart")
+        force_authenticate(request, user=admin)
+
+        client = FakeFirebase()
+        with mock.patch.object(FirebaseAuthService, "import_users", client.import_users):
+            response = InstitutionViewSet.as_view({"post": "import_users"})(request, pk=self.institution.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["created"], response.data["failed"]), (1, 1))
+        self.assertTrue(self.institution.users.filter(email="d@example.com").exists())
+
+
+class TestInstitutionPermissions(TestCase):
+    def setUp(self):
+        self.student = Group.objects.create(name="student")
+        self.moderator = Group.objects.create(name="moderator")
+        self.institutions = [Institution.objects.create(name=f"Institution {i}") for i in range(3)]
+        self.user = User.objects.create(email="member@example.com", firebase_uid="member-uid")
+        for institution in self.institutions:
+            UserInstitution.objects.create(user=self.user, institution=institution)
+
+    def perms(self, institution):
+        return set(
+            UserObjectPermission.objects.filter(user=self.user, object_pk=str(institution.pk))
+            .values_list("permission__codename", flat=True)
+        )
+
+    def test_role_changes_sync_every_institution_in_one_diff(self):
+        # 2 for the add itself, then permissions, memberships, roles, existing rows and one insert
+        with self.assertNumQueries(9):
+            self.user.groups.add(self.student)
+        self.assertEqual(self.perms(self.institutions[2]), {"view_institution", "view_institution_object"})
+
+        self.user.groups.add(self.moderator)
+        self.user.groups.remove(self.student)
+        # view_institution_object is still granted by the moderator role
+        self.assertEqual(
+            self.perms(self.institutions[0]),
+            {"view_institution", "view_institution_object", "change_institution_object", "add_institution"},
+        )
+
+        self.moderator.user_set.clear()
+        self.assertFalse(UserObjectPermission.objects.filter(user=self.user).exists())
+
+    def test_membership_changes_only_touch_that_institution(self):
+        self.student.user_set.add(self.user)
+        UserInstitution.objects.get(institution=self.institutions[0]).delete()
+
+        self.assertEqual(self.perms(self.institutions[0]), set())
+        self.assertEqual(self.perms(self.institutions[1]), {"view_institution", "view_institution_object"})
+        self.assertEqual(InstitutionPermissionManager.sync(user_ids=[self.user.pk]), (0, 0))
+
+
+class TestPermissionCache(TestCase):
+    def setUp(self):
+        self.student = Group.objects.create(name="student")
+        self.institutions = [Institution.objects.create(name=f"Institution {i}") for i in range(3)]
+        self.user = User.objects.create(email="member@example.com", firebase_uid="member-uid")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.add(self.student)
+            for institution in self.institutions[:2]:
+                UserInstitution.objects.create(user=self.user, institution=institution)
+
+    def fresh_user(self):
+        return User.objects.get(pk=self.user.pk)
+
+    def test_checks_on_many_objects_share_one_query(self):
+        user = self.fresh_user()
+        ids = [institution.pk for institution in self.institutions]
+
+        with self.assertNumQueries(1):
+            visible = PermissionCache.visible_ids(user, Institution, ids, "view_institution_object")
+            self.assertTrue(user.has_perm("institution.view_institution_object", self.institutions[0]))
+            self.assertFalse(user.has_perm("institution.change_institution_object", self.institutions[0]))
+            self.assertFalse(user.has_perm("institution.view_institution_object", self.institutions[2]))
+        self.assertEqual(visible, set(ids[:2]))
+
+        self.assertEqual(PermissionCache.get_roles(user), {"student"})
+
+        # Another request for the same user is served from the shared cache
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            PermissionCache.visible_ids(user, Institution, ids, "view_institution_object")
+            self.assertEqual(PermissionCache.get_roles(user), {"student"})
+
+    def test_membership_and_group_changes_invalidate(self):
+        user = self.fresh_user()
+        self.assertTrue(user.has_perm("institution.view_institution_object", self.institutions[0]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserInstitution.objects.filter(institution=self.institutions[0]).delete()
+        self.assertFalse(self.fresh_user().has_perm("institution.view_institution_object", self.institutions[0]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.user_set.clear()
+        self.assertEqual(PermissionCache.get_roles(self.fresh_user()), frozenset())
+        self.assertFalse(self.fresh_user().has_perm("institution.view_institution_object", self.institutions[1]))
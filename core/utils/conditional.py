@@ -0,0 +1,61 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Viewset mixin answering conditional GETs (If-None-Match / If-Modified-Since) with
+    304 Not Modified before anything is loaded or serialized.
+
+    Views describe the current state of a response through `get_validators()`, which
+    should be much cheaper than building the response itself.
+    """
+
+    def get_validators(self):
+        """
+        Return (version, last_modified) for the current request, or None to serve it
+        unconditionally.
+        version: Any value that changes whenever the response content changes.
+        last_modified: Timezone-aware datetime of the last change, or None.
+        """
+        return None
+
+    def make_etag(self, request, version):
+        """
+        Build a strong ETag from the version and everything else the content depends on.
+        """
+        user_id = getattr(request.user, "pk", None)
+        media_type = getattr(request, "accepted_media_type", "")
+        key = f"{version}|{request.get_full_path()}|{user_id}|{media_type}"
+        return quote_etag(hashlib.sha1(key.encode()).hexdigest())
+
+    def respond_conditionally(self, request, validators, handler, *args, **kwargs):
+        """
+        Return 304 if the client's copy is current, otherwise call `handler` and tag its response.
+        """
+        if validators is None or request.method not in ("GET", "HEAD"):
+            return handler(request, *args, **kwargs)
+
+        version, last_modified = validators
+        etag = self.make_etag(request, version)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response.headers["ETag"] = etag
+        if timestamp is not None:
+            response.headers["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.respond_conditionally(request, self.get_validators(), super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.respond_conditionally(request, self.get_validators(), super().retrieve, *args, **kwargs)
+
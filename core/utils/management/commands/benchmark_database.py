@@ -0,0 +1,125 @@
+# In core/utils/management/commands/benchmark_database.py
+import random
+import statistics
+import threading
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections, transaction
+
+TABLE = "benchmark_database_rows"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure database throughput under concurrent workers doing short read and write "
+        "transactions, with the configured connection settings, on a scratch table"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="Number of concurrent worker threads.")
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run.")
+        parser.add_argument("--write-ratio", type=float, default=0.2, help="Share of operations that write.")
+        parser.add_argument("--rows", type=int, default=10000, help="Rows to seed the scratch table with.")
+        parser.add_argument(
+            "--reconnect", action="store_true",
+            help="Close the connection after every operation, as with CONN_MAX_AGE=0, for comparison.",
+        )
+
+    def handle(self, *args, **kwargs):
+        self.describe_connection()
+        ids = self.setup_table(kwargs["rows"])
+        try:
+            results = self.run_workers(ids, **kwargs)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {TABLE}")
+
+        latencies = sorted(latency for result in results for latency in result["latencies"])
+        errors = sum(result["errors"] for result in results)
+        operations = len(latencies)
+        if not operations:
+            self.stdout.write(f"No operation completed ({errors} errors).")
+            return
+        self.stdout.write(
+            f"{kwargs['workers']} workers, {kwargs['duration']:.0f}s, {kwargs['write_ratio']:.0%} writes"
+            f"{', reconnecting' if kwargs['reconnect'] else ''}: {operations} operations "
+            f"({operations / kwargs['duration']:,.0f}/s), {errors} errors"
+        )
+        self.stdout.write(
+            f"Latency: p50 {statistics.median(latencies) * 1e3:.2f} ms, "
+            f"p95 {latencies[int(operations * 0.95) - 1] * 1e3:.2f} ms, "
+            f"max {latencies[-1] * 1e3:.2f} ms"
+        )
+
+    def describe_connection(self):
+        settings_dict = connection.settings_dict
+        self.stdout.write(
+            f"{connection.vendor}: CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}, "
+            f"CONN_HEALTH_CHECKS={settings_dict['CONN_HEALTH_CHECKS']}, "
+            f"pool={bool(settings_dict['OPTIONS'].get('pool'))}"
+        )
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                pragmas = {}
+                for pragma in ("journal_mode", "synchronous", "busy_timeout"):
+                    cursor.execute(f"PRAGMA {pragma}")
+                    pragmas[pragma] = cursor.fetchone()[0]
+            self.stdout.write(f"SQLite pragmas: {pragmas}")
+
+    def setup_table(self, rows):
+        ids = [uuid.uuid4().hex for _ in range(rows)]
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"CREATE TABLE {TABLE} (id varchar(32) PRIMARY KEY, worker integer, value integer)")
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (id, worker, value) VALUES (%s, %s, %s)",
+                [(row_id, -1, 0) for row_id in ids],
+            )
+        return ids
+
+    def run_workers(self, ids, workers, duration, write_ratio, reconnect, **kwargs):
+        results = [{"latencies": [], "errors": 0} for _ in range(workers)]
+        start = threading.Barrier(workers + 1)
+        deadline = []
+
+        def work(number):
+            rng = random.Random(number)
+            result = results[number]
+            try:
+                start.wait()
+                while time.perf_counter() < deadline[0]:
+                    began = time.perf_counter()
+                    try:
+                        if rng.random() < write_ratio:
+                            with transaction.atomic(), connection.cursor() as cursor:
+                                cursor.execute(
+                                    f"INSERT INTO {TABLE} (id, worker, value) VALUES (%s, %s, %s)",
+                                    [uuid.uuid4().hex, number, 1],
+                                )
+                                cursor.execute(
+                                    f"UPDATE {TABLE} SET value = value + 1 WHERE id = %s", [rng.choice(ids)]
+                                )
+                        else:
+                            with connection.cursor() as cursor:
+                                cursor.execute(f"SELECT worker, value FROM {TABLE} WHERE id = %s", [rng.choice(ids)])
+                                cursor.fetchall()
+                    except OperationalError:
+                        result["errors"] += 1
+                        continue
+                    finally:
+                        if reconnect:
+                            connection.close()
+                    result["latencies"].append(time.perf_counter() - began)
+            finally:
+                # Every thread has its own connection, which request_finished would close
+                connections.close_all()
+
+        threads = [threading.Thread(target=work, args=(number,)) for number in range(workers)]
+        for thread in threads:
+            thread.start()
+        deadline.append(time.perf_counter() + duration)
+        start.wait()
+        for thread in threads:
+            thread.join()
+        return results
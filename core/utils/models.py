@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.dispatch import Signal
 
 class TimestampMixin(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -6,3 +7,78 @@ class TimestampMixin(models.Model):
 
     class Meta:
         abstract = True
+
+
+# Sent by FieldTrackerMixin after a save that changed tracked fields.
+# Arguments: sender (model class), instance, changes ({field name: (old value, new value)}).
+fields_changed = Signal()
+
+
+class FieldTrackerMixin:
+    """
+    Model mixin that snapshots `tracked_fields` when an instance is loaded from the database
+    and sends `fields_changed` after a save that changed any of them, so signal handlers can
+    react to changes without fetching the previous row. Such saves and their handlers run in
+    one transaction, so whatever the handlers write commits or rolls back with the change.
+
+    Only instances loaded from the database are tracked; deferred fields are not tracked
+    until they are loaded with `refresh_from_db()`.
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.reset_tracker()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self.reset_tracker(fields)
+
+    def reset_tracker(self, fields=None):
+        """
+        Take the current values of the tracked fields (or of `fields` among them) as saved.
+        """
+        # A new dict, so that shallow copies of the instance keep their own snapshot
+        snapshot = dict(self.__dict__.get("_tracked_values", {}))
+        self.__dict__["_tracked_values"] = snapshot
+        deferred = self.get_deferred_fields()
+        for name in self.tracked_fields:
+            attname = self._meta.get_field(name).attname
+            if (fields is None or name in fields) and attname not in deferred:
+                snapshot[name] = getattr(self, attname)
+
+    def changed_fields(self):
+        """
+        :return: Dict of tracked field name to (old value, new value) for unsaved changes.
+        """
+        changes = {}
+        for name, old in self.__dict__.get("_tracked_values", {}).items():
+            new = getattr(self, self._meta.get_field(name).attname)
+            if new != old:
+                changes[name] = (old, new)
+        return changes
+
+    def save(self, *args, **kwargs):
+        changes = self.changed_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            changes = {name: change for name, change in changes.items() if name in update_fields}
+
+        if not changes:
+            super().save(*args, **kwargs)
+            self.reset_tracker(update_fields)
+            return
+
+        snapshot = dict(self.__dict__.get("_tracked_values", {}))
+        try:
+            with transaction.atomic(using=kwargs.get("using")):
+                super().save(*args, **kwargs)
+                self.reset_tracker(update_fields)
+                fields_changed.send(sender=self.__class__, instance=self, changes=changes)
+        except Exception:
+            # Nothing was saved, so the changes are still unsaved
+            self.__dict__["_tracked_values"] = snapshot
+            raise
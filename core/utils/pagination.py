@@ -0,0 +1,183 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination over a unique ordering, by default (created_at, id).
+
+    Each page is fetched with `WHERE (ordering) > (last key seen) ORDER BY ordering LIMIT n`,
+    so it costs the same index range scan however deep the client pages, and rows inserted or
+    deleted meanwhile do not shift pages. Cursors are opaque base64 tokens; clients follow the
+    `next` and `previous` links.
+
+    The total `count` is included unless the client passes `count=false`, which saves the
+    COUNT(*) query on every page.
+    """
+
+    ordering = ("created_at", "id")
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "limit"
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.count = self.get_count(queryset) if self.include_count(request) else None
+
+        key, reverse = self.decode_cursor(request)
+        ordering = self.get_ordering(reverse)
+        if key is not None:
+            try:
+                queryset = queryset.filter(self.seek_filter(ordering, key))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # One extra row tells whether there is a page beyond this one
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        # Going forward, a next page exists if the extra row was found; a previous one if we
+        # came from a cursor. Going backward, the other way around.
+        has_next, has_previous = (key is not None, has_more) if reverse else (has_more, key is not None)
+        self.next_key = self.get_key(rows[-1]) if rows and has_next else None
+        self.previous_key = self.get_key(rows[0]) if rows and has_previous else None
+        return rows
+
+    def get_paginated_response(self, data):
+        fields = [("next", self.get_next_link()), ("previous", self.get_previous_link()), ("results", data)]
+        if self.count is not None:
+            fields.insert(0, ("count", self.count))
+        return Response(OrderedDict(fields))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123, "description": "Omitted with count=false."},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor taken from the `next` or `previous` link.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Number of results per page, at most {self.max_page_size}.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Pass `false` to leave out the total count.",
+                "schema": {"type": "boolean"},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def include_count(self, request):
+        return request.query_params.get(self.count_query_param, "true").lower() not in ("false", "0", "no")
+
+    def get_count(self, queryset):
+        return queryset.count()
+
+    def get_ordering(self, reverse=False):
+        """
+        Return the order_by() fields, flipped when paging backwards.
+        """
+        if not reverse:
+            return self.ordering
+        return tuple(field[1:] if field.startswith("-") else f"-{field}" for field in self.ordering)
+
+    def get_key(self, obj):
+        return [self.to_cursor_value(getattr(obj, field.lstrip("-"))) for field in self.ordering]
+
+    @staticmethod
+    def to_cursor_value(value):
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        if isinstance(value, (int, float, str)) or value is None:
+            return value
+        return str(value)
+
+    @staticmethod
+    def seek_filter(ordering, key):
+        """
+        Rows after `key` in `ordering`: (a, b) > (x, y) is a > x OR (a = x AND b > y).
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, key):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def encode_cursor(self, key, reverse):
+        payload = json.dumps({"k": key, "r": int(reverse)}, separators=(",", ":"))
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """
+        Return (key, reverse) of the request's cursor, or (None, False) for the first page.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            key, reverse = payload["k"], bool(payload["r"])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(key, list) or len(key) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return key, reverse
+
+    def get_next_link(self):
+        if self.next_key is None:
+            return None
+        return self.encode_cursor(self.next_key, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_key is None:
+            return None
+        return self.encode_cursor(self.previous_key, reverse=True)